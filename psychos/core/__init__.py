@@ -4,11 +4,143 @@ from typing import TYPE_CHECKING
 from ..utils.lazy import attach
 
 submod_attrs = {
-    "time": ["Clock", "Interval", "wait"],
+    "time": [
+        "Clock",
+        "Interval",
+        "wait",
+        "wait_until",
+        "wait_async",
+        "wait_until_async",
+        "pump_events",
+    ],
+    "schedule": ["Scheduler", "Timeline"],
+    "timebase": [
+        "ClockSource",
+        "VirtualClockSource",
+        "get_clock_source",
+        "set_clock_source",
+        "get_time",
+    ],
+    "keys": [
+        "wait_key",
+        "wait_key_async",
+        "wait_keys",
+        "list_keys",
+        "list_modifiers",
+        "Keyboard",
+        "KeyFilter",
+    ],
+    "input": ["InputQueue"],
+    "holds": ["HoldRecorder"],
+    "rawinput": ["EvdevKeyboard", "find_keyboards"],
+    "mouse": ["Mouse"],
+    "calibration": [
+        "calibrate",
+        "load_profile",
+        "apply_profile",
+        "get_profile_path",
+        "SleepCalibrator",
+        "get_sleep_calibrator",
+    ],
+    "scheduling": ["realtime"],
+    "collector": ["GCController", "get_gc_controller"],
+    "simulation": ["ScriptedInput", "virtual_time"],
+    "injection": ["InputInjector", "measure_input_latency"],
+    "overtime": ["OvertimeStats", "get_overtime_stats"],
+    "sync": ["ClockSync"],
+    "epoch": ["SharedEpoch"],
 }
 
 __getattr__, __dir__, __all__ = attach(__name__, submod_attrs=submod_attrs)
 
 if TYPE_CHECKING:
-    __all__ = ["Clock", "Interval", "wait"]
-    from .time import Clock, Interval, wait
+    __all__ = [
+        "Clock",
+        "Interval",
+        "Scheduler",
+        "Timeline",
+        "wait",
+        "wait_until",
+        "wait_async",
+        "wait_until_async",
+        "pump_events",
+        "SleepCalibrator",
+        "get_sleep_calibrator",
+        "ClockSource",
+        "VirtualClockSource",
+        "get_clock_source",
+        "set_clock_source",
+        "get_time",
+        "wait_key",
+        "wait_key_async",
+        "wait_keys",
+        "list_keys",
+        "list_modifiers",
+        "Keyboard",
+        "KeyFilter",
+        "InputQueue",
+        "HoldRecorder",
+        "EvdevKeyboard",
+        "find_keyboards",
+        "Mouse",
+        "calibrate",
+        "load_profile",
+        "apply_profile",
+        "get_profile_path",
+        "realtime",
+        "GCController",
+        "get_gc_controller",
+        "ScriptedInput",
+        "virtual_time",
+        "InputInjector",
+        "measure_input_latency",
+        "OvertimeStats",
+        "get_overtime_stats",
+        "ClockSync",
+        "SharedEpoch",
+    ]
+    from .time import (
+        Clock,
+        Interval,
+        wait,
+        wait_until,
+        wait_async,
+        wait_until_async,
+        pump_events,
+    )
+    from .schedule import Scheduler, Timeline
+    from .timebase import (
+        ClockSource,
+        VirtualClockSource,
+        get_clock_source,
+        set_clock_source,
+        get_time,
+    )
+    from .keys import (
+        wait_key,
+        wait_key_async,
+        wait_keys,
+        list_keys,
+        list_modifiers,
+        Keyboard,
+        KeyFilter,
+    )
+    from .input import InputQueue
+    from .holds import HoldRecorder
+    from .rawinput import EvdevKeyboard, find_keyboards
+    from .mouse import Mouse
+    from .calibration import (
+        calibrate,
+        load_profile,
+        apply_profile,
+        get_profile_path,
+        SleepCalibrator,
+        get_sleep_calibrator,
+    )
+    from .scheduling import realtime
+    from .collector import GCController, get_gc_controller
+    from .simulation import ScriptedInput, virtual_time
+    from .injection import InputInjector, measure_input_latency
+    from .overtime import OvertimeStats, get_overtime_stats
+    from .sync import ClockSync
+    from .epoch import SharedEpoch
@@ -0,0 +1,411 @@
+"""psychos.core.calibration: Module to measure and persist the timing profile of a machine."""
+
+import json
+import os
+import platform
+import socket
+import statistics
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..utils.stats import percentile as _percentile
+from .timebase import get_clock_source
+
+if TYPE_CHECKING:
+    from ..types import PathStr
+    from ..visual.window import Window
+
+__all__ = [
+    "calibrate",
+    "load_profile",
+    "apply_profile",
+    "get_profile_path",
+    "get_timing_defaults",
+    "SleepCalibrator",
+    "get_sleep_calibrator",
+]
+
+PROFILE_VERSION = 1
+
+# Parameters used by `wait`, `Interval` and `Window.wait` when they are not given explicitly
+TIMING_DEFAULTS: Dict[str, float] = {"sleep_interval": 0.8, "hog_period": 0.02}
+
+_profile_loaded = False  # pylint: disable=invalid-name
+
+
+def get_profile_path() -> Path:
+    """
+    Get the path of the timing profile of this machine.
+
+    The profile is stored in the directory given by the `PSYCHOS_CACHE_DIR` environment
+    variable, or in `$XDG_CACHE_HOME/psychos` (by default `~/.cache/psychos`), in a file named
+    after the host name.
+
+    Returns
+    -------
+    Path
+        The path of the profile file.
+    """
+    cache_dir = os.environ.get("PSYCHOS_CACHE_DIR")
+    if cache_dir is None:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME", os.path.join(Path.home(), ".cache"))
+        cache_dir = os.path.join(xdg_cache, "psychos")
+    return Path(cache_dir) / f"timing-{socket.gethostname()}.json"
+
+
+class SleepCalibrator:
+    """
+    Online estimator of the overshoot of the operating system `sleep()`.
+
+    Every sleep performed by `wait` is measured and the overshoot (the time slept beyond the
+    requested duration) is stored in a fixed-size circular buffer. The adaptive hog period is
+    the smallest busy-wait window that covers the requested `percentile` of the observed
+    overshoots, so that the final spin only lasts as long as the machine actually needs.
+
+    Parameters
+    ----------
+    percentile : float, default=0.99
+        The fraction of sleeps (between 0 and 1) whose overshoot must fit in the hog period.
+    margin : float, default=0.0005
+        Safety margin in seconds added to the estimated percentile.
+    min_hog_period : float, default=0.0002
+        The lower bound of the adaptive hog period in seconds.
+    max_hog_period : float, default=0.05
+        The upper bound of the adaptive hog period in seconds.
+    default_hog_period : float, default=0.02
+        The hog period used until `min_samples` sleeps have been measured.
+    capacity : int, default=256
+        The number of most recent overshoot measurements kept in the buffer.
+    min_samples : int, default=16
+        The number of measurements required before the adaptive estimate is used.
+
+    Examples
+    --------
+    >>> calibrator = get_sleep_calibrator()
+    >>> wait(2, hog_period="auto")  # Measures sleeps and spins only as long as needed
+    >>> calibrator.hog_period  # Current adaptive hog period in seconds
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        margin: float = 0.0005,
+        min_hog_period: float = 0.0002,
+        max_hog_period: float = 0.05,
+        default_hog_period: float = 0.02,
+        capacity: int = 256,
+        min_samples: int = 16,
+    ):
+        if not 0 < percentile <= 1:
+            raise ValueError("Invalid value for 'percentile'. Must be in the interval (0, 1].")
+        self.percentile = percentile
+        self.margin = margin
+        self.min_hog_period = min_hog_period
+        self.max_hog_period = max_hog_period
+        self.default_hog_period = default_hog_period
+        self.min_samples = min_samples
+        self._overshoots = array("d", bytes(8 * capacity))
+        self._count = 0
+        self._hog_period = None
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of overshoot measurements kept."""
+        return len(self._overshoots)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def record(self, requested: float, actual: float) -> None:
+        """
+        Record a sleep measurement.
+
+        Parameters
+        ----------
+        requested : float
+            The requested sleep duration in seconds.
+        actual : float
+            The measured sleep duration in seconds.
+        """
+        self._overshoots[self._count % self.capacity] = max(actual - requested, 0.0)
+        self._count += 1
+        self._hog_period = None
+
+    def reset(self) -> None:
+        """Discard all the recorded measurements."""
+        self._count = 0
+        self._hog_period = None
+
+    def overshoot(self, percentile: Optional[float] = None) -> float:
+        """
+        Get a percentile of the recorded sleep overshoots.
+
+        Parameters
+        ----------
+        percentile : Optional[float], default=None
+            The percentile (between 0 and 1). If None, `self.percentile` is used.
+
+        Returns
+        -------
+        float
+            The overshoot in seconds, or `nan` if no measurement has been recorded.
+        """
+        percentile = self.percentile if percentile is None else percentile
+        samples = self._overshoots[: len(self)]
+        if not samples:
+            return float("nan")
+        return _percentile(samples, percentile)
+
+    @property
+    def hog_period(self) -> float:
+        """The adaptive hog period in seconds for the current overshoot distribution."""
+        if self._count < self.min_samples:
+            return self.default_hog_period
+        if self._hog_period is None:
+            hog_period = self.overshoot() + self.margin
+            self._hog_period = min(max(hog_period, self.min_hog_period), self.max_hog_period)
+        return self._hog_period
+
+
+_sleep_calibrator = SleepCalibrator()
+
+
+def get_sleep_calibrator() -> SleepCalibrator:
+    """
+    Get the sleep calibrator used by `wait` when `hog_period="auto"`.
+
+    Returns
+    -------
+    SleepCalibrator
+        The shared sleep calibrator.
+    """
+    return _sleep_calibrator
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize a list of durations with the statistics stored in the profile."""
+    return {
+        "mean": statistics.fmean(samples),
+        "std": statistics.pstdev(samples),
+        "p50": _percentile(samples, 0.5),
+        "p90": _percentile(samples, 0.9),
+        "p99": _percentile(samples, 0.99),
+        "max": max(samples),
+    }
+
+
+def _measure_resolution(samples: int) -> float:
+    """Measure the smallest non-zero increment of the active clock source."""
+    source = get_clock_source()
+    resolution = float("inf")
+    for _ in range(samples):
+        start = source.time()
+        while (current := source.time()) == start:
+            pass
+        resolution = min(resolution, current - start)
+    return resolution
+
+
+def _measure_sleep(samples: int, duration: float) -> List[float]:
+    """Measure the overshoot of sleeping `duration` seconds with the active clock source."""
+    source = get_clock_source()
+    overshoots = []
+    for _ in range(samples):
+        # Sleep to an absolute deadline, as `wait_until` does
+        deadline = source.time() + duration
+        source.sleep_until(deadline)
+        overshoots.append(max(source.time() - deadline, 0.0))
+    return overshoots
+
+
+def _measure_dispatch(window: "Window", samples: int) -> List[float]:
+    """Measure the cost of dispatching the events of a window."""
+    source = get_clock_source()
+    costs = []
+    for _ in range(samples):
+        start = source.time()
+        window.dispatch_events()
+        costs.append(source.time() - start)
+    return costs
+
+
+def _measure_flips(window: "Window", samples: int) -> List[float]:
+    """Measure the intervals between consecutive flips of a window."""
+    source = get_clock_source()
+    window.flip()
+    previous = source.time()
+    intervals = []
+    for _ in range(samples):
+        window.flip()
+        current = source.time()
+        intervals.append(current - previous)
+        previous = current
+    return intervals
+
+
+def calibrate(
+    window: Optional["Window"] = None,
+    samples: int = 200,
+    sleep_duration: float = 0.001,
+    percentile: float = 0.99,
+    margin: float = 0.0005,
+    save: bool = True,
+    path: Optional["PathStr"] = None,
+    apply: bool = True,
+) -> Dict[str, Any]:
+    """
+    Measure the timing characteristics of this machine and store them in a profile.
+
+    The profile contains the resolution of the clock source, the distribution of the overshoot
+    of `sleep()` and, if a window is given, the cost of dispatching its events and the jitter
+    of its flip interval. From the sleep overshoot, a `hog_period` covering the given
+    percentile is recommended. The profile is saved in a per-host cache file (see
+    `get_profile_path`) that is loaded automatically the first time that `wait`, `Interval` or
+    `Window.wait` need their default parameters, so the measurement only has to be done once
+    per machine.
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        A window used to measure the event dispatch cost and the flip interval. If None, those
+        measurements are skipped.
+    samples : int, default=200
+        The number of measurements of each kind.
+    sleep_duration : float, default=0.001
+        The duration in seconds of each measured sleep.
+    percentile : float, default=0.99
+        The fraction of sleep overshoots covered by the recommended hog period.
+    margin : float, default=0.0005
+        Safety margin in seconds added to the recommended hog period.
+    save : bool, default=True
+        Whether to write the profile to disk.
+    path : Optional[PathStr], default=None
+        The file to write the profile to. If None, `get_profile_path()` is used.
+    apply : bool, default=True
+        Whether to apply the profile to the current session (see `apply_profile`).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The timing profile.
+
+    Raises
+    ------
+    RuntimeError
+        If the active clock source is virtual, as it does not measure the machine.
+
+    Examples
+    --------
+    >>> window = Window(fullscreen=True)
+    >>> profile = calibrate(window)
+    >>> profile["hog_period"]  # Recommended hog period in seconds
+    """
+    if get_clock_source().virtual:
+        raise RuntimeError(
+            "Cannot calibrate with a virtual clock source. Use a real clock source instead."
+        )
+    overshoots = _measure_sleep(samples, sleep_duration)
+
+    profile = {
+        "version": PROFILE_VERSION,
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "clock_source": type(get_clock_source()).__name__,
+        "clock_resolution": _measure_resolution(min(samples, 100)),
+        "sleep_duration": sleep_duration,
+        "sleep_overshoot": _summarize(overshoots),
+        "sleep_overshoots": overshoots[-256:],
+        "dispatch_cost": None,
+        "flip_interval": None,
+        "sleep_interval": TIMING_DEFAULTS["sleep_interval"],
+        "hog_period": _percentile(overshoots, percentile) + margin,
+    }
+
+    if window is not None:
+        profile["dispatch_cost"] = _summarize(_measure_dispatch(window, samples))
+        profile["flip_interval"] = _summarize(_measure_flips(window, samples))
+
+    if save:
+        path = Path(path) if path is not None else get_profile_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+
+    if apply:
+        apply_profile(profile)
+
+    return profile
+
+
+def load_profile(path: Optional["PathStr"] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a timing profile from disk.
+
+    Parameters
+    ----------
+    path : Optional[PathStr], default=None
+        The profile file. If None, `get_profile_path()` is used.
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        The timing profile, or None if the file does not exist, cannot be read or was written
+        by an incompatible version.
+    """
+    path = Path(path) if path is not None else get_profile_path()
+    try:
+        profile = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(profile, dict) or profile.get("version") != PROFILE_VERSION:
+        return None
+    return profile
+
+
+def apply_profile(profile: Dict[str, Any]) -> None:
+    """
+    Use a timing profile for the default parameters of the current session.
+
+    The recommended `sleep_interval` and `hog_period` become the defaults of `wait`,
+    `Interval` and `Window.wait`, and the measured sleep overshoots are used to seed the
+    adaptive hog period (see `SleepCalibrator`).
+
+    Parameters
+    ----------
+    profile : Dict[str, Any]
+        A profile returned by `calibrate` or `load_profile`.
+    """
+    global _profile_loaded  # pylint: disable=global-statement
+
+    for name in TIMING_DEFAULTS:
+        if profile.get(name) is not None:
+            TIMING_DEFAULTS[name] = float(profile[name])
+
+    calibrator = get_sleep_calibrator()
+    duration = profile.get("sleep_duration", 0.0)
+    for overshoot in profile.get("sleep_overshoots", []):
+        calibrator.record(duration, duration + overshoot)
+
+    _profile_loaded = True
+
+
+def get_timing_defaults() -> Dict[str, float]:
+    """
+    Get the default timing parameters, loading the profile of this machine on the first call.
+
+    Returns
+    -------
+    Dict[str, float]
+        The default `sleep_interval` and `hog_period` in seconds.
+    """
+    global _profile_loaded  # pylint: disable=global-statement
+
+    if not _profile_loaded:
+        _profile_loaded = True
+        profile = load_profile()
+        if profile is not None:
+            apply_profile(profile)
+    return TIMING_DEFAULTS
@@ -0,0 +1,267 @@
+"""psychos.core.collector: Module to control garbage collection during stimulus presentation."""
+
+import contextlib
+import gc
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.buffers import RecordBuffer
+from .timebase import get_time
+
+__all__ = ["GCController", "get_gc_controller"]
+
+# Conservative cost estimates in seconds used until a collection of each generation is observed
+DEFAULT_PAUSE_ESTIMATES = (0.0005, 0.002, 0.02)
+
+_active_controller: Optional["GCController"] = None  # pylint: disable=invalid-name
+
+
+class GCController:
+    """
+    Controller deferring garbage collections to the gaps of an experiment.
+
+    A full (generation 2) collection triggered in the middle of a trial can stall the process
+    for several milliseconds and make a frame or a wait miss its deadline. While the controller
+    is suspended (see `suspend` or `suspended`), automatic collections are disabled and, if
+    `freeze` is True, all existing objects are moved to the permanent generation with
+    `gc.freeze()`, so that later collections do not have to scan them.
+
+    The collections that the interpreter would have run are deferred to gaps where they do not
+    affect timing: `Interval.wait` and `Timeline.wait` run them before waiting if they fit in
+    the remaining time, `Window.flip` runs them after the flip if they fit in `flip_budget`,
+    and `collect` can be called explicitly (e.g. during the inter-trial interval). The cost of
+    each generation is estimated from the longest pause observed so far.
+
+    Every collection, including automatic ones, is recorded with `gc.callbacks` in `pauses`,
+    a `RecordBuffer` with the columns "start" (time of the active clock source), "duration",
+    "generation", "collected" and "uncollectable", so that pauses can be correlated with
+    timing misses.
+
+    Parameters
+    ----------
+    freeze : bool, default=True
+        Whether to freeze the existing objects while suspended. `gc.unfreeze` releases all
+        the frozen objects at once, so the objects are only unfrozen on `resume` if nothing
+        was frozen before `suspend`. If the application already froze objects (e.g. before
+        forking worker processes), the objects frozen by the controller stay frozen.
+    flip_budget : float, default=0.002
+        Time in seconds available for deferred collections after `Window.flip`.
+    margin : float, default=0.001
+        Safety margin in seconds subtracted from the time available for a collection.
+    capacity : int, default=1024
+        The number of pauses recorded before the oldest are overwritten.
+
+    Examples
+    --------
+    >>> controller = GCController()
+    >>> for trial in trials:
+    >>>     with controller.suspended():
+    >>>         with Interval(0.5):  # Deferred collections run before waiting
+    >>>             stimulus.draw()
+    >>>             window.flip()
+    >>>         key_event = window.wait_key(max_wait=2)
+    >>>     controller.collect()  # Full collection during the inter-trial interval
+    >>> controller.pauses.to_csv("gc_pauses.csv")
+    """
+
+    def __init__(
+        self,
+        freeze: bool = True,
+        flip_budget: float = 0.002,
+        margin: float = 0.001,
+        capacity: int = 1024,
+    ):
+        self.freeze = freeze
+        self.flip_budget = flip_budget
+        self.margin = margin
+        self.pauses = RecordBuffer(
+            {
+                "start": "d",
+                "duration": "d",
+                "generation": "b",
+                "collected": "q",
+                "uncollectable": "q",
+            },
+            capacity=capacity,
+            ring=True,
+        )
+        self._longest_pause = [0.0, 0.0, 0.0]
+        self._collection_start = None
+        self._was_enabled = None
+        self._unfreeze = False
+        gc.callbacks.append(self._on_collection)
+
+    def _on_collection(self, phase: str, info: Dict[str, Any]) -> None:
+        """Callback of `gc.callbacks` recording the duration of each collection."""
+        if phase == "start":
+            self._collection_start = get_time()
+        elif self._collection_start is not None:
+            duration = get_time() - self._collection_start
+            generation = info["generation"]
+            self._longest_pause[generation] = max(self._longest_pause[generation], duration)
+            self.pauses.append(
+                self._collection_start,
+                duration,
+                generation,
+                info["collected"],
+                info["uncollectable"],
+            )
+            self._collection_start = None
+
+    @property
+    def is_suspended(self) -> bool:
+        """Whether automatic collections are currently deferred by this controller."""
+        return self._was_enabled is not None
+
+    def estimate(self, generation: int) -> float:
+        """
+        Estimate the duration of a collection.
+
+        Parameters
+        ----------
+        generation : int
+            The generation collected (0, 1 or 2).
+
+        Returns
+        -------
+        float
+            The longest pause observed for the generation, or a conservative default if none
+            has been observed yet.
+        """
+        return self._longest_pause[generation] or DEFAULT_PAUSE_ESTIMATES[generation]
+
+    def suspend(self) -> None:
+        """Disable automatic collections and freeze the existing objects if `freeze` is True."""
+        global _active_controller  # pylint: disable=global-statement
+
+        if self.is_suspended:
+            return
+        self._was_enabled = gc.isenabled()
+        gc.disable()
+        if self.freeze:
+            # Objects frozen by the application must not be unfrozen by `resume`
+            self._unfreeze = gc.get_freeze_count() == 0
+            gc.freeze()
+        _active_controller = self
+
+    def resume(self) -> None:
+        """Restore automatic collections and unfreeze the objects frozen by `suspend`, if any."""
+        global _active_controller  # pylint: disable=global-statement
+
+        if not self.is_suspended:
+            return
+        if self._unfreeze:
+            gc.unfreeze()
+            self._unfreeze = False
+        if self._was_enabled:
+            gc.enable()
+        self._was_enabled = None
+        if _active_controller is self:
+            _active_controller = None
+
+    @contextlib.contextmanager
+    def suspended(self) -> Iterator["GCController"]:
+        """
+        Context manager deferring automatic collections during a block (e.g. a trial).
+
+        Yields
+        ------
+        GCController
+            The controller itself.
+        """
+        self.suspend()
+        try:
+            yield self
+        finally:
+            self.resume()
+
+    def pending_generation(self) -> Optional[int]:
+        """
+        Get the generation that the interpreter would collect now if collection was enabled.
+
+        Returns
+        -------
+        Optional[int]
+            The oldest generation whose count exceeds its threshold, or None if no collection
+            is due.
+        """
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        generation = None
+        for index, (count, threshold) in enumerate(zip(counts, thresholds)):
+            if threshold and count > threshold:
+                generation = index
+        return generation
+
+    def collect_in_gap(self, budget: Optional[float] = None) -> Optional[int]:
+        """
+        Run the deferred collection if it is expected to finish within the given time.
+
+        If the due generation does not fit, the oldest younger generation that fits is
+        collected instead.
+
+        Parameters
+        ----------
+        budget : Optional[float], default=None
+            The time in seconds available for the collection. If None, the due collection is
+            always run.
+
+        Returns
+        -------
+        Optional[int]
+            The generation collected, or None if no collection was run.
+        """
+        generation = self.pending_generation()
+        if generation is None:
+            return None
+        if budget is not None:
+            while generation >= 0 and self.estimate(generation) + self.margin > budget:
+                generation -= 1
+            if generation < 0:
+                return None
+        gc.collect(generation)
+        return generation
+
+    def collect(self, generation: int = 2) -> int:
+        """
+        Run a collection now, regardless of the counts of the generations.
+
+        Parameters
+        ----------
+        generation : int, default=2
+            The oldest generation to collect.
+
+        Returns
+        -------
+        int
+            The number of unreachable objects found.
+        """
+        return gc.collect(generation)
+
+    def get_pauses(self) -> List[Dict[str, Any]]:
+        """
+        Get the recorded collections.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One dictionary per collection with the keys "start", "duration", "generation",
+            "collected" and "uncollectable".
+        """
+        return [dict(zip(self.pauses.names, row)) for row in self.pauses.rows()]
+
+    def close(self) -> None:
+        """Resume automatic collections and stop recording pauses."""
+        self.resume()
+        if self._on_collection in gc.callbacks:
+            gc.callbacks.remove(self._on_collection)
+
+
+def get_gc_controller() -> Optional[GCController]:
+    """
+    Get the controller currently deferring garbage collections.
+
+    Returns
+    -------
+    Optional[GCController]
+        The suspended controller, or None if automatic collection is not deferred.
+    """
+    return _active_controller
@@ -0,0 +1,220 @@
+"""psychos.core.epoch: Module to share a clock epoch between processes."""
+
+import struct
+import sys
+import warnings
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional, Union
+
+from .time import Clock
+from .timebase import CLOCK_SOURCES, get_clock_source, get_time, set_clock_source
+
+__all__ = ["SharedEpoch"]
+
+# Epoch in nanoseconds of the clock source and registered name of the clock source
+EPOCH_LAYOUT = struct.Struct("<q16s")
+
+
+def _source_name() -> Optional[str]:
+    """Get the registered name of the active clock source, if it has one."""
+    source_type = type(get_clock_source())
+    return next((name for name, cls in CLOCK_SOURCES.items() if cls is source_type), None)
+
+
+def _has_resource_tracker() -> bool:
+    """Check whether this process is already connected to a `multiprocessing` resource tracker."""
+    # `_resource_tracker._fd` is a private detail of CPython, set once the tracker is started or
+    # inherited. If it is missing, no tracker is assumed: the block is then unregistered, which
+    # can only leak it after a crash instead of destroying it when this process exits.
+    tracker = getattr(resource_tracker, "_resource_tracker", None)
+    return getattr(tracker, "_fd", None) is not None
+
+
+def _attach_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(  # pylint: disable=unexpected-keyword-arg
+            name=name, track=False
+        )
+    # Children of `multiprocessing` (and the creating process) share a resource tracker where
+    # the block is already registered. Otherwise, attaching starts a new tracker, which would
+    # destroy the block when this process exits unless the block is unregistered from it.
+    shared_tracker = _has_resource_tracker()
+    memory = shared_memory.SharedMemory(name=name)
+    if not shared_tracker:
+        # pylint: disable-next=protected-access
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+class SharedEpoch:
+    """
+    Clock epoch published in shared memory so that several processes use the same timebase.
+
+    The default clock sources read a system-wide monotonic clock (`CLOCK_MONOTONIC` on Linux,
+    `QueryPerformanceCounter` on Windows), so raw timestamps of `get_time` are comparable
+    between the processes of a machine. What differs between processes is the reference:
+    every `Clock` counts from its own creation. A `SharedEpoch` stores one reference time in a
+    `multiprocessing.shared_memory` block; helper processes attach to it by name and create
+    their clocks from it, so that all clocks and event records of the experiment are expressed
+    relative to the same instant, without any communication per sample.
+
+    The epoch can be passed to a child process as an argument (it is pickled as its name) or
+    attached with `SharedEpoch.attach(name)`. The process that creates the epoch owns the
+    block and removes it in `close`.
+
+    Parameters
+    ----------
+    epoch : Optional[float], default=None
+        The reference time, in the timebase of the active clock source. If None, the current
+        time is used.
+    name : Optional[str], default=None
+        The name of the shared memory block. If None, a unique name is generated.
+
+    Examples
+    --------
+    >>> def acquire(epoch):
+    >>>     clock = epoch.clock()  # Same zero as the clocks of the main process
+    >>>     while True:
+    >>>         samples.append((clock.time(), device.read()))
+    >>>
+    >>> with SharedEpoch() as epoch:
+    >>>     worker = multiprocessing.Process(target=acquire, args=(epoch,))
+    >>>     worker.start()
+    >>>     clock = epoch.clock()
+    """
+
+    def __init__(self, epoch: Optional[float] = None, name: Optional[str] = None):
+        source_name = _source_name()
+        if source_name is None or get_clock_source().virtual:
+            warnings.warn(
+                "The active clock source is not a registered system clock, so the timestamps "
+                "of other processes may not be comparable.",
+                RuntimeWarning,
+            )
+        self._memory = shared_memory.SharedMemory(name=name, create=True, size=EPOCH_LAYOUT.size)
+        self._owner = True
+        self._source_name = source_name or ""
+        self.set(epoch)
+
+    @classmethod
+    def attach(cls, name: str, adopt_source: bool = True) -> "SharedEpoch":
+        """
+        Attach to an epoch created by another process.
+
+        Parameters
+        ----------
+        name : str
+            The name of the epoch (see `name`).
+        adopt_source : bool, default=True
+            If True and the epoch was created with a different registered clock source, the
+            clock source of this process is set to the same one (see `set_clock_source`).
+            Otherwise, a warning is issued.
+
+        Returns
+        -------
+        SharedEpoch
+            The attached epoch.
+        """
+        epoch = cls.__new__(cls)
+        epoch._memory = _attach_memory(name)
+        epoch._owner = False
+        _, source_name = EPOCH_LAYOUT.unpack_from(epoch._memory.buf)
+        epoch._source_name = source_name.rstrip(b"\0").decode()
+
+        if epoch._source_name and epoch._source_name != _source_name():
+            if adopt_source:
+                set_clock_source(epoch._source_name)
+            else:
+                warnings.warn(
+                    f"The epoch was created with the '{epoch._source_name}' clock source, but "
+                    f"this process uses '{_source_name()}'.",
+                    RuntimeWarning,
+                )
+        return epoch
+
+    def __reduce__(self):
+        return (SharedEpoch.attach, (self.name,))
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block, used to attach from other processes."""
+        return self._memory.name
+
+    @property
+    def epoch(self) -> float:
+        """The reference time, in the timebase of the active clock source."""
+        return EPOCH_LAYOUT.unpack_from(self._memory.buf)[0] / 1e9
+
+    def set(self, epoch: Optional[float] = None) -> None:
+        """
+        Move the reference time, for all the processes attached to the epoch.
+
+        Clocks created with `clock` before the change keep their start time.
+
+        Parameters
+        ----------
+        epoch : Optional[float], default=None
+            The new reference time. If None, the current time is used.
+        """
+        epoch = get_time() if epoch is None else epoch
+        EPOCH_LAYOUT.pack_into(
+            self._memory.buf, 0, round(epoch * 1e9), self._source_name.encode()
+        )
+
+    def time(self) -> float:
+        """
+        Get the time elapsed since the epoch.
+
+        Returns
+        -------
+        float
+            The elapsed time in seconds.
+        """
+        return get_time() - self.epoch
+
+    def relative(self, timestamp: float) -> float:
+        """
+        Express a timestamp of the active clock source (e.g. of an `InputEvent`) relative to
+        the epoch.
+
+        Parameters
+        ----------
+        timestamp : float
+            A timestamp from `get_time`.
+
+        Returns
+        -------
+        float
+            The time in seconds since the epoch.
+        """
+        return timestamp - self.epoch
+
+    def clock(self, fmt: Optional[Union[Callable, str]] = None, capacity: int = 1024) -> Clock:
+        """
+        Create a clock counting from the epoch.
+
+        Parameters
+        ----------
+        fmt, capacity
+            See `Clock`.
+
+        Returns
+        -------
+        Clock
+            A clock whose start time is the epoch.
+        """
+        return Clock(start_time=self.epoch, fmt=fmt, capacity=capacity)
+
+    def close(self) -> None:
+        """Detach from the epoch, and remove the shared block if this process created it."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            self._owner = False
+
+    def __enter__(self) -> "SharedEpoch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
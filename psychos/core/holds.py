@@ -0,0 +1,224 @@
+"""psychos.core.holds: Module to record key holds as paired press and release times."""
+
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from ..utils.buffers import RecordBuffer
+from .keys import KeyFilter, Symbols, _id_to_symbol
+from .timebase import get_time
+
+if TYPE_CHECKING:
+    from ..types import PathStr
+    from ..visual.window import Window
+
+__all__ = ["HoldRecorder"]
+
+
+class HoldRecorder:
+    """
+    Recorder pairing the press and release of each key into holds.
+
+    A single pair of handlers receives both the presses and the releases of the window. The
+    press time of each key is kept until the key is released, and the completed hold is then
+    appended to preallocated numeric columns "key" (Pyglet key ID), "t_down", "t_up" and
+    "modifiers" (bitmask held at the press). No Python object is created per hold, so tapping
+    and force-release tasks with thousands of responses can be recorded continuously and
+    queried at the end of a block or of the session.
+
+    Repeated presses of a key that is already held (auto-repeat) are ignored, and the times
+    are those of the active clock source when the handlers run (see `get_time`). As with
+    `Keyboard`, events are recorded whenever the window events are dispatched.
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window to capture key events from. If None, the current window is used.
+    keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]], default=None
+        The keys to record, or a `KeyFilter` (matched with the modifiers held at the press).
+        If None, all keys are recorded.
+    capacity : int, default=4096
+        The number of holds preallocated. The columns grow when it is exceeded.
+
+    Examples
+    --------
+    >>> recorder = HoldRecorder(window, keys="SPACE")
+    >>> wait(60)  # Synchronization-continuation tapping block
+    >>> long_holds = recorder.select(min_duration=0.3)
+    >>> long_holds["t_down"], long_holds["duration"]
+    >>> recorder.to_csv("taps.csv")
+    """
+
+    def __init__(
+        self,
+        window: Optional["Window"] = None,
+        keys: Union[Symbols, KeyFilter] = None,
+        capacity: int = 4096,
+    ):
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self.filter = KeyFilter.create(keys)
+        self._buffer = RecordBuffer(
+            {"key": "q", "t_down": "d", "t_up": "d", "modifiers": "q"}, capacity=capacity
+        )
+        self._held: Dict[int, tuple] = {}
+        self.window.push_handlers(
+            on_key_press=self.on_key_press, on_key_release=self.on_key_release
+        )
+
+    def on_key_press(self, symbol: int, modifiers: int) -> None:
+        """Handler for key press events."""
+        if symbol not in self._held and self.filter.matches(symbol, modifiers):
+            self._held[symbol] = (get_time(), modifiers)
+
+    def on_key_release(
+        self, symbol: int, modifiers: int  # pylint: disable=unused-argument
+    ) -> None:
+        """Handler for key release events."""
+        held = self._held.pop(symbol, None)
+        if held is not None:
+            self._buffer.append(symbol, held[0], get_time(), held[1])
+
+    def __len__(self) -> int:
+        """Number of completed holds."""
+        return len(self._buffer)
+
+    @property
+    def held(self) -> Dict[str, float]:
+        """The keys currently held, mapped to their press time."""
+        return {_id_to_symbol(symbol): t_down for symbol, (t_down, _) in self._held.items()}
+
+    def columns(self) -> Dict[str, array]:
+        """
+        Get the completed holds.
+
+        Returns
+        -------
+        Dict[str, array]
+            The columns "key", "t_down", "t_up", "modifiers" and "duration" (`t_up - t_down`)
+            in order of release.
+        """
+        columns = self._buffer.columns()
+        columns["duration"] = array(
+            "d", [t_up - t_down for t_down, t_up in zip(columns["t_down"], columns["t_up"])]
+        )
+        return columns
+
+    def select(
+        self,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        keys: Union[Symbols, KeyFilter] = None,
+        since: Optional[float] = None,
+    ) -> Dict[str, array]:
+        """
+        Get the completed holds matching duration, key and time criteria.
+
+        The events of the window are dispatched first, so that pending releases are included.
+
+        Parameters
+        ----------
+        min_duration : Optional[float], default=None
+            The minimum hold duration in seconds (inclusive).
+        max_duration : Optional[float], default=None
+            The maximum hold duration in seconds (inclusive).
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]], default=None
+            The keys of the holds, or a `KeyFilter` matched with the modifiers of the press.
+        since : Optional[float], default=None
+            Only holds pressed at or after this time are returned.
+
+        Returns
+        -------
+        Dict[str, array]
+            The matching holds, with the same columns as `columns`.
+        """
+        self.window.dispatch_events()
+        columns = self.columns()
+        key_filter = KeyFilter.create(keys)
+        low = float("-inf") if min_duration is None else min_duration
+        high = float("inf") if max_duration is None else max_duration
+        start = float("-inf") if since is None else since
+        indices = [
+            index
+            for index, (symbol, t_down, modifiers, duration) in enumerate(
+                zip(columns["key"], columns["t_down"], columns["modifiers"], columns["duration"])
+            )
+            if low <= duration <= high
+            and t_down >= start
+            and key_filter.matches(symbol, modifiers)
+        ]
+        return {
+            name: array(values.typecode, [values[index] for index in indices])
+            for name, values in columns.items()
+        }
+
+    def durations(self, keys: Union[Symbols, KeyFilter] = None) -> array:
+        """
+        Get the durations of the completed holds.
+
+        Parameters
+        ----------
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]], default=None
+            The keys of the holds. If None, the holds of all keys.
+
+        Returns
+        -------
+        array
+            The durations in seconds, in order of release.
+        """
+        return self.select(keys=keys)["duration"]
+
+    @staticmethod
+    def key_names(codes: Iterable[int]) -> List[str]:
+        """
+        Convert the values of the "key" column to key names.
+
+        Parameters
+        ----------
+        codes : Iterable[int]
+            Pyglet key IDs.
+
+        Returns
+        -------
+        List[str]
+            The key names (e.g. "SPACE").
+        """
+        return [_id_to_symbol(code) for code in codes]
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Get the completed holds as NumPy arrays. Requires `numpy` to be installed.
+
+        Returns
+        -------
+        Dict[str, numpy.ndarray]
+            The columns of `columns` as NumPy arrays, e.g. to select holds with boolean masks.
+        """
+        columns = self._buffer.to_numpy()
+        columns["duration"] = columns["t_up"] - columns["t_down"]
+        return columns
+
+    def to_csv(self, path: "PathStr") -> None:
+        """
+        Write the completed holds to a CSV file with a header row.
+
+        Parameters
+        ----------
+        path : PathStr
+            The path of the CSV file.
+        """
+        self._buffer.to_csv(path)
+
+    def clear(self) -> None:
+        """Discard the completed holds. Keys currently held are still paired on release."""
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Remove the handlers of the recorder from the window."""
+        self.window.remove_handlers(
+            on_key_press=self.on_key_press, on_key_release=self.on_key_release
+        )
+        self._held.clear()
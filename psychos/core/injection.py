@@ -0,0 +1,407 @@
+"""psychos.core.injection: Module to inject synthetic input events and benchmark latency."""
+
+import ctypes
+import ctypes.util
+import math
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Sequence
+
+from pyglet.window import key, mouse
+
+from ..types import KeyEvent
+from ..utils.buffers import RecordBuffer
+from ..utils.stats import percentile
+from .input import INPUT_KINDS
+from .keys import KeyFilter, wait_key
+from .simulation import _parse_event
+from .timebase import get_clock_source, get_time
+
+if TYPE_CHECKING:
+    from ..visual.window import Window
+
+__all__ = ["InputInjector", "measure_input_latency"]
+
+INJECTION_BACKENDS = ("dispatch", "xtest")
+
+# The injection thread sleeps until this time before each event and then spins
+SPIN_PERIOD = 0.002
+
+# Keys held by the "xtest" backend around an event with modifiers
+XTEST_MODIFIER_KEYS = {
+    key.MOD_SHIFT: key.LSHIFT,
+    key.MOD_CTRL: key.LCTRL,
+    key.MOD_ALT: key.LALT,
+    key.MOD_WINDOWS: key.LWINDOWS,
+}
+# Pyglet mouse buttons and their X11 numbers
+XTEST_BUTTONS = {mouse.LEFT: 1, mouse.MIDDLE: 2, mouse.RIGHT: 3, mouse.MOUSE4: 8, mouse.MOUSE5: 9}
+
+
+class _XTest:
+    """Minimal binding of the XTest extension, with its own connection to the display."""
+
+    def __init__(self):
+        x11_path, xtst_path = ctypes.util.find_library("X11"), ctypes.util.find_library("Xtst")
+        if not x11_path or not xtst_path:
+            raise RuntimeError("The 'xtest' backend requires the libX11 and libXtst libraries.")
+        self._x11, self._xtst = ctypes.CDLL(x11_path), ctypes.CDLL(xtst_path)
+
+        display, c_int, c_uint = ctypes.c_void_p, ctypes.c_int, ctypes.c_uint
+        c_ulong = ctypes.c_ulong
+        self._x11.XOpenDisplay.restype = display
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        self._x11.XKeysymToKeycode.argtypes = [display, c_ulong]
+        self._x11.XFlush.argtypes = [display]
+        self._x11.XCloseDisplay.argtypes = [display]
+        self._xtst.XTestQueryExtension.argtypes = [display] + [ctypes.POINTER(c_int)] * 4
+        self._xtst.XTestFakeKeyEvent.argtypes = [display, c_uint, c_int, c_ulong]
+        self._xtst.XTestFakeButtonEvent.argtypes = [display, c_uint, c_int, c_ulong]
+        self._xtst.XTestFakeMotionEvent.argtypes = [display, c_int, c_int, c_int, c_ulong]
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise RuntimeError("Cannot open the X display. Check the DISPLAY variable.")
+        values = [ctypes.c_int() for _ in range(4)]
+        if not self._xtst.XTestQueryExtension(self._display, *map(ctypes.byref, values)):
+            self.close()
+            raise RuntimeError("The X server does not support the XTest extension.")
+
+    def key(self, symbol: int, press: bool) -> None:
+        """Fake a key event. Pyglet key symbols are X11 keysyms."""
+        keycode = self._x11.XKeysymToKeycode(self._display, symbol)
+        if not keycode:
+            raise ValueError(f"The key {symbol} is not in the keyboard map of the X server.")
+        self._xtst.XTestFakeKeyEvent(self._display, keycode, press, 0)
+
+    def button(self, button: int, press: bool) -> None:
+        """Fake a mouse button event."""
+        self._xtst.XTestFakeButtonEvent(self._display, XTEST_BUTTONS[button], press, 0)
+
+    def motion(self, x: int, y: int) -> None:
+        """Fake a pointer motion to screen coordinates."""
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+
+    def flush(self) -> None:
+        """Send the faked events to the server."""
+        self._x11.XFlush(self._display)
+
+    def close(self) -> None:
+        """Close the connection to the display."""
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+class InputInjector:
+    """
+    Injector of synthetic keyboard and mouse events into a window, at scheduled times.
+
+    Two backends are available:
+
+    - "dispatch" appends the events to the pending event queue of the Pyglet window, which is
+      emptied by the next `window.dispatch_events`. It works on any platform and without a
+      display server, and measures the cost of the psychos side of the input path. As the
+      queue does not wake up the display connection, waits with `blocking=True` only notice
+      the events when they time out or when other events arrive.
+    - "xtest" sends the events to the X server with the XTest extension (e.g. on Xvfb), so
+      they travel the same path as events of a physical keyboard: X server, socket, Xlib and
+      Pyglet. Mouse coordinates are converted from window to screen pixels.
+
+    Events are given as in `ScriptedInput`, and `play` injects them from a background thread
+    at `start + onset`. The intended and actual injection times are recorded in `log`, a
+    `RecordBuffer` with the columns "intended", "injected", "kind" (index in "key_press",
+    "key_release", "mouse_press", "mouse_release") and "code", so that the latency of any
+    response API can be computed from the times it reports. The injection thread competes for
+    the interpreter lock with busy loops of the main thread, so events may be injected a few
+    milliseconds after their intended time; latencies are measured from the actual time.
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window receiving the events. If None, the current window is used.
+    backend : str, default="dispatch"
+        The injection backend, "dispatch" or "xtest".
+    capacity : int, default=1024
+        The number of injections preallocated in `log`. It grows when exceeded.
+
+    Raises
+    ------
+    TypeError
+        If the active clock source is virtual (use `ScriptedInput` instead).
+    RuntimeError
+        If the "xtest" backend is requested but the X server or XTest are not available.
+
+    Examples
+    --------
+    >>> injector = InputInjector(window, backend="xtest")
+    >>> injector.play([(1.0, "key_press", "SPACE"), (1.1, "key_release", "SPACE")])
+    >>> key_event = window.wait_key(keys="SPACE", max_wait=2)
+    >>> get_time() - injector.log.column("injected")[0]  # Latency of wait_key
+    """
+
+    def __init__(
+        self,
+        window: Optional["Window"] = None,
+        backend: str = "dispatch",
+        capacity: int = 1024,
+    ):
+        if get_clock_source().virtual:
+            raise TypeError("Input injection runs in real time. Use `ScriptedInput` instead.")
+        if backend not in INJECTION_BACKENDS:
+            raise ValueError(f"Invalid backend '{backend}'. Must be one of {INJECTION_BACKENDS}.")
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self.backend = backend
+        self.log = RecordBuffer(
+            {"intended": "d", "injected": "d", "kind": "b", "code": "q"}, capacity=capacity
+        )
+        self._xtest = _XTest() if backend == "xtest" else None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def inject(
+        self,
+        kind: str,
+        code: Any,
+        modifiers: Any = 0,
+        x: float = 0,
+        y: float = 0,
+        intended: Optional[float] = None,
+    ) -> float:
+        """
+        Inject an event now.
+
+        Parameters
+        ----------
+        kind : str
+            "key_press", "key_release", "mouse_press" or "mouse_release".
+        code : Union[str, int]
+            A key name or symbol, or a mouse button.
+        modifiers : Union[str, int], default=0
+            Modifier names separated by '|' (e.g. "CTRL|SHIFT") or a bitmask.
+        x, y : float, default=0
+            The position of mouse events, in window pixels.
+        intended : Optional[float], default=None
+            The intended injection time recorded in `log`. If None, the injection time.
+
+        Returns
+        -------
+        float
+            The time (see `get_time`) at which the event was injected.
+        """
+        _, kind, code, modifiers, x, y = _parse_event((0, kind, code, modifiers, x, y))
+        injected = get_time()
+        if self._xtest is None:
+            self._dispatch(kind, code, modifiers, x, y)
+        else:
+            self._send_xtest(kind, code, modifiers, x, y)
+        intended = injected if intended is None else intended
+        self.log.append(intended, injected, INPUT_KINDS.index(kind), code)
+        return injected
+
+    def _dispatch(self, kind: str, code: int, modifiers: int, x: float, y: float) -> None:
+        """Append an event to the pending events of the window."""
+        args = (code, modifiers) if kind.startswith("key") else (x, y, code, modifiers)
+        queue = getattr(self.window, "_event_queue", None)
+        if queue is None:
+            self.window.dispatch_event(f"on_{kind}", *args)
+        else:
+            # Appending to the deque is atomic, so it is safe from the injection thread
+            queue.append((f"on_{kind}", *args))
+
+    def _send_xtest(self, kind: str, code: int, modifiers: int, x: float, y: float) -> None:
+        """Send an event to the X server, holding the modifier keys around it."""
+        held = [symbol for mask, symbol in XTEST_MODIFIER_KEYS.items() if modifiers & mask]
+        for symbol in held:
+            self._xtest.key(symbol, True)
+        press = kind.endswith("press")
+        if kind.startswith("key"):
+            self._xtest.key(code, press)
+        else:
+            left, top = self.window.get_location()
+            self._xtest.motion(left + int(x), top + self.window.height - 1 - int(y))
+            self._xtest.button(code, press)
+        for symbol in reversed(held):
+            self._xtest.key(symbol, False)
+        self._xtest.flush()
+
+    def play(self, events: Iterable[Sequence], start: Optional[float] = None) -> None:
+        """
+        Inject events at scheduled times from a background thread.
+
+        Parameters
+        ----------
+        events : Iterable[Sequence]
+            The events as tuples `(onset, kind, code, modifiers="", x=0, y=0)` (see
+            `ScriptedInput`).
+        start : Optional[float], default=None
+            The time to which onsets are relative. If None, the current time is used.
+        """
+        if self.is_playing:
+            raise RuntimeError("The injector is already playing events. Use `join` or `stop`.")
+        start = get_time() if start is None else start
+        schedule = sorted((start + onset, *rest) for onset, *rest in map(_parse_event, events))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(schedule,), daemon=True)
+        self._thread.start()
+
+    def _run(self, schedule: list) -> None:
+        """Thread target injecting the scheduled events."""
+        source = get_clock_source()
+        for intended, kind, code, modifiers, x, y in schedule:
+            # `wait` is not used because it dispatches the events of the windows
+            if self._stop.wait(max(intended - source.time() - SPIN_PERIOD, 0)):
+                return
+            while source.time() < intended:
+                pass
+            self.inject(kind, code, modifiers, x, y, intended=intended)
+
+    @property
+    def is_playing(self) -> bool:
+        """Whether scheduled events are still being injected."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until all the events of `play` have been injected."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self) -> None:
+        """Cancel the events of `play` that have not been injected yet."""
+        self._stop.set()
+        self.join()
+
+    def close(self) -> None:
+        """Stop playing and close the connection to the X server."""
+        self.stop()
+        if self._xtest is not None:
+            self._xtest.close()
+
+
+def _response_timestamp(result: Any) -> Optional[float]:
+    """Get the timestamp reported by a response, NaN if it has none, or None if it timed out."""
+    if isinstance(result, list):  # E.g. `Keyboard.wait_keys`
+        result = result[0] if result else KeyEvent(None, math.nan, None, "press")
+    if isinstance(result, KeyEvent) and result.key is None:
+        return None
+    return getattr(result, "timestamp", math.nan)
+
+
+def _latency_summary(values: Sequence[float]) -> Optional[Dict[str, float]]:
+    """Summarize latencies with their mean, percentiles and maximum."""
+    values = [value for value in values if not math.isnan(value)]
+    if not values:
+        return None
+    summary = {"mean": sum(values) / len(values)}
+    summary.update({f"p{percent}": percentile(values, percent / 100) for percent in (50, 90, 99)})
+    summary["max"] = max(values)
+    return summary
+
+
+def measure_input_latency(
+    window: Optional["Window"] = None,
+    response: Optional[Callable[[], Any]] = None,
+    trials: int = 50,
+    interval: float = 0.05,
+    backend: str = "dispatch",
+    key_name: str = "SPACE",
+) -> Dict[str, Any]:
+    """
+    Benchmark the latency and CPU cost of a response API with injected key presses.
+
+    A key press (and its release) is injected every `interval` seconds by an `InputInjector`,
+    while `response` is called once per trial in the calling thread. The latency of each trial
+    is the time from the injection to the return of `response`; if the response returns an
+    object with a `timestamp` (e.g. a `KeyEvent`), the time from the injection to that
+    timestamp is reported as the handler latency. The CPU cost is the CPU time of the calling
+    thread divided by the time spent in `response`: close to 1 for busy polling and close to
+    0 for blocking waits.
+
+    `response` must return after each press and before the next one, so `interval` must be
+    longer than the latency.
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window receiving the events. If None, the current window is used.
+    response : Optional[Callable[[], Any]], default=None
+        A function waiting for one response, e.g. `lambda: window.wait_key(blocking=True)`.
+        If None, `wait_key` waits for `key_name` with a timeout of two intervals.
+    trials : int, default=50
+        The number of key presses.
+    interval : float, default=0.05
+        The time in seconds between two presses.
+    backend : str, default="dispatch"
+        The injection backend (see `InputInjector`).
+    key_name : str, default="SPACE"
+        The key injected.
+
+    Returns
+    -------
+    Dict[str, Any]
+        "latency" and "handler_latency" (mean, p50, p90, p99 and max in seconds, or None),
+        "cpu_fraction", "missed" (trials where the response timed out or returned before the
+        injection), "trials" and "records" (the arrays "injected", "returned" and "handler" of
+        each trial, NaN when missing).
+
+    Examples
+    --------
+    >>> busy = measure_input_latency(window)
+    >>> blocking = measure_input_latency(
+    >>>     window, lambda: window.wait_key(max_wait=1, blocking=True), backend="xtest"
+    >>> )
+    >>> busy["latency"]["p99"], blocking["cpu_fraction"]
+    """
+    injector = InputInjector(window, backend=backend, capacity=2 * trials)
+    if response is None:
+        key_filter = KeyFilter(keys=key_name)
+
+        def response() -> KeyEvent:
+            return wait_key(keys=key_filter, max_wait=2 * interval, window=injector.window)
+
+    start = get_time() + interval
+    events = []
+    for trial in range(trials):
+        events.append((trial * interval, "key_press", key_name))
+        events.append((trial * interval + interval / 2, "key_release", key_name))
+
+    returned, handler = array("d"), array("d")
+    timed_out = []
+    cpu_time = wall_time = 0.0
+    injector.play(events, start=start)
+    try:
+        for _ in range(trials):
+            before, cpu_before = get_time(), time.thread_time()
+            result = response()
+            cpu_time += time.thread_time() - cpu_before
+            returned.append(get_time())
+            wall_time += returned[-1] - before
+            timestamp = _response_timestamp(result)
+            timed_out.append(timestamp is None)
+            handler.append(math.nan if timestamp is None else timestamp)
+        injector.join()
+    finally:
+        injector.close()
+
+    injected = injector.log.column("injected")[::2]  # Presses alternate with releases
+    injected.extend([math.nan] * (trials - len(injected)))
+    latency, handler_latency = array("d"), array("d")
+    for index, sent in enumerate(injected):
+        valid = not timed_out[index] and returned[index] >= sent
+        latency.append(returned[index] - sent if valid else math.nan)
+        handler_latency.append(handler[index] - sent if valid else math.nan)
+    return {
+        "latency": _latency_summary(latency),
+        "handler_latency": _latency_summary(handler_latency),
+        "cpu_fraction": cpu_time / wall_time if wall_time > 0 else 0.0,
+        "missed": sum(math.isnan(value) for value in latency),
+        "trials": trials,
+        "records": {"injected": injected, "returned": returned, "handler": handler},
+    }
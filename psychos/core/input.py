@@ -0,0 +1,284 @@
+"""psychos.core.input: Module with a timestamped queue of keyboard and mouse events."""
+
+import select
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..types import InputEvent
+from ..utils.buffers import RecordBuffer
+from .timebase import get_clock_source, get_time
+
+if TYPE_CHECKING:
+    from ..visual.window import Window
+
+__all__ = ["InputQueue", "get_input_queue", "wait_for_events", "x_event_time"]
+
+INPUT_KINDS = ["key_press", "key_release", "mouse_press", "mouse_release"]
+KEY_KINDS = INPUT_KINDS[:2]
+KEY_PRESS, KEY_RELEASE, MOUSE_PRESS, MOUSE_RELEASE = range(len(INPUT_KINDS))
+
+# Sleep between two polls on platforms whose display does not expose a file descriptor
+FALLBACK_POLL_INTERVAL = 0.001
+
+# X server times are milliseconds of the monotonic clock, stored in 32 bits
+X_TIME_WRAP = 2**32
+# X server times older than this are assumed to come from another clock and are discarded
+MAX_NATIVE_AGE = 1.0
+
+
+class InputQueue:
+    """
+    Queue of keyboard and mouse events timestamped when they are dispatched.
+
+    The queue installs its handlers in the window, and every key and mouse press or release is
+    stored with the time of the active clock source at which its handler was called. Events
+    are dispatched whenever `window.dispatch_events` is called, including during the hog period
+    of `wait` when `hog_dispatch_interval` is set, so that responses overlapping a precise wait
+    keep an accurate timestamp. `wait_key` reads pending events from the queue of the window
+    when called with `clear_events=False`. Key waits only consume key events, so mouse events
+    stay pending for other consumers of the queue.
+
+    The events are stored in a fixed-size ring buffer of numeric records, so the oldest events
+    are discarded when more than `capacity` events are pending.
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window to capture events from. If None, the current window is used.
+    capacity : int, default=1024
+        The maximum number of events stored.
+
+    Examples
+    --------
+    >>> queue = InputQueue(window)
+    >>> window.flip()
+    >>> wait(0.5, hog_dispatch_interval=0.001)  # Presses are timestamped during the wait
+    >>> key_event = wait_key(keys="SPACE", clear_events=False)  # Reads the queue first
+    """
+
+    def __init__(self, window: Optional["Window"] = None, capacity: int = 1024):
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self._buffer = RecordBuffer(
+            {"timestamp": "d", "kind": "b", "code": "q", "modifiers": "q", "x": "d", "y": "d"},
+            capacity=capacity,
+            ring=True,
+        )
+        self._cursor = 0
+        # Sequence numbers of the events after the cursor that were consumed out of order
+        self._consumed: Set[int] = set()
+        self.window.push_handlers(
+            on_key_press=self.on_key_press,
+            on_key_release=self.on_key_release,
+            on_mouse_press=self.on_mouse_press,
+            on_mouse_release=self.on_mouse_release,
+        )
+        self.window.input_queue = self
+
+    def on_key_press(self, symbol: int, modifiers: int) -> None:
+        """Handler for key press events."""
+        self._buffer.append(get_time(), KEY_PRESS, symbol, modifiers, 0.0, 0.0)
+
+    def on_key_release(self, symbol: int, modifiers: int) -> None:
+        """Handler for key release events."""
+        self._buffer.append(get_time(), KEY_RELEASE, symbol, modifiers, 0.0, 0.0)
+
+    def on_mouse_press(self, x: float, y: float, button: int, modifiers: int) -> None:
+        """Handler for mouse press events."""
+        self._buffer.append(get_time(), MOUSE_PRESS, button, modifiers, x, y)
+
+    def on_mouse_release(self, x: float, y: float, button: int, modifiers: int) -> None:
+        """Handler for mouse release events."""
+        self._buffer.append(get_time(), MOUSE_RELEASE, button, modifiers, x, y)
+
+    def __len__(self) -> int:
+        """Number of pending (not yet consumed) events."""
+        start = max(self._cursor, self._buffer.first)
+        return self._buffer.total - start - sum(1 for seq in self._consumed if seq >= start)
+
+    def _pending(self) -> Iterator[Tuple[int, Tuple]]:
+        """Iterate over the sequence numbers and records of the pending events."""
+        start = max(self._cursor, self._buffer.first)
+        for sequence, row in enumerate(self._buffer.rows(start=start), start):
+            if sequence not in self._consumed:
+                yield sequence, row
+
+    def _consume(self, sequences: Iterable[int]) -> None:
+        """Mark events as consumed, moving the cursor past the consumed events at its front."""
+        self._consumed.update(sequences)
+        cursor = max(self._cursor, self._buffer.first)
+        while cursor in self._consumed:
+            cursor += 1
+        self._cursor = cursor
+        self._consumed = {sequence for sequence in self._consumed if sequence >= cursor}
+
+    def get_events(self, consume: bool = True) -> List[InputEvent]:
+        """
+        Get the pending events in order of arrival.
+
+        Parameters
+        ----------
+        consume : bool, default=True
+            If True, the returned events are removed from the pending events.
+
+        Returns
+        -------
+        List[InputEvent]
+            The pending events.
+        """
+        events = [
+            InputEvent(INPUT_KINDS[kind], code, modifiers, x, y, timestamp)
+            for _, (timestamp, kind, code, modifiers, x, y) in self._pending()
+        ]
+        if consume:
+            self.clear()
+        return events
+
+    def pop(self, index: int, kinds: Optional[Iterable[str]] = None) -> None:
+        """
+        Consume the pending events up to and including the `index`-th pending event.
+
+        Parameters
+        ----------
+        index : int
+            The position of the event in the list returned by `get_events`.
+        kinds : Optional[Iterable[str]], default=None
+            The kinds of events to consume (see `INPUT_KINDS`), e.g. only the key events. If
+            None, all the events are consumed.
+        """
+        kind_ids = None if kinds is None else {INPUT_KINDS.index(kind) for kind in kinds}
+        sequences = []
+        for position, (sequence, row) in enumerate(self._pending()):
+            if position > index:
+                break
+            if kind_ids is None or row[1] in kind_ids:
+                sequences.append(sequence)
+        self._consume(sequences)
+
+    def clear(self, kinds: Optional[Iterable[str]] = None) -> None:
+        """
+        Mark the stored events as consumed.
+
+        Parameters
+        ----------
+        kinds : Optional[Iterable[str]], default=None
+            The kinds of events to consume (see `INPUT_KINDS`). If None, all the events are
+            consumed.
+        """
+        if kinds is None:
+            self._cursor = self._buffer.total
+            self._consumed.clear()
+        else:
+            self.pop(len(self) - 1, kinds=kinds)
+
+    def close(self) -> None:
+        """Remove the handlers of the queue from the window."""
+        self.window.remove_handlers(
+            on_key_press=self.on_key_press,
+            on_key_release=self.on_key_release,
+            on_mouse_press=self.on_mouse_press,
+            on_mouse_release=self.on_mouse_release,
+        )
+        if getattr(self.window, "input_queue", None) is self:
+            self.window.input_queue = None
+
+
+def get_input_queue(window: "Window") -> Optional[InputQueue]:
+    """
+    Get the input queue attached to a window.
+
+    Parameters
+    ----------
+    window : Window
+        The window.
+
+    Returns
+    -------
+    Optional[InputQueue]
+        The input queue of the window, or None if no queue is attached.
+    """
+    return getattr(window, "input_queue", None)
+
+
+def wait_for_events(window: "Window", deadline: float) -> None:
+    """
+    Block until the window may have events to dispatch or until a deadline.
+
+    On X11, the process sleeps in `select` on the file descriptor of the connection to the
+    display server, so it wakes up as soon as an event arrives, without using the CPU while
+    waiting. On platforms whose display does not expose a file descriptor, the process sleeps
+    for short periods of `FALLBACK_POLL_INTERVAL` seconds instead, which bounds the added
+    latency. With a virtual clock source, the simulated time is advanced (see
+    `VirtualClockSource.idle`).
+
+    Raw input devices attached to the window (e.g. `EvdevKeyboard`) also wake the process up.
+
+    The function may return before an event is available (e.g. for events of other windows),
+    so it must be called in a loop that dispatches the events of the window.
+
+    Parameters
+    ----------
+    window : Window
+        The window whose events are awaited.
+    deadline : float
+        The time of the active clock source at which to return at the latest. It can be
+        infinite.
+    """
+    source = get_clock_source()
+    if source.virtual:
+        source.idle(deadline)
+        return
+    if getattr(window, "_event_queue", None):
+        return  # Events dispatched outside of `dispatch_events` are already waiting
+
+    devices = getattr(window, "input_devices", None) or []
+    if any(len(device) for device in devices):
+        return  # Events read from raw input devices are already waiting
+
+    timeout = max(deadline - source.time(), 0.0)
+    descriptors = [device.fileno() for device in devices]
+    display = getattr(window, "display", None)
+    if hasattr(display, "fileno") and hasattr(display, "poll"):
+        # Events already read from the connection do not make the descriptor readable
+        if not display.poll():
+            descriptors.append(display.fileno())
+            select.select(descriptors, [], [], None if timeout == float("inf") else timeout)
+    elif descriptors:
+        select.select(descriptors, [], [], min(timeout, FALLBACK_POLL_INTERVAL))
+    else:
+        source.sleep(min(timeout, FALLBACK_POLL_INTERVAL))
+
+
+def x_event_time(server_time: int) -> Optional[float]:
+    """
+    Map the time of an X11 event to the timebase of the active clock source.
+
+    Xorg stamps input events with the milliseconds of `CLOCK_MONOTONIC` at which they were
+    read from the device, truncated to 32 bits. The time is unwrapped with the current
+    monotonic time and shifted by the offset between the monotonic clock and the active clock
+    source. The result has a resolution of one millisecond.
+
+    Parameters
+    ----------
+    server_time : int
+        The `time` field of the X event.
+
+    Returns
+    -------
+    Optional[float]
+        The time of the event for `get_time`, or None if the clock source is virtual or if
+        the server time is in the future or older than `MAX_NATIVE_AGE` seconds, which means
+        that the server does not use the monotonic clock.
+    """
+    source = get_clock_source()
+    if source.virtual:
+        return None
+    now, monotonic = source.time(), time.monotonic()
+    age = ((int(monotonic * 1000) - server_time) % X_TIME_WRAP) / 1000
+    if age > MAX_NATIVE_AGE:
+        return None
+    return now - (monotonic % 0.001) - age
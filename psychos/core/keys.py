@@ -1,18 +1,28 @@
 """Module for handling key events in Pyglet windows."""
 
-import time
-
-from typing import Iterable, Dict, Literal, List, Optional, Union, TYPE_CHECKING
+import math
+from typing import FrozenSet, Iterable, Dict, Literal, List, Optional, Tuple, Union, TYPE_CHECKING
 
 from pyglet.window import key
 from ..types import KeyEvent
+from ..utils.buffers import RecordBuffer
+from .input import KEY_KINDS, get_input_queue, wait_for_events
+from .timebase import get_clock_source, get_time
 
 if TYPE_CHECKING:
     from ..visual.window import Window
     from .time import Clock
 
 
-__all__ = ["wait_key", "list_keys", "list_modifiers"]
+__all__ = [
+    "wait_key",
+    "wait_key_async",
+    "wait_keys",
+    "list_keys",
+    "list_modifiers",
+    "Keyboard",
+    "KeyFilter",
+]
 
 # Key names
 KEY_NAMES_MAP = key._key_names.copy()  # pylint: disable=protected-access
@@ -33,6 +43,11 @@ MODIFIERS_MAP = {
 }
 REVERSE_MODIFIERS_MAP = {v: k for k, v in MODIFIERS_MAP.items()}
 
+# Modifiers reflecting a toggled state rather than a held key
+LOCK_MODIFIERS = key.MOD_CAPSLOCK | key.MOD_NUMLOCK | key.MOD_SCROLLLOCK
+
+Symbols = Optional[Union[Iterable[Union[str, int]], str, int]]
+
 
 def list_keys() -> List[str]:
     """
@@ -58,14 +73,127 @@ def list_modifiers() -> List[str]:
     return list(MODIFIERS_MAP.keys())
 
 
+class KeyFilter:
+    """
+    Key and modifier criteria compiled once into an integer set and bitmasks.
+
+    Key and modifier names are converted to Pyglet IDs when the filter is created, so matching
+    an event only takes a set lookup and a bitmask comparison. A filter can be created once
+    (e.g. before the trials) and passed as `keys` to `wait_key`, `wait_key_async`,
+    `Window.wait_key` and the methods of `Keyboard`.
+
+    Parameters
+    ----------
+    keys : Optional[Union[Iterable[Union[str, int]], str, int]], default=None
+        The keys to match, as names (e.g. "SPACE") or Pyglet key IDs. If None or empty, any
+        key matches.
+    modifiers : Optional[Union[Iterable[Union[str, int]], str, int]], default=None
+        The modifiers that must be held, as names (e.g. "CTRL") or Pyglet bitmasks. If None,
+        modifiers are ignored. If empty, only events without modifiers match, ignoring the
+        lock modifiers (CAPSLOCK, NUMLOCK and SCROLLLOCK).
+
+    Attributes
+    ----------
+    keys : Optional[FrozenSet[int]]
+        The key IDs to match, or None for any key.
+    modifiers_mask : int
+        The modifier bits compared in each event.
+    modifiers_required : int
+        The value that the compared modifier bits must have.
+
+    Raises
+    ------
+    ValueError
+        If a key or modifier name is unknown.
+
+    Examples
+    --------
+    >>> responses = KeyFilter(keys=["F", "J"], modifiers=[])
+    >>> for trial in trials:
+    >>>     key_event = wait_key(keys=responses, max_wait=2)
+    """
+
+    def __init__(self, keys: Symbols = None, modifiers: Symbols = None):
+        self.keys = _compile_symbols(keys, REVERSE_KEY_MAP, "key", "list_keys")
+        modifiers_set = _compile_symbols(modifiers, MODIFIERS_MAP, "modifier", "list_modifiers")
+        if modifiers_set is None:
+            self.modifiers_mask = self.modifiers_required = 0
+        elif not modifiers_set:
+            self.modifiers_mask, self.modifiers_required = ~LOCK_MODIFIERS, 0
+        else:
+            self.modifiers_required = 0
+            for modifier in modifiers_set:
+                self.modifiers_required |= modifier
+            self.modifiers_mask = self.modifiers_required
+
+    @classmethod
+    def create(
+        cls, keys: Union[Symbols, "KeyFilter"] = None, modifiers: Symbols = None
+    ) -> "KeyFilter":
+        """
+        Get a filter from keys and modifiers, or return the given filter unchanged.
+
+        Parameters
+        ----------
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]], default=None
+            A filter, or the keys of a new filter.
+        modifiers : Optional[Union[Iterable[Union[str, int]], str, int]], default=None
+            The modifiers of a new filter. Must be None if `keys` is a filter.
+
+        Returns
+        -------
+        KeyFilter
+            The filter.
+
+        Raises
+        ------
+        ValueError
+            If `keys` is a filter and `modifiers` are given.
+        """
+        if isinstance(keys, KeyFilter):
+            if modifiers is not None:
+                raise ValueError("Modifiers cannot be combined with a `KeyFilter`.")
+            return keys
+        return cls(keys, modifiers)
+
+    def matches(self, symbol: int, mod_state: int) -> bool:
+        """
+        Check if a key event matches the filter.
+
+        Parameters
+        ----------
+        symbol : int
+            The Pyglet key ID of the event.
+        mod_state : int
+            The modifiers bitmask of the event.
+
+        Returns
+        -------
+        bool
+            True if the key and modifiers match.
+        """
+        # An empty set of keys matches any key, as None does
+        return (not self.keys or symbol in self.keys) and (
+            mod_state & self.modifiers_mask == self.modifiers_required
+        )
+
+    def __repr__(self) -> str:
+        keys = None if not self.keys else sorted(_id_to_symbol(k) for k in self.keys)
+        return (
+            f"KeyFilter(keys={keys}, modifiers_mask={self.modifiers_mask}, "
+            f"modifiers_required={self.modifiers_required})"
+        )
+
+
 def wait_key(
-    keys: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
-    modifiers: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
+    keys: Union[Symbols, KeyFilter] = None,
+    modifiers: Symbols = None,
     clock: Optional["Clock"] = None,
     max_wait: Optional[float] = None,
     event: Literal["press", "release"] = "press",
     clear_events: bool = True,
     window: Optional["Window"] = None,
+    blocking: bool = False,
 ) -> KeyEvent:
     """
     Wait for a specific key event (press or release) within the given time frame.
@@ -82,11 +210,12 @@ def wait_key(
 
     Parameters
     ----------
-    keys : Optional[Union[Iterable[Union[str, int]], str, int]]
+    keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]]
         The keys to wait for. It can be one of the following:
         - A string representing the key's name (e.g., "SPACE", "A", etc.)
         - An integer representing the Pyglet key ID (e.g., `pyglet.window.key.SPACE`)
         - An iterable of strings or integers representing multiple keys.
+        - A `KeyFilter` compiled beforehand, in which case `modifiers` must be None.
         If no keys are provided (`keys=None`), the function will return on any key press
         or release event.
 
@@ -96,12 +225,13 @@ def wait_key(
         - An integer representing the Pyglet modifier bitmask (e.g., `pyglet.window.key.MOD_SHIFT`)
         - An iterable of strings or integers representing multiple modifiers.
         If `None`, the function ignores any modifiers.
-        If an empty list is provided, the function will only return when no modifiers are pressed.
+        If an empty list is provided, the function will only return when no modifiers are pressed
+        (lock modifiers such as CAPSLOCK are ignored).
 
     clock : Optional["Clock"]
         An optional clock object for measuring time. If not provided, the function
-        will use `time.time()` from the standard library. The clock object should have
-        a `.time()` method that returns the current time.
+        will use `get_time()`, the current time of the active clock source. The clock object
+        should have a `.time()` method that returns the current time.
 
     max_wait : Optional[float]
         The maximum amount of time to wait for the key event (in seconds). If this value
@@ -114,7 +244,11 @@ def wait_key(
 
     clear_events : bool, default True
         Whether to clear any pending events before waiting for the key event. This can be useful
-        to avoid processing old events that occurred before calling this function.
+        to avoid processing old events that occurred before calling this function. If False and
+        the window has an `InputQueue`, the pending events of the queue are checked first and
+        a matching event is returned with the timestamp at which it was dispatched. Only the
+        key events of the queue are consumed, up to the matched one, so mouse events and later
+        key events stay pending.
 
     window : Optional["Window"]
         The Pyglet window instance to capture key events from.
@@ -122,6 +256,14 @@ def wait_key(
         `get_window()` from the `visual.window` module. If no window is available, an error will be
         raised.
 
+    blocking : bool, default False
+        If False, the events are polled in a busy loop, which keeps a CPU core fully busy while
+        waiting. If True, the process sleeps until the display server has events for the window
+        (see `wait_for_events`), which reduces the CPU use to almost zero at the cost of the
+        wake-up latency of the operating system (typically tens of microseconds on X11). On
+        platforms where the display cannot be waited on, the events are polled every
+        millisecond instead.
+
     Returns
     -------
     KeyEvent
@@ -131,14 +273,21 @@ def wait_key(
         - `modifiers`: A string representation of the modifiers (e.g., "CTRL|SHIFT") pressed at the
         time of the event. If no modifiers were pressed, this will be an empty string. If modifiers
         are ignored (`modifiers=None`), this will also be empty.
-        - `timestamp`: The timestamp when the key event occurred, using either the provided clock
-        or `time.time()`.
+        - `timestamp`: The time at which the handler of the key event ran (not the time at
+        which the wait loop noticed it), using either the provided clock or `get_time()`.
+        If `max_wait` is reached, this is the time at which the wait ended.
         - `event`: A string representing whether the key event was a "press" or "release".
+        - `native_timestamp`: The time at which the platform generated the event, in the same
+        timebase as `timestamp`, or None if not available (only X11 provides it).
+        - `latency`: The dispatch latency `timestamp - native_timestamp`, or None.
+        - `code`: The Pyglet key ID of the key, or None.
 
     Raises
     ------
     AssertionError
         If an invalid event type is passed or if the window is not found.
+    ValueError
+        If a key or modifier name is unknown.
 
     Example
     -------
@@ -156,60 +305,555 @@ def wait_key(
     >>> print(f"Key {key_event.key} pressed with {key_event.modifiers} ({key_event.timestamp})")
     """
 
-    start_time = clock.time() if clock else time.time()
+    start_time = get_time()
+    window = _prepare_window(window, clear_events)
 
-    # Get the current window if not provided
-    if window is None:
-        from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+    with _KeyListener(window, keys=keys, modifiers=modifiers, event=event) as listener:
+        if not clear_events:
+            listener.read_queue()
 
-        window = get_window()
+        # Optimized main loop to wait for key press or max wait timeout
+        end_time = start_time + max_wait if max_wait is not None else float("inf")
+        source = get_clock_source()
+        while not listener.key_pressed and source.time() <= end_time:
+            window.dispatch_events()
+            if blocking and not listener.key_pressed:
+                wait_for_events(window, end_time)
+            else:
+                source.idle(end_time)
 
-    if clear_events:
-        window.dispatch_events()
+        # The handler time of the matched event, or the time at which the wait ends
+        timestamp = listener.get_timestamp(clock)
+
+    return listener.to_event(timestamp, clock)
+
+
+async def wait_key_async(
+    keys: Union[Symbols, KeyFilter] = None,
+    modifiers: Symbols = None,
+    clock: Optional["Clock"] = None,
+    max_wait: Optional[float] = None,
+    event: Literal["press", "release"] = "press",
+    clear_events: bool = True,
+    window: Optional["Window"] = None,
+    dispatch_interval: float = 0.001,
+) -> KeyEvent:
+    """
+    Asynchronous version of `wait_key`.
+
+    The window events are dispatched every `dispatch_interval` seconds and the control is
+    returned to the event loop in between, so that other coroutines keep running while
+    waiting for the response. The timestamp resolution is bounded by `dispatch_interval`.
+
+    Parameters
+    ----------
+    keys, modifiers, clock, max_wait, event, clear_events, window
+        See `wait_key`.
+    dispatch_interval : float, default=0.001
+        The time in seconds between two consecutive event dispatches.
+
+    Returns
+    -------
+    KeyEvent
+        A named tuple with the key, modifiers, timestamps and event type. See `wait_key`.
+
+    Example
+    -------
+    >>> key_event, _ = await asyncio.gather(
+    >>>     wait_key_async(keys="SPACE", max_wait=5), stream_samples()
+    >>> )
+    """
+    start_time = get_time()
+    window = _prepare_window(window, clear_events)
 
-    # Convert `keys` input to a set of valid key symbols (uppercased if it's a string)
-    keys = (
-        {_symbol_to_id(keys)}
-        if isinstance(keys, (str, int))
-        else {_symbol_to_id(k) for k in keys} if keys else None
+    with _KeyListener(window, keys=keys, modifiers=modifiers, event=event) as listener:
+        if not clear_events:
+            listener.read_queue()
+
+        end_time = start_time + max_wait if max_wait is not None else float("inf")
+        source = get_clock_source()
+        while not listener.key_pressed and (now := source.time()) <= end_time:
+            window.dispatch_events()
+            if not listener.key_pressed:
+                await source.sleep_until_async(now + dispatch_interval)
+
+        timestamp = listener.get_timestamp(clock)
+
+    return listener.to_event(timestamp, clock)
+
+
+def wait_keys(
+    keys: Union[Symbols, KeyFilter] = None,
+    modifiers: Symbols = None,
+    until: Optional[float] = None,
+    max_wait: Optional[float] = None,
+    max_events: Optional[int] = None,
+    event: Optional[Literal["press", "release"]] = "press",
+    clear_events: bool = True,
+    window: Optional["Window"] = None,
+    blocking: bool = False,
+) -> List[KeyEvent]:
+    """
+    Collect all the key events of a response window (e.g. sequence typing or tapping).
+
+    Unlike repeated calls to `wait_key`, which install and remove a handler for each response
+    and may miss the events dispatched between calls, the events are recorded by the
+    `Keyboard` of the window, created on the first call and kept installed afterwards. Every
+    matching event is returned, in order of arrival and timestamped when its handler ran.
+
+    Parameters
+    ----------
+    keys, modifiers
+        See `wait_key`.
+    until : Optional[float], default=None
+        The end of the response window, as a time of the active clock source (see `get_time`).
+    max_wait : Optional[float], default=None
+        The duration of the response window in seconds. If both `until` and `max_wait` are
+        given, the earliest end is used.
+    max_events : Optional[int], default=None
+        The number of matching events after which to return. Later events stay pending in
+        the `Keyboard` of the window.
+    event : Optional[Literal["press", "release"]], default="press"
+        The type of events to collect. If None, both presses and releases are collected.
+    clear_events : bool, default=True
+        Whether to discard the events recorded before the call. If False, the events recorded
+        by the `Keyboard` of the window since its last read are also collected.
+    window : Optional[Window], default=None
+        The window to capture key events from. If None, the current window is used.
+    blocking : bool, default=False
+        If True, the process sleeps until the window has events instead of polling them in a
+        busy loop (see `wait_key`).
+
+    Returns
+    -------
+    List[KeyEvent]
+        The matching events in order of arrival (see `wait_key` for the fields).
+
+    Raises
+    ------
+    ValueError
+        If none of `until`, `max_wait` and `max_events` is given.
+
+    Example
+    -------
+    Collect the taps of a 10-second synchronization block:
+
+    >>> taps = wait_keys(keys="SPACE", max_wait=10)
+    >>> intervals = [b.timestamp - a.timestamp for a, b in zip(taps, taps[1:])]
+
+    Collect a typed sequence of 4 digits:
+
+    >>> sequence = wait_keys(keys=["1", "2", "3", "4"], max_events=4, max_wait=5)
+    """
+    window = _prepare_window(window, clear_events)
+    keyboard = getattr(window, "keyboard", None)
+    if keyboard is None:
+        keyboard = Keyboard(window)
+    elif clear_events:
+        keyboard.clear(dispatch=False)
+
+    return keyboard.collect(
+        keys=keys,
+        modifiers=modifiers,
+        event=event,
+        until=until,
+        max_wait=max_wait,
+        max_events=max_events,
+        blocking=blocking,
     )
 
-    # Convert `modifiers` input to a set of valid modifier bitmasks
-    modifiers_mask = sum({_symbol_to_id(modifiers, MODIFIERS_MAP)}) if modifiers else None
 
-    # Create a key state handler and push the event handler to the window
-    key_handler = key.KeyStateHandler()
-    window.push_handlers(key_handler)
+class Keyboard:
+    """
+    Long-lived recorder of the key presses and releases of a window.
 
-    key_pressed = False
-    pressed_key, pressed_modifiers = None, None
-    on_key_event = f"on_key_{event}"
+    The keyboard installs its handlers once and appends every key press and release, as it is
+    dispatched, to a fixed-size ring buffer of numeric records (timestamp, symbol, modifiers and
+    event type). Responses are therefore collected continuously, also between calls and during
+    animations, without installing and removing handlers on every trial. Key names are only
+    resolved when the events are read.
 
-    # Key press event handler
-    @window.event(on_key_event)
-    def check_key(symbol, mod_state):
-        nonlocal key_pressed, pressed_key, pressed_modifiers
-        if symbol is not None and (keys is None or symbol in keys):
-            if modifiers is None or (
-                modifiers_mask is not None and mod_state & modifiers_mask == modifiers_mask
-            ):
-                key_pressed = True
-                pressed_key = _id_to_symbol(symbol)
-                pressed_modifiers = _get_modifiers_list(mod_state)
+    Events are dispatched whenever `window.dispatch_events` is called (e.g. by `wait`, or by
+    `get_keys` and `wait_keys` themselves), and timestamped with the active clock source (see
+    `get_time`) when their handler runs. The time at which the platform generated the event is
+    also recorded when available (see `KeyEvent`).
 
-    # Optimized main loop to wait for key press or max wait timeout
-    end_time = start_time + max_wait if max_wait is not None else float("inf")
-    while not key_pressed and time.time() <= end_time:
-        window.dispatch_events()
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window to capture key events from. If None, the current window is used.
+    capacity : int, default=1024
+        The maximum number of events stored. The oldest events are overwritten when full.
+
+    Examples
+    --------
+    >>> keyboard = Keyboard(window)
+    >>> for frame in range(120):
+    >>>     stimulus.position = (frame, 0)
+    >>>     stimulus.draw()
+    >>>     window.flip()
+    >>>     if keyboard.get_keys(keys="SPACE"):  # Non-blocking
+    >>>         break
+    >>> keyboard.clear()
+    >>> responses = keyboard.wait_keys(keys=["F", "J"], max_wait=2)
+    """
 
-    # Capture the timestamp at the moment the key is pressed or when the wait ends
-    timestamp = clock.time() if clock else time.time()
+    def __init__(self, window: Optional["Window"] = None, capacity: int = 1024):
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self._buffer = RecordBuffer(
+            {"timestamp": "d", "native": "d", "symbol": "q", "modifiers": "q", "press": "b"},
+            capacity=capacity,
+            ring=True,
+        )
+        self._cursor = 0
+        self.window.push_handlers(
+            on_key_press=self.on_key_press, on_key_release=self.on_key_release
+        )
+        self.window.keyboard = self
+
+    def on_key_press(self, symbol: int, modifiers: int) -> None:
+        """Handler for key press events."""
+        self._buffer.append(get_time(), _native_time(self.window), symbol, modifiers, 1)
+
+    def on_key_release(self, symbol: int, modifiers: int) -> None:
+        """Handler for key release events."""
+        self._buffer.append(get_time(), _native_time(self.window), symbol, modifiers, 0)
+
+    def __len__(self) -> int:
+        """Number of pending (not yet read) events."""
+        return self._buffer.total - max(self._cursor, self._buffer.first)
+
+    def _pending(
+        self,
+        key_filter: KeyFilter,
+        event: Optional[Literal["press", "release"]],
+        max_events: Optional[int] = None,
+        until: float = float("inf"),
+    ) -> Tuple[List[KeyEvent], int]:
+        """
+        Get the pending events matching the filter and event type, and the sequence number
+        following the last record read. Reading stops after `max_events` matches or at the
+        first record timestamped after `until`.
+        """
+        press = None if event is None else event == "press"
+        events: List[KeyEvent] = []
+        sequence = max(self._cursor, self._buffer.first)
+        for timestamp, native, symbol, mod_state, is_press in self._buffer.rows(start=sequence):
+            if timestamp > until or (max_events is not None and len(events) >= max_events):
+                break
+            sequence += 1
+            if key_filter.matches(symbol, mod_state) and (
+                press is None or bool(is_press) == press
+            ):
+                events.append(
+                    KeyEvent(
+                        key=_id_to_symbol(symbol),
+                        timestamp=timestamp,
+                        modifiers=_get_modifiers_list(mod_state),
+                        event="press" if is_press else "release",
+                        native_timestamp=None if math.isnan(native) else native,
+                        latency=None if math.isnan(native) else timestamp - native,
+                        code=symbol,
+                    )
+                )
+        return events, sequence
+
+    def get_keys(
+        self,
+        keys: Union[Symbols, KeyFilter] = None,
+        modifiers: Symbols = None,
+        event: Optional[Literal["press", "release"]] = "press",
+        clear: bool = True,
+    ) -> List[KeyEvent]:
+        """
+        Get the events recorded since the last read, without blocking.
+
+        The events of the window are dispatched first, so that events waiting in the queue of
+        the operating system are also recorded.
+
+        Parameters
+        ----------
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]], default=None
+            The keys to return, or a `KeyFilter`. If None, events of all keys are returned.
+        modifiers : Optional[Union[Iterable[Union[str, int]], str, int]], default=None
+            Modifiers that must be held in the returned events. If None, any modifiers. If
+            empty, only events without modifiers are returned (see `KeyFilter`).
+        event : Optional[Literal["press", "release"]], default="press"
+            The type of event to return. If None, both presses and releases are returned.
+        clear : bool, default=True
+            If True, all pending events, including those not matching, are marked as read.
+
+        Returns
+        -------
+        List[KeyEvent]
+            The matching events in order of arrival.
+        """
+        self.window.dispatch_events()
+        events, _ = self._pending(KeyFilter.create(keys, modifiers), event)
+        if clear:
+            self.clear(dispatch=False)
+        return events
+
+    def wait_keys(
+        self,
+        keys: Union[Symbols, KeyFilter] = None,
+        modifiers: Symbols = None,
+        event: Optional[Literal["press", "release"]] = "press",
+        max_wait: Optional[float] = None,
+        clear: bool = True,
+        blocking: bool = False,
+    ) -> List[KeyEvent]:
+        """
+        Wait until at least one matching event has been recorded since the last read.
+
+        Events already pending when the method is called are returned immediately. Use
+        `clear` before waiting to only consider new events.
+
+        Parameters
+        ----------
+        keys, modifiers, event, clear
+            See `get_keys`.
+        max_wait : Optional[float], default=None
+            The maximum time to wait in seconds. If None, waits indefinitely.
+        blocking : bool, default=False
+            If True, the process sleeps until the window has events instead of polling them
+            in a busy loop (see `wait_key`).
+
+        Returns
+        -------
+        List[KeyEvent]
+            The matching events in order of arrival, or an empty list if `max_wait` elapsed.
+        """
+        source = get_clock_source()
+        end_time = source.time() + max_wait if max_wait is not None else float("inf")
+        keys = KeyFilter.create(keys, modifiers)
+        while not (events := self.get_keys(keys, None, event, clear=False)):
+            if source.time() > end_time:
+                break
+            if blocking:
+                wait_for_events(self.window, end_time)
+            else:
+                source.idle(end_time)
+        if clear:
+            self.clear(dispatch=False)
+        return events
+
+    def collect(
+        self,
+        keys: Union[Symbols, KeyFilter] = None,
+        modifiers: Symbols = None,
+        event: Optional[Literal["press", "release"]] = "press",
+        until: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        max_events: Optional[int] = None,
+        blocking: bool = False,
+    ) -> List[KeyEvent]:
+        """
+        Collect all the matching events of a response window.
+
+        Events are read since the last read until the time `until` (or `max_wait` seconds from
+        now) or until `max_events` matching events have been collected, whichever comes first.
+        Only the records read are marked as read: events recorded after the deadline or after
+        the last of `max_events` matches stay pending for the next read, so consecutive
+        response windows neither lose nor share events.
+
+        Parameters
+        ----------
+        keys, modifiers, event
+            See `get_keys`.
+        until : Optional[float], default=None
+            The end of the response window, as a time of the active clock source (see
+            `get_time`). Events timestamped after it are not collected.
+        max_wait : Optional[float], default=None
+            The duration of the response window in seconds from now. If both `until` and
+            `max_wait` are given, the earliest end is used.
+        max_events : Optional[int], default=None
+            The number of matching events after which to return.
+        blocking : bool, default=False
+            If True, the process sleeps until the window has events instead of polling them
+            in a busy loop (see `wait_key`).
+
+        Returns
+        -------
+        List[KeyEvent]
+            The matching events in order of arrival.
+
+        Raises
+        ------
+        ValueError
+            If none of `until`, `max_wait` and `max_events` is given.
+        """
+        if until is None and max_wait is None and max_events is None:
+            raise ValueError("Either 'until', 'max_wait' or 'max_events' must be provided.")
+        source = get_clock_source()
+        end_time = float("inf") if until is None else until
+        if max_wait is not None:
+            end_time = min(end_time, source.time() + max_wait)
+        key_filter = KeyFilter.create(keys, modifiers)
+
+        events: List[KeyEvent] = []
+        while True:
+            self.window.dispatch_events()
+            remaining = None if max_events is None else max_events - len(events)
+            collected, self._cursor = self._pending(key_filter, event, remaining, end_time)
+            events.extend(collected)
+            if (max_events is not None and len(events) >= max_events) or (
+                source.time() > end_time
+            ):
+                return events
+            if blocking:
+                wait_for_events(self.window, end_time)
+            else:
+                source.idle(end_time)
+
+    def clear(self, dispatch: bool = True) -> None:
+        """
+        Mark all the recorded events as read.
+
+        Parameters
+        ----------
+        dispatch : bool, default=True
+            Whether to dispatch the pending events of the window first, so that they are
+            also discarded.
+        """
+        if dispatch:
+            self.window.dispatch_events()
+        self._cursor = self._buffer.total
+
+    def close(self) -> None:
+        """Remove the handlers of the keyboard from the window."""
+        self.window.remove_handlers(
+            on_key_press=self.on_key_press, on_key_release=self.on_key_release
+        )
+        if getattr(self.window, "keyboard", None) is self:
+            self.window.keyboard = None
+
+
+def _prepare_window(window: Optional["Window"], clear_events: bool) -> "Window":
+    """Get the current window if not provided and optionally clear its pending key events."""
+    if window is None:
+        from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
 
-    # Remove the event handler and pop the key handler
-    window.remove_handlers(**{on_key_event: check_key})
-    window.pop_handlers()
+        window = get_window()
 
-    return KeyEvent(key=pressed_key, modifiers=pressed_modifiers, timestamp=timestamp, event=event)
+    if clear_events:
+        window.dispatch_events()
+        queue = get_input_queue(window)
+        if queue is not None:
+            # Other kinds of events (e.g. mouse presses) are left to their own consumers
+            queue.clear(kinds=KEY_KINDS)
+
+    return window
+
+
+class _KeyListener:
+    """Context manager installing a temporary key event handler in a window."""
+
+    def __init__(
+        self,
+        window: "Window",
+        keys: Union[Symbols, KeyFilter] = None,
+        modifiers: Symbols = None,
+        event: Literal["press", "release"] = "press",
+    ):
+        self.window = window
+        self.event = event
+        self.on_key_event = f"on_key_{event}"
+        self.filter = KeyFilter.create(keys, modifiers)
+
+        # The handler only stores the integer codes, names are resolved in `to_event`
+        self.key_pressed = False
+        self.pressed_symbol, self.pressed_mod_state = None, 0
+        self.handler_timestamp, self.native_timestamp = None, None
+        self.queue = get_input_queue(window)
+        self.queued_timestamp = None
+        self.queue_index = None  # Position in the input queue of the matched event
+
+    def check_key(self, symbol, mod_state):
+        """Key event handler storing the first event matching the keys and modifiers."""
+        if not self.key_pressed and self.filter.matches(symbol, mod_state):
+            self.handler_timestamp = get_time()
+            self.native_timestamp = getattr(self.window, "native_event_time", None)
+            self.key_pressed = True
+            self.pressed_symbol, self.pressed_mod_state = symbol, mod_state
+            if self.queue is not None:
+                # The handlers of the queue run after this one, so the event is appended next
+                self.queue_index = len(self.queue)
+
+    def read_queue(self) -> None:
+        """Check the pending events of the input queue, consuming the key events up to a match."""
+        if self.queue is None:
+            return
+        kind = f"key_{self.event}"
+        for index, input_event in enumerate(self.queue.get_events(consume=False)):
+            if input_event.kind == kind and self.filter.matches(
+                input_event.code, input_event.modifiers
+            ):
+                self.check_key(input_event.code, input_event.modifiers)
+                self.queued_timestamp = input_event.timestamp
+                self.queue.pop(index, kinds=KEY_KINDS)
+                return
+
+    def get_timestamp(self, clock: Optional["Clock"] = None) -> float:
+        """Get the timestamp of the matched event, or the current time if none matched."""
+        timestamp = self.handler_timestamp
+        if self.queued_timestamp is not None:
+            timestamp = self.queued_timestamp
+        if timestamp is None:
+            return clock.time() if clock else get_time()
+        return _clock_time(timestamp, clock)
+
+    def to_event(self, timestamp: float, clock: Optional["Clock"] = None) -> KeyEvent:
+        """Build the key event of the listener, with `timestamp` from `get_timestamp`."""
+        latency, native_timestamp = None, None
+        if self.native_timestamp is not None and self.queued_timestamp is None:
+            latency = self.handler_timestamp - self.native_timestamp
+            native_timestamp = _clock_time(self.native_timestamp, clock)
+        return KeyEvent(
+            key=None if self.pressed_symbol is None else _id_to_symbol(self.pressed_symbol),
+            modifiers=_get_modifiers_list(self.pressed_mod_state),
+            timestamp=timestamp,
+            event=self.event,
+            native_timestamp=native_timestamp,
+            latency=latency,
+            code=self.pressed_symbol,
+        )
+
+    def __enter__(self) -> "_KeyListener":
+        # Push the event handler in a new frame on top of the window handlers
+        self.window.push_handlers(**{self.on_key_event: self.check_key})
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.window.pop_handlers()
+        # The key events examined while listening are consumed from the input queue, up to the
+        # matched one. Later key events and other kinds of events stay pending.
+        if self.queue is not None and self.queued_timestamp is None:
+            if self.queue_index is None:
+                self.queue.clear(kinds=KEY_KINDS)
+            else:
+                self.queue.pop(self.queue_index, kinds=KEY_KINDS)
+
+
+def _clock_time(timestamp: float, clock: Optional["Clock"]) -> Union[float, str]:
+    """Express a timestamp of the active clock source in the timebase and format of a clock."""
+    if clock is None:
+        return timestamp
+    if hasattr(clock, "time_at"):
+        return clock.time_at(timestamp)
+    # Other clock objects only provide the current time
+    return clock.time() - (get_time() - timestamp)
+
+
+def _native_time(window: "Window") -> float:
+    """Get the platform time of the event being dispatched by a window, or NaN."""
+    native = getattr(window, "native_event_time", None)
+    return float("nan") if native is None else native
 
 
 def _symbol_to_id(symbol: Union[str, int], mapping: Optional[Dict[str, int]] = None) -> int:
@@ -218,6 +862,22 @@ def _symbol_to_id(symbol: Union[str, int], mapping: Optional[Dict[str, int]] = N
     return mapping.get(symbol.upper(), -1) if isinstance(symbol, str) else symbol
 
 
+def _compile_symbols(
+    symbols: Symbols, mapping: Dict[str, int], kind: str, listing: str
+) -> Optional[FrozenSet[int]]:
+    """Convert a key or modifier, or an iterable of them, to a set of Pyglet IDs."""
+    if symbols is None:
+        return None
+    if isinstance(symbols, (str, int)):
+        symbols = [symbols]
+    identifiers = set()
+    for symbol in symbols:
+        if (identifier := _symbol_to_id(symbol, mapping)) == -1:
+            raise ValueError(f"Invalid {kind} '{symbol}'. Use `{listing}()` to see the {kind}s.")
+        identifiers.add(identifier)
+    return frozenset(identifiers)
+
+
 def _id_to_symbol(identifier: int, mapping: Optional[Dict[int, str]] = None) -> str:
     """Convert a Pyglet key ID to its string representation."""
     mapping = mapping or KEY_NAMES_MAP
@@ -225,7 +885,7 @@ def _id_to_symbol(identifier: int, mapping: Optional[Dict[int, str]] = None) ->
     return symbol[1:] if symbol.startswith("_") else symbol
 
 
-def _get_modifiers_list(mod_state: int) -> List[str]:
+def _get_modifiers_list(mod_state: int) -> Optional[str]:
     """Convert modifier bitmask to a list of human-readable modifier names."""
     if mod_state == 0:
         return None
@@ -0,0 +1,258 @@
+"""psychos.core.mouse: Module to record mouse trajectories at the rate of the mouse events."""
+
+import csv
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+from pyglet.window import mouse
+
+from ..utils.buffers import RecordBuffer
+from .timebase import get_time
+
+if TYPE_CHECKING:
+    from ..types import PathStr, UnitType
+    from ..visual.units import Unit
+    from ..visual.window import Window
+
+__all__ = ["Mouse"]
+
+MOUSE_BUTTONS = {"LEFT": mouse.LEFT, "MIDDLE": mouse.MIDDLE, "RIGHT": mouse.RIGHT}
+
+
+class Mouse:
+    """
+    Mouse of a window, recording its trajectory at the rate of the mouse events.
+
+    The handlers of the mouse append every motion, drag, press and release event to
+    preallocated numeric columns "t" (time of the event), "x", "y" (position in pixels, as
+    reported by Pyglet) and "buttons" (bitmask of the buttons held after the event, see
+    `pyglet.window.mouse`). No Python object is created per sample, so mouse-tracking paradigms
+    can record at several hundred hertz for whole trials.
+
+    The time is the platform time of the event when the window provides it (button presses
+    and releases on X11, see `Window.native_event_time`), and otherwise the time of the active
+    clock source when the handler runs.
+
+    Positions are stored in pixels and converted to the unit system of the window (or of
+    `units`) only when the samples are read, with a single vectorized operation per axis (see
+    `Unit.inverse_transform_array`). As with `Keyboard`, events are recorded whenever the window
+    events are dispatched (e.g. during `wait` or `flip`).
+
+    Parameters
+    ----------
+    window : Optional[Window], default=None
+        The window to capture mouse events from. If None, the current window is used.
+    capacity : int, default=65536
+        The number of samples preallocated.
+    ring : bool, default=True
+        If True, the oldest samples are overwritten when more than `capacity` samples are
+        stored. Otherwise, the buffer grows.
+    units : Optional[Union[UnitType, Unit]], default=None
+        The unit system of the positions returned. If None, the coordinates of the window are
+        used.
+
+    Examples
+    --------
+    >>> mouse = Mouse(window)
+    >>> start = mouse.total
+    >>> window.flip()
+    >>> wait(2.0)  # Mouse-tracking trial
+    >>> trajectory = mouse.get_samples(start)
+    >>> trajectory["t"], trajectory["x"], trajectory["y"]
+    """
+
+    def __init__(
+        self,
+        window: Optional["Window"] = None,
+        capacity: int = 65536,
+        ring: bool = True,
+        units: Optional[Union["UnitType", "Unit"]] = None,
+    ):
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self.units = units
+        self._buffer = RecordBuffer(
+            {"t": "d", "x": "d", "y": "d", "buttons": "q"}, capacity=capacity, ring=ring
+        )
+        self._position = (0.0, 0.0)
+        self._buttons = 0
+        self.window.push_handlers(
+            on_mouse_motion=self.on_mouse_motion,
+            on_mouse_drag=self.on_mouse_drag,
+            on_mouse_press=self.on_mouse_press,
+            on_mouse_release=self.on_mouse_release,
+        )
+
+    @property
+    def units(self) -> "Unit":
+        """The unit system of the positions returned."""
+        if self._units is None:
+            return self.window.coordinates
+        return self._units
+
+    @units.setter
+    def units(self, value: Optional[Union["UnitType", "Unit"]]) -> None:
+        if value is None:
+            self._units = None
+        else:
+            from ..visual.units import Unit  # pylint: disable=import-outside-toplevel
+
+            self._units = Unit.from_name(value, window=self.window)
+
+    def _record(self, x: float, y: float) -> None:
+        self._position = (x, y)
+        timestamp = getattr(self.window, "native_event_time", None)
+        if timestamp is None:
+            timestamp = get_time()
+        self._buffer.append(timestamp, x, y, self._buttons)
+
+    # pylint: disable=unused-argument
+    # The handlers take all the arguments passed by Pyglet, but only use the position and buttons
+
+    def on_mouse_motion(self, x: float, y: float, dx: float, dy: float) -> None:
+        """Handler for mouse motion events."""
+        self._record(x, y)
+
+    def on_mouse_drag(
+        self, x: float, y: float, dx: float, dy: float, buttons: int, modifiers: int
+    ) -> None:
+        """Handler for mouse motion events while buttons are held."""
+        self._buttons = buttons
+        self._record(x, y)
+
+    def on_mouse_press(self, x: float, y: float, button: int, modifiers: int) -> None:
+        """Handler for mouse press events."""
+        self._buttons |= button
+        self._record(x, y)
+
+    def on_mouse_release(self, x: float, y: float, button: int, modifiers: int) -> None:
+        """Handler for mouse release events."""
+        self._buttons &= ~button
+        self._record(x, y)
+
+    # pylint: enable=unused-argument
+
+    def __len__(self) -> int:
+        """Number of stored samples."""
+        return len(self._buffer)
+
+    @property
+    def total(self) -> int:
+        """Number of samples recorded since creation or the last `clear`, usable as `start`."""
+        return self._buffer.total
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        """The last recorded position, in the unit system of `units`."""
+        return self.units.inverse_transform(*self._position)
+
+    @property
+    def buttons(self) -> int:
+        """Bitmask of the buttons currently held."""
+        return self._buttons
+
+    def is_pressed(self, button: Union[str, int] = "LEFT") -> bool:
+        """
+        Check whether a button is currently held.
+
+        Parameters
+        ----------
+        button : Union[str, int], default="LEFT"
+            The button name ("LEFT", "MIDDLE" or "RIGHT") or its Pyglet bitmask.
+
+        Returns
+        -------
+        bool
+            True if the button is held.
+        """
+        if isinstance(button, str):
+            if button.upper() not in MOUSE_BUTTONS:
+                raise ValueError(
+                    f"Invalid button '{button}'. Must be one of {list(MOUSE_BUTTONS)}."
+                )
+            button = MOUSE_BUTTONS[button.upper()]
+        return bool(self._buttons & button)
+
+    def get_samples(self, start: Optional[int] = None, units: bool = True) -> Dict[str, array]:
+        """
+        Get the recorded samples.
+
+        The events of the window are dispatched first, so that pending samples are included.
+
+        Parameters
+        ----------
+        start : Optional[int], default=None
+            The sequence number of the first sample to return (e.g. a previous `total`). If
+            None, all the stored samples are returned.
+        units : bool, default=True
+            If True, the positions are converted to the unit system of `units`. Otherwise, they
+            are returned in pixels.
+
+        Returns
+        -------
+        Dict[str, array]
+            The columns "t", "x", "y" and "buttons" in order of arrival.
+        """
+        self.window.dispatch_events()
+        columns = self._buffer.columns(start=start)
+        if units:
+            columns["x"], columns["y"] = self.units.inverse_transform_array(
+                columns["x"], columns["y"]
+            )
+        return columns
+
+    def to_numpy(self, start: Optional[int] = None, units: bool = True) -> Dict[str, Any]:
+        """
+        Get the recorded samples as NumPy arrays. Requires `numpy` to be installed.
+
+        Parameters
+        ----------
+        start, units
+            See `get_samples`.
+
+        Returns
+        -------
+        Dict[str, numpy.ndarray]
+            The columns of `get_samples` as NumPy arrays.
+        """
+        self.window.dispatch_events()
+        columns = self._buffer.to_numpy(start=start)
+        if units:
+            columns["x"], columns["y"] = self.units.inverse_transform_array(
+                columns["x"], columns["y"]
+            )
+        return columns
+
+    def to_csv(self, path: "PathStr", start: Optional[int] = None, units: bool = True) -> None:
+        """
+        Write the recorded samples to a CSV file with a header row.
+
+        Parameters
+        ----------
+        path : PathStr
+            The path of the CSV file.
+        start, units
+            See `get_samples`.
+        """
+        columns = self.get_samples(start=start, units=units)
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(zip(*columns.values()))
+
+    def clear(self) -> None:
+        """Discard the recorded samples. The buttons held are kept."""
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Remove the handlers of the mouse from the window."""
+        self.window.remove_handlers(
+            on_mouse_motion=self.on_mouse_motion,
+            on_mouse_drag=self.on_mouse_drag,
+            on_mouse_press=self.on_mouse_press,
+            on_mouse_release=self.on_mouse_release,
+        )
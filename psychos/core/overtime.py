@@ -0,0 +1,298 @@
+"""psychos.core.overtime: Module to collect statistics of interval overruns."""
+
+import csv
+import warnings
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+from ..utils.buffers import RecordBuffer
+from ..utils.stats import percentile
+from .timebase import get_time
+
+if TYPE_CHECKING:
+    from ..types import PathStr
+
+__all__ = ["OvertimeStats", "get_overtime_stats", "check_on_overtime", "handle_overtime"]
+
+STAT_COLUMNS = ("slack", "lateness", "overtime")
+
+
+class OvertimeStats:
+    """
+    Registry of the timing errors of `Interval` and `Timeline` waits.
+
+    Every wait is recorded in a compact numeric ring buffer with its label, its duration, the
+    slack (time left in the interval when the wait started, negative if it was exceeded) and
+    the lateness (time between the scheduled end and the end of the wait, which is the
+    overtime of an exceeded interval and the wake-up error otherwise). Summaries give
+    percentiles, counts per label and histograms, and the records can be exported with the
+    session data.
+
+    The registry also makes overtime warnings fire only once per label: the first overrun of
+    each label issues a warning and later ones are only recorded, so that hundreds of trials
+    do not flood the logs (or pay the cost of the warning machinery every time).
+
+    Parameters
+    ----------
+    capacity : int, default=4096
+        The number of waits recorded before the oldest are overwritten.
+
+    Examples
+    --------
+    >>> for trial in range(500):
+    >>>     with Interval(0.5, label="stimulus"):
+    >>>         present_stimulus()
+    >>> stats = get_overtime_stats()
+    >>> stats.summary("stimulus")["overtime"]["p99"]
+    >>> stats.to_csv("timing.csv")
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._buffer = RecordBuffer(
+            {"timestamp": "d", "label": "l", "duration": "d", "slack": "d", "lateness": "d"},
+            capacity=capacity,
+            ring=True,
+        )
+        self._labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self._warned = set()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def labels(self) -> List[str]:
+        """The labels recorded so far, in order of first appearance."""
+        return list(self._labels)
+
+    def record(self, label: str, duration: float, slack: float, lateness: float) -> None:
+        """
+        Record a wait.
+
+        Parameters
+        ----------
+        label : str
+            The label of the interval.
+        duration : float
+            The scheduled duration in seconds.
+        slack : float
+            The time in seconds left when the wait started (negative if exceeded).
+        lateness : float
+            The time in seconds between the scheduled end and the end of the wait.
+        """
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self._labels)
+            self._labels.append(label)
+        self._buffer.append(get_time(), code, duration, slack, lateness)
+
+    def should_warn(self, label: str) -> bool:
+        """
+        Check if an overrun of a label should issue a warning, which is only the first time.
+
+        Parameters
+        ----------
+        label : str
+            The label of the exceeded interval.
+
+        Returns
+        -------
+        bool
+            True the first time it is called for the label since creation or `clear`.
+        """
+        if label in self._warned:
+            return False
+        self._warned.add(label)
+        return True
+
+    def _values(self, column: str, label: Optional[str] = None) -> List[float]:
+        """Get the values of a statistic for a label (or for all labels if None)."""
+        if column not in STAT_COLUMNS:
+            raise ValueError(f"Invalid value for 'column'. Must be one of {STAT_COLUMNS}.")
+        code = None if label is None else self._label_codes.get(label, -1)
+        values = []
+        for row_code, slack, lateness in zip(
+            self._buffer.column("label"),
+            self._buffer.column("slack"),
+            self._buffer.column("lateness"),
+        ):
+            if code is not None and row_code != code:
+                continue
+            if column == "slack":
+                values.append(slack)
+            elif column == "lateness" or slack < 0:
+                values.append(lateness)
+        return values
+
+    def summary(
+        self,
+        label: Optional[str] = None,
+        percentiles: Iterable[float] = (0.5, 0.9, 0.99),
+    ) -> Dict[str, Any]:
+        """
+        Summarize the recorded waits.
+
+        Parameters
+        ----------
+        label : Optional[str], default=None
+            The label to summarize. If None, all waits are summarized together.
+        percentiles : Iterable[float], default=(0.5, 0.9, 0.99)
+            The percentiles (between 0 and 1) reported for each statistic.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The number of waits ("count") and overruns ("overruns"), and for "slack",
+            "lateness" and "overtime" (lateness of the overruns only) a dictionary with the
+            requested percentiles (e.g. "p99") and the "max", or None if there are no values.
+        """
+        summary = {
+            "count": len(self._values("slack", label)),
+            "overruns": len(self._values("overtime", label)),
+        }
+        for column in STAT_COLUMNS:
+            values = self._values(column, label)
+            if not values:
+                summary[column] = None
+                continue
+            summary[column] = {
+                f"p{round(fraction * 100, 2):g}": percentile(values, fraction)
+                for fraction in percentiles
+            }
+            summary[column]["max"] = max(values)
+        return summary
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count the waits and overruns of each label.
+
+        Returns
+        -------
+        Dict[str, Dict[str, int]]
+            Mapping of each label to its number of waits ("count") and overruns ("overruns").
+        """
+        counts = {label: {"count": 0, "overruns": 0} for label in self._labels}
+        for code, slack in zip(self._buffer.column("label"), self._buffer.column("slack")):
+            label_counts = counts[self._labels[code]]
+            label_counts["count"] += 1
+            label_counts["overruns"] += slack < 0
+        return counts
+
+    def histogram(
+        self,
+        column: str = "lateness",
+        bins: int = 20,
+        value_range: Optional[Tuple[float, float]] = None,
+        label: Optional[str] = None,
+    ) -> Tuple[List[float], List[int]]:
+        """
+        Compute a histogram of a statistic.
+
+        Parameters
+        ----------
+        column : str, default="lateness"
+            The statistic: "slack", "lateness" or "overtime".
+        bins : int, default=20
+            The number of bins of equal width.
+        value_range : Optional[Tuple[float, float]], default=None
+            The lower and upper edges. If None, the minimum and maximum values are used.
+            Values outside of the range are not counted.
+        label : Optional[str], default=None
+            The label of the waits. If None, the waits of all labels are counted.
+
+        Returns
+        -------
+        Tuple[List[float], List[int]]
+            The `bins + 1` bin edges and the count of each bin.
+        """
+        values = self._values(column, label)
+        low, high = value_range or ((min(values), max(values)) if values else (0.0, 0.0))
+        width = (high - low) / bins or 1.0
+        edges = [low + index * width for index in range(bins)] + [high]
+        counts = [0] * bins
+        for value in values:
+            if low <= value <= high:
+                counts[min(int((value - low) / width), bins - 1)] += 1
+        return edges, counts
+
+    def get_records(self) -> List[Dict[str, Any]]:
+        """
+        Get the recorded waits.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One dictionary per wait with the keys "timestamp", "label", "duration", "slack"
+            and "lateness".
+        """
+        records = []
+        for row in self._buffer.rows():
+            record = dict(zip(self._buffer.names, row))
+            record["label"] = self._labels[record["label"]]
+            records.append(record)
+        return records
+
+    def to_csv(self, path: "PathStr") -> None:
+        """
+        Write the recorded waits to a CSV file with a header row.
+
+        Parameters
+        ----------
+        path : PathStr
+            The path of the CSV file.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=self._buffer.names)
+            writer.writeheader()
+            writer.writerows(self.get_records())
+
+    def clear(self) -> None:
+        """Discard all the records and allow the warnings of every label to fire again."""
+        self._buffer.clear()
+        self._labels.clear()
+        self._label_codes.clear()
+        self._warned.clear()
+
+
+_overtime_stats = OvertimeStats()
+
+
+def get_overtime_stats() -> OvertimeStats:
+    """
+    Get the registry shared by all `Interval` and `Timeline` instances.
+
+    Returns
+    -------
+    OvertimeStats
+        The shared registry.
+    """
+    return _overtime_stats
+
+
+def check_on_overtime(on_overtime: str) -> None:
+    """Validate the value of an `on_overtime` parameter."""
+    if on_overtime not in ["ignore", "warning", "exception"]:
+        raise ValueError(
+            "Invalid value for 'on_overtime'. Must be 'ignore', 'warning', or 'exception'."
+        )
+
+
+def handle_overtime(
+    on_overtime: Literal["ignore", "warning", "exception"],
+    duration: float,
+    overtime: float,
+    label: str,
+    stats: OvertimeStats,
+) -> None:
+    """Handle an exceeded interval based on the `on_overtime` policy."""
+    message = f"The interval of {duration} seconds was exceeded by {overtime:.2f} seconds."
+
+    if on_overtime == "exception":
+        raise RuntimeError(message)
+    if on_overtime == "warning" and stats.should_warn(label):
+        # Only the first overrun of each label is reported, the rest are kept in `stats`
+        warnings.warn(
+            f"{message} Further overruns of '{label}' are not reported, see "
+            "`get_overtime_stats()` for their statistics.",
+            RuntimeWarning,
+        )
+    # If "ignore", do nothing
@@ -0,0 +1,252 @@
+"""psychos.core.rawinput: Module reading keyboards directly from Linux evdev devices."""
+
+import collections
+import glob
+import os
+import select
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple, Union
+
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from .timebase import get_clock_source
+
+if TYPE_CHECKING:
+    from ..visual.window import Window
+
+__all__ = ["EvdevKeyboard", "find_keyboards"]
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct("@llHHi")
+EV_KEY = 1
+KEY_RELEASE, KEY_PRESS, KEY_REPEAT = 0, 1, 2
+
+# ioctl requests: _IOW('E', 0x90, int) and _IOW('E', 0xa0, int)
+EVIOCGRAB = 0x40044590
+EVIOCSCLOCKID = 0x400445A0
+CLOCK_IDS = {"realtime": 0, "monotonic": 1}
+
+# Linux input keycodes (linux/input-event-codes.h) and their Pyglet key symbols
+_EVDEV_KEY_NAMES = {
+    1: "ESCAPE", 12: "MINUS", 13: "EQUAL", 14: "BACKSPACE", 15: "TAB", 26: "BRACKETLEFT",
+    27: "BRACKETRIGHT", 28: "RETURN", 29: "LCTRL", 39: "SEMICOLON", 40: "APOSTROPHE",
+    41: "GRAVE", 42: "LSHIFT", 43: "BACKSLASH", 51: "COMMA", 52: "PERIOD", 53: "SLASH",
+    54: "RSHIFT", 55: "NUM_MULTIPLY", 56: "LALT", 57: "SPACE", 58: "CAPSLOCK", 69: "NUMLOCK",
+    70: "SCROLLLOCK", 71: "NUM_7", 72: "NUM_8", 73: "NUM_9", 74: "NUM_SUBTRACT", 75: "NUM_4",
+    76: "NUM_5", 77: "NUM_6", 78: "NUM_ADD", 79: "NUM_1", 80: "NUM_2", 81: "NUM_3",
+    82: "NUM_0", 83: "NUM_DECIMAL", 87: "F11", 88: "F12", 96: "NUM_ENTER", 97: "RCTRL",
+    98: "NUM_DIVIDE", 100: "RALT", 102: "HOME", 103: "UP", 104: "PAGEUP", 105: "LEFT",
+    106: "RIGHT", 107: "END", 108: "DOWN", 109: "PAGEDOWN", 110: "INSERT", 111: "DELETE",
+    119: "PAUSE", 125: "LWINDOWS", 126: "RWINDOWS", 139: "MENU",
+}
+_EVDEV_KEY_NAMES.update({2 + index: f"_{(index + 1) % 10}" for index in range(10)})
+_EVDEV_KEY_NAMES.update({16 + index: letter for index, letter in enumerate("QWERTYUIOP")})
+_EVDEV_KEY_NAMES.update({30 + index: letter for index, letter in enumerate("ASDFGHJKL")})
+_EVDEV_KEY_NAMES.update({44 + index: letter for index, letter in enumerate("ZXCVBNM")})
+_EVDEV_KEY_NAMES.update({59 + index: f"F{index + 1}" for index in range(10)})
+EVDEV_KEY_MAP: Dict[int, int] = {code: getattr(key, n) for code, n in _EVDEV_KEY_NAMES.items()}
+
+# Modifier bits set while the keys are held
+MODIFIER_KEYS = {
+    key.LSHIFT: key.MOD_SHIFT,
+    key.RSHIFT: key.MOD_SHIFT,
+    key.LCTRL: key.MOD_CTRL,
+    key.RCTRL: key.MOD_CTRL,
+    key.LALT: key.MOD_ALT,
+    key.RALT: key.MOD_ALT,
+    key.LWINDOWS: key.MOD_WINDOWS,
+    key.RWINDOWS: key.MOD_WINDOWS,
+}
+
+
+def find_keyboards() -> List[str]:
+    """
+    List the evdev devices that udev identifies as keyboards.
+
+    Returns
+    -------
+    List[str]
+        The paths of the devices (e.g. "/dev/input/by-id/usb-...-event-kbd"). Reading them
+        usually requires membership of the "input" group.
+    """
+    return sorted(glob.glob("/dev/input/by-id/*-event-kbd")) + sorted(
+        glob.glob("/dev/input/by-path/*-event-kbd")
+    )
+
+
+class EvdevKeyboard:
+    """
+    Keyboard read directly from a Linux evdev device, with the kernel timestamps.
+
+    Key events normally go from the kernel through the display server (and a compositor) to
+    Xlib and Pyglet before a handler sees them, each step adding latency and jitter. An
+    `EvdevKeyboard` reads the `struct input_event` records of the device in a background
+    thread and keeps the time at which the kernel received each event, converted to the
+    timebase of the active clock source.
+
+    The events are delivered to the handlers of the window (`wait_key`, `Keyboard`,
+    `InputQueue`, ...) from the thread that calls `window.dispatch_events`, with the kernel
+    time in `window.native_event_time` while the handlers run, so that it is reported as the
+    `native_timestamp` of the `KeyEvent`. Blocking waits (see `wait_for_events`) wake up when
+    the device has events. Linux keycodes are mapped to the Pyglet key symbols of the US
+    layout, so the key names are the same as with the window events.
+
+    Parameters
+    ----------
+    device : Union[str, int]
+        The path of the device (see `find_keyboards`) or a readable file descriptor
+        delivering `struct input_event` records (e.g. a pipe in tests).
+    window : Optional[Window], default=None
+        The window whose handlers receive the events. If None, the current window is used.
+    grab : bool, default=True
+        Whether to grab the device, so that its events do not also reach the display server
+        and are not received twice by the window.
+    clock : str, default="monotonic"
+        The clock of the kernel timestamps, "monotonic" or "realtime". The clock of the
+        device is set to it when possible.
+    ignore_repeats : bool, default=True
+        Whether to discard the auto-repeat events of held keys.
+
+    Examples
+    --------
+    >>> keyboard = EvdevKeyboard(find_keyboards()[0], window)
+    >>> key_event = window.wait_key(keys=["F", "J"], blocking=True)
+    >>> key_event.native_timestamp  # Time at which the kernel received the key press
+    >>> keyboard.close()
+    """
+
+    def __init__(
+        self,
+        device: Union[str, int],
+        window: Optional["Window"] = None,
+        grab: bool = True,
+        clock: str = "monotonic",
+        ignore_repeats: bool = True,
+    ):
+        if clock not in CLOCK_IDS:
+            raise ValueError(f"Invalid clock '{clock}'. Must be one of {list(CLOCK_IDS)}.")
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self.clock = clock
+        self.ignore_repeats = ignore_repeats
+        self._owns_fd = isinstance(device, str)
+        self._fd = os.open(device, os.O_RDONLY) if self._owns_fd else device
+        self._configure(grab)
+
+        self._events: Deque[Tuple[float, bool, int, int]] = collections.deque()
+        self._modifiers = 0
+        self._wake_read, self._wake_write = os.pipe()
+        self._stop_read, self._stop_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self._thread = threading.Thread(target=self._read_events, daemon=True)
+        self._thread.start()
+
+        if getattr(window, "input_devices", None) is None:
+            window.input_devices = []
+        window.input_devices.append(self)
+
+    def _configure(self, grab: bool) -> None:
+        """Set the clock of the timestamps and grab the device, if it is a real device."""
+        # Imported here so that the module can be imported on platforms without `fcntl`
+        import fcntl  # pylint: disable=import-outside-toplevel
+
+        try:
+            fcntl.ioctl(self._fd, EVIOCSCLOCKID, struct.pack("@i", CLOCK_IDS[self.clock]))
+            if grab:
+                fcntl.ioctl(self._fd, EVIOCGRAB, 1)
+        except OSError:
+            pass  # Not an evdev device (e.g. a pipe), the records are used as they are
+
+    def _clock_offset(self) -> float:
+        """Offset from the clock of the kernel timestamps to the active clock source."""
+        now = get_clock_source().time()
+        return now - (time.monotonic() if self.clock == "monotonic" else time.time())
+
+    def _read_events(self) -> None:
+        """Thread target reading and queueing the key records of the device."""
+        pending = b""
+        while True:
+            readable, _, _ = select.select([self._fd, self._stop_read], [], [])
+            if self._stop_read in readable:
+                return
+            try:
+                data = os.read(self._fd, INPUT_EVENT.size * 64)
+            except OSError:
+                return
+            if not data:
+                return  # The device was removed or the pipe closed
+            pending += data
+            size = len(pending) - len(pending) % INPUT_EVENT.size
+            offset = self._clock_offset()
+            queued = False
+            for seconds, microseconds, kind, code, value in INPUT_EVENT.iter_unpack(
+                pending[:size]
+            ):
+                queued |= self._queue(seconds + microseconds / 1e6 + offset, kind, code, value)
+            pending = pending[size:]
+            if queued:
+                os.write(self._wake_write, b"\0")
+
+    def _queue(self, timestamp: float, kind: int, code: int, value: int) -> bool:
+        """Queue a key record as a press or release, tracking the held modifiers."""
+        if kind != EV_KEY or (value == KEY_REPEAT and self.ignore_repeats):
+            return False
+        symbol = EVDEV_KEY_MAP.get(code, key.user_key(code))
+        press = value != KEY_RELEASE
+        modifier = MODIFIER_KEYS.get(symbol, 0)
+        self._modifiers = self._modifiers | modifier if press else self._modifiers & ~modifier
+        self._events.append((timestamp, press, symbol, self._modifiers))
+        return True
+
+    def fileno(self) -> int:
+        """File descriptor readable when events are waiting to be dispatched."""
+        return self._wake_read
+
+    def __len__(self) -> int:
+        """Number of events waiting to be dispatched."""
+        return len(self._events)
+
+    def dispatch(self) -> None:
+        """Deliver the queued events to the handlers of the window, in order."""
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._events:
+            timestamp, press, symbol, modifiers = self._events.popleft()
+            self.window.native_event_time = timestamp
+            try:
+                # Bypass the queue of Pyglet windows for events dispatched outside their loop
+                EventDispatcher.dispatch_event(
+                    self.window, "on_key_press" if press else "on_key_release", symbol, modifiers
+                )
+            finally:
+                self.window.native_event_time = None
+
+    def close(self) -> None:
+        """Stop reading the device and detach the keyboard from the window."""
+        if self._stop_write is None:
+            return
+        os.write(self._stop_write, b"\0")
+        self._thread.join()
+        if self._owns_fd:
+            os.close(self._fd)  # Closing the device also releases the grab
+        for fd in (self._wake_read, self._wake_write, self._stop_read, self._stop_write):
+            os.close(fd)
+        self._stop_write = None
+        if self in getattr(self.window, "input_devices", ()):
+            self.window.input_devices.remove(self)
+
+    def __enter__(self) -> "EvdevKeyboard":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
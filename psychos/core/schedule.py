@@ -0,0 +1,432 @@
+"""psychos.core.schedule: Module to run timed callbacks and segments anchored to an epoch."""
+
+import contextlib
+import heapq
+import itertools
+from typing import Any, Callable, Iterable, Iterator, List, Literal, Optional, Union
+
+from ..types import ScheduledCall
+from .collector import get_gc_controller
+from .overtime import OvertimeStats, check_on_overtime, get_overtime_stats, handle_overtime
+from .time import wait_until
+from .timebase import get_time as _time
+
+__all__ = ["Scheduler", "Timeline"]
+
+
+class Scheduler:
+    """
+    A scheduler executing callbacks at absolute deadlines from a single wait loop.
+
+    The pending callbacks are kept in a heap ordered by deadline, so that many overlapping
+    timed events (e.g. stimulus onsets, offsets and trigger resets) can be served with a single
+    accurate wait instead of one `Interval` per event. The waiting between callbacks uses
+    `wait_until` with the given `sleep_interval` and `hog_period`, and the lateness of every
+    executed callback is recorded.
+
+    Parameters
+    ----------
+    sleep_interval : Optional[float], default=None
+        The sleep interval used while waiting for the next deadline (see `wait_until`).
+    hog_period : Union[float, Literal["auto"], None], default=None
+        The hog period used before each deadline (see `wait_until`).
+    start_time : Optional[float], default=None
+        The reference time for the relative onsets given to `schedule`. If None, the current
+        time of the active clock source is used.
+
+    Example usage
+    -------------
+    >>> scheduler = Scheduler()
+    >>> scheduler.schedule(0.010, trigger.reset, label="trigger")
+    >>> scheduler.schedule(0.200, cue.hide, label="cue off")
+    >>> scheduler.schedule(0.350, target.show, label="target on")
+    >>> calls = scheduler.run()
+    >>> for call in calls:
+    >>>     print(f"{call.label}: {call.lateness * 1000:.3f} ms late")
+    """
+
+    def __init__(
+        self,
+        sleep_interval: Optional[float] = None,
+        hog_period: Union[float, Literal["auto"], None] = None,
+        start_time: Optional[float] = None,
+    ):
+        self.sleep_interval = sleep_interval
+        self.hog_period = hog_period
+        self.start_time = start_time if start_time is not None else _time()
+        self._queue = []
+        self._pending = set()
+        self._cancelled = set()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        """Number of pending callbacks."""
+        return len(self._pending)
+
+    def reset(self) -> None:
+        """Reset the reference time to the current time, keeping the pending callbacks."""
+        self.start_time = _time()
+
+    def clear(self) -> None:
+        """Remove all the pending callbacks."""
+        self._queue.clear()
+        self._pending.clear()
+        self._cancelled.clear()
+
+    def call_at(
+        self, deadline: float, callback: Callable, *args: Any, label: Optional[str] = None
+    ) -> int:
+        """
+        Schedule a callback at an absolute time.
+
+        Parameters
+        ----------
+        deadline : float
+            The time at which to execute the callback, in the timebase of the active
+            clock source (see `get_time`).
+        callback : Callable
+            The function to execute.
+        *args : Any
+            Positional arguments passed to the callback.
+        label : Optional[str], default=None
+            A label identifying the callback in the returned records.
+
+        Returns
+        -------
+        int
+            An identifier that can be passed to `cancel`.
+        """
+        identifier = next(self._counter)
+        heapq.heappush(self._queue, (deadline, identifier, callback, args, label))
+        self._pending.add(identifier)
+        return identifier
+
+    def schedule(
+        self, onset: float, callback: Callable, *args: Any, label: Optional[str] = None
+    ) -> int:
+        """
+        Schedule a callback relative to the reference time of the scheduler.
+
+        Parameters
+        ----------
+        onset : float
+            The time in seconds after `start_time` at which to execute the callback.
+        callback : Callable
+            The function to execute.
+        *args : Any
+            Positional arguments passed to the callback.
+        label : Optional[str], default=None
+            A label identifying the callback in the returned records.
+
+        Returns
+        -------
+        int
+            An identifier that can be passed to `cancel`.
+        """
+        return self.call_at(self.start_time + onset, callback, *args, label=label)
+
+    def cancel(self, identifier: int) -> None:
+        """
+        Cancel a pending callback.
+
+        Parameters
+        ----------
+        identifier : int
+            The identifier returned by `schedule` or `call_at`.
+        """
+        if identifier in self._pending:
+            self._pending.discard(identifier)
+            self._cancelled.add(identifier)
+
+    def run(self, until: Optional[float] = None) -> List[ScheduledCall]:
+        """
+        Execute the pending callbacks in order of deadline.
+
+        Callbacks may schedule new callbacks, which are served in the same loop.
+
+        Parameters
+        ----------
+        until : Optional[float], default=None
+            The time in seconds after `start_time` at which to stop, leaving later callbacks
+            pending. If None, runs until no callback is pending.
+
+        Returns
+        -------
+        List[ScheduledCall]
+            The executed callbacks with their label, deadline, execution timestamp and
+            lateness (execution timestamp minus deadline), in order of execution.
+        """
+        end_time = self.start_time + until if until is not None else float("inf")
+        calls = []
+
+        while self._queue and self._queue[0][0] <= end_time:
+            deadline, identifier = self._queue[0][:2]
+            if identifier in self._cancelled:
+                heapq.heappop(self._queue)
+                self._cancelled.discard(identifier)
+                continue
+
+            wait_until(deadline, sleep_interval=self.sleep_interval, hog_period=self.hog_period)
+
+            # Serve every callback whose deadline has been reached
+            now = _time()
+            while self._queue and self._queue[0][0] <= now:
+                deadline, identifier, callback, args, label = heapq.heappop(self._queue)
+                if identifier in self._cancelled:
+                    self._cancelled.discard(identifier)
+                    continue
+                self._pending.discard(identifier)
+                timestamp = _time()
+                callback(*args)
+                calls.append(
+                    ScheduledCall(
+                        label=label,
+                        deadline=deadline,
+                        timestamp=timestamp,
+                        lateness=timestamp - deadline,
+                    )
+                )
+
+        if until is not None and end_time > _time():
+            wait_until(end_time, sleep_interval=self.sleep_interval, hog_period=self.hog_period)
+
+        return calls
+
+
+class Timeline:
+    """
+    A sequence of consecutive segments anchored to a single absolute epoch.
+
+    The end of every segment is computed from the epoch and the cumulative duration of the
+    previous segments, not from the moment in which the previous wait finished. Overruns
+    in one segment are therefore absorbed by the following segments instead of accumulating
+    over the run, which keeps the onsets locked to an external epoch (e.g. a scanner trigger).
+    Segments whose end has already passed when waited for are handled according to
+    `on_overtime`, as in `Interval`.
+
+    Parameters
+    ----------
+    durations : Optional[Iterable[float]], default=None
+        The initial durations of the segments in seconds. More segments can be added with
+        `append`, `extend` or `segment`.
+    epoch : Optional[float], default=None
+        The absolute start of the first segment, in the timebase of the active clock source
+        (see `get_time`). If None, the current time is used.
+    on_overtime : Literal["ignore", "warning", "exception"], default="warning"
+        Specifies what to do if the end of a segment has already passed when waiting for it:
+        - "ignore": Do nothing.
+        - "warning": Raise a warning the first time a segment with the same label ends late.
+        - "exception": Raise an exception.
+    sleep_interval : Optional[float], default=None
+        The sleep interval used while waiting (see `wait_until`).
+    hog_period : Union[float, Literal["auto"], None], default=None
+        The hog period used at the end of each segment (see `wait_until`).
+    label : str, default="timeline"
+        The label under which the waits of the segments are recorded in `stats`.
+    stats : Optional[OvertimeStats], default=None
+        The registry recording the waits. If None, the shared registry is used (see
+        `get_overtime_stats`).
+
+    Attributes
+    ----------
+    position : int
+        The index of the next segment to be waited for.
+    lateness : List[float]
+        For each waited segment, the time in seconds between its scheduled end and the end of
+        the wait. Positive values larger than the timing precision indicate overtime.
+
+    Example usage
+    -------------
+    >>> timeline = Timeline(epoch=scanner_trigger_time)
+    >>> for trial in trials:
+    >>>     with timeline.segment(1.5):  # Ends 1.5 s after the end of the previous segment
+    >>>         present(trial)
+    >>>     timeline.append(0.5)
+    >>>     timeline.wait()  # Inter-trial interval, also anchored to the epoch
+    """
+
+    def __init__(
+        self,
+        durations: Optional[Iterable[float]] = None,
+        epoch: Optional[float] = None,
+        on_overtime: Literal["ignore", "warning", "exception"] = "warning",
+        sleep_interval: Optional[float] = None,
+        hog_period: Union[float, Literal["auto"], None] = None,
+        label: str = "timeline",
+        stats: Optional[OvertimeStats] = None,
+    ):
+        check_on_overtime(on_overtime)
+        self.on_overtime = on_overtime
+        self.sleep_interval = sleep_interval
+        self.hog_period = hog_period
+        self.label = label
+        self.stats = stats if stats is not None else get_overtime_stats()
+        self.epoch = epoch if epoch is not None else _time()
+        self.durations = []
+        self.offsets = []
+        self.position = 0
+        self.lateness = []
+        self._total_duration = 0.0
+        if durations is not None:
+            self.extend(durations)
+
+    def __len__(self) -> int:
+        """Number of segments in the timeline."""
+        return len(self.durations)
+
+    @property
+    def end(self) -> float:
+        """The absolute end of the last segment."""
+        return self.offsets[-1] if self.offsets else self.epoch
+
+    def onset(self, index: int) -> float:
+        """
+        Get the absolute start of a segment.
+
+        Parameters
+        ----------
+        index : int
+            The index of the segment.
+
+        Returns
+        -------
+        float
+            The start of the segment in the timebase of the active clock source.
+        """
+        index = range(len(self))[index]
+        return self.offsets[index - 1] if index > 0 else self.epoch
+
+    def offset(self, index: int) -> float:
+        """
+        Get the absolute end of a segment.
+
+        Parameters
+        ----------
+        index : int
+            The index of the segment.
+
+        Returns
+        -------
+        float
+            The end of the segment in the timebase of the active clock source.
+        """
+        return self.offsets[index]
+
+    def append(self, duration: float) -> float:
+        """
+        Add a segment at the end of the timeline.
+
+        Parameters
+        ----------
+        duration : float
+            The duration of the segment in seconds.
+
+        Returns
+        -------
+        float
+            The absolute end of the new segment.
+        """
+        # Offsets are computed as epoch + cumulative duration, never from the current time
+        self._total_duration += duration
+        self.durations.append(duration)
+        self.offsets.append(self.epoch + self._total_duration)
+        return self.offsets[-1]
+
+    def extend(self, durations: Iterable[float]) -> None:
+        """
+        Add several segments at the end of the timeline.
+
+        Parameters
+        ----------
+        durations : Iterable[float]
+            The durations of the segments in seconds.
+        """
+        for duration in durations:
+            self.append(duration)
+
+    def remaining(self) -> float:
+        """
+        Get the remaining time of the current segment.
+
+        Returns
+        -------
+        float
+            The time in seconds until the end of the next segment to be waited for.
+        """
+        return self.offsets[self.position] - _time()
+
+    def wait(self) -> float:
+        """
+        Wait until the end of the current segment and advance to the next one.
+
+        Returns
+        -------
+        float
+            The lateness in seconds: the time elapsed between the scheduled end of the segment
+            and the end of the wait.
+
+        Raises
+        ------
+        IndexError:
+            If there is no segment left to wait for.
+        RuntimeError:
+            If `on_overtime` is set to "exception" and the segment has already ended.
+        Warning:
+            If `on_overtime` is set to "warning" and the segment has already ended.
+        """
+        if self.position >= len(self):
+            raise IndexError("There are no segments left in the timeline. Use `append` first.")
+
+        deadline = self.offsets[self.position]
+        duration = self.durations[self.position]
+        self.position += 1
+
+        overtime = _time() - deadline
+        if overtime < 0:
+            if (controller := get_gc_controller()) is not None:
+                controller.collect_in_gap(-overtime)
+            wait_until(deadline, sleep_interval=self.sleep_interval, hog_period=self.hog_period)
+            lateness = _time() - deadline
+            self.lateness.append(lateness)
+            self.stats.record(self.label, duration, -overtime, lateness)
+            return lateness
+
+        self.lateness.append(overtime)
+        self.stats.record(self.label, duration, -overtime, overtime)
+        handle_overtime(self.on_overtime, duration, overtime, self.label, self.stats)
+        return overtime
+
+    @contextlib.contextmanager
+    def segment(self, duration: float) -> Iterator[float]:
+        """
+        Context manager adding a segment and waiting for its end when exiting the block.
+
+        Parameters
+        ----------
+        duration : float
+            The duration of the segment in seconds.
+
+        Yields
+        ------
+        float
+            The absolute end of the segment.
+        """
+        end = self.append(duration)
+        yield end
+        while self.position < len(self) and self.offsets[self.position] <= end:
+            self.wait()
+
+    def reset(self, epoch: Optional[float] = None) -> None:
+        """
+        Restart the timeline from a new epoch, keeping the segment durations.
+
+        Parameters
+        ----------
+        epoch : Optional[float], default=None
+            The new epoch. If None, the current time is used.
+        """
+        self.epoch = epoch if epoch is not None else _time()
+        durations = self.durations
+        self.durations, self.offsets, self.position, self.lateness = [], [], 0, []
+        self._total_duration = 0.0
+        self.extend(durations)
@@ -0,0 +1,124 @@
+"""psychos.core.scheduling: Module to run critical timing sections with realtime scheduling."""
+
+import contextlib
+import os
+import warnings
+from typing import Dict, Iterable, Iterator, Literal, Optional
+
+__all__ = ["realtime"]
+
+SCHEDULING_POLICIES = {
+    "fifo": getattr(os, "SCHED_FIFO", None),
+    "rr": getattr(os, "SCHED_RR", None),
+}
+
+
+def _set_scheduler(policy: Literal["fifo", "rr"], priority: Optional[int]) -> bool:
+    """Set a realtime scheduling policy for the current process."""
+    policy_id = SCHEDULING_POLICIES[policy]
+    if policy_id is None or not hasattr(os, "sched_setscheduler"):
+        return False
+    if priority is None:
+        # Leave headroom above the process for kernel threads and interrupt handlers
+        lowest = os.sched_get_priority_min(policy_id)
+        priority = (lowest + os.sched_get_priority_max(policy_id)) // 2
+    try:
+        os.sched_setscheduler(0, policy_id, os.sched_param(priority))
+    except OSError:
+        return False
+    return True
+
+
+def _set_nice(nice: int) -> bool:
+    """Set the niceness of the current process."""
+    if not hasattr(os, "setpriority"):
+        return False
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, nice)
+    except OSError:
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def realtime(
+    priority: Optional[int] = None,
+    policy: Literal["fifo", "rr"] = "fifo",
+    cpus: Optional[Iterable[int]] = None,
+    nice: int = -10,
+) -> Iterator[Dict[str, bool]]:
+    """
+    Context manager running a block with realtime scheduling priority.
+
+    The process is switched to the SCHED_FIFO or SCHED_RR policy with `os.sched_setscheduler`
+    and optionally pinned to the given cores with `os.sched_setaffinity`, so that the busy-wait
+    phases of `wait` and `wait_key` are not preempted by other processes. The previous policy,
+    priority, niceness and affinity are restored when the block exits.
+
+    Realtime policies usually require root privileges or the `CAP_SYS_NICE` capability. If they
+    cannot be set, a warning is issued and the niceness of the process is lowered to `nice`
+    instead, which also requires privileges for negative values. If neither is possible, the
+    block runs with the normal priority after a warning.
+
+    Parameters
+    ----------
+    priority : Optional[int], default=None
+        The realtime priority (1-99 on Linux). If None, the middle of the range of the policy
+        is used, leaving room for kernel threads with higher priority.
+    policy : Literal["fifo", "rr"], default="fifo"
+        The realtime scheduling policy: "fifo" for SCHED_FIFO or "rr" for SCHED_RR.
+    cpus : Optional[Iterable[int]], default=None
+        The cores to pin the process to. If None, the affinity is not changed.
+    nice : int, default=-10
+        The niceness used as fallback when the realtime policy cannot be set.
+
+    Yields
+    ------
+    Dict[str, bool]
+        Which settings were applied: "scheduler", "nice" and "affinity".
+
+    Examples
+    --------
+    >>> with realtime(cpus=[2]):
+    >>>     window.flip()
+    >>>     key_event = window.wait_key(max_wait=2)
+    """
+    if policy not in SCHEDULING_POLICIES:
+        raise ValueError("Invalid value for 'policy'. Must be 'fifo' or 'rr'.")
+
+    applied = {"scheduler": False, "nice": False, "affinity": False}
+    previous_policy = os.sched_getscheduler(0) if hasattr(os, "sched_getscheduler") else None
+    previous_param = os.sched_getparam(0) if hasattr(os, "sched_getparam") else None
+    previous_affinity = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    previous_nice = os.getpriority(os.PRIO_PROCESS, 0) if hasattr(os, "getpriority") else None
+
+    try:
+        applied["scheduler"] = _set_scheduler(policy, priority)
+        if not applied["scheduler"]:
+            applied["nice"] = _set_nice(nice)
+            if applied["nice"]:
+                fallback = f"niceness {nice} is used instead"
+            else:
+                fallback = "the priority is not changed"
+            warnings.warn(
+                f"Realtime scheduling (SCHED_{policy.upper()}) could not be set, {fallback}. "
+                "Run with root privileges or the CAP_SYS_NICE capability.",
+                RuntimeWarning,
+            )
+
+        if cpus is not None:
+            try:
+                os.sched_setaffinity(0, set(cpus))
+                applied["affinity"] = True
+            except (AttributeError, OSError):
+                warnings.warn(f"The process could not be pinned to cores {cpus}.", RuntimeWarning)
+
+        yield applied
+
+    finally:
+        if applied["scheduler"]:
+            os.sched_setscheduler(0, previous_policy, previous_param)
+        if applied["nice"]:
+            _set_nice(previous_nice)
+        if applied["affinity"]:
+            os.sched_setaffinity(0, previous_affinity)
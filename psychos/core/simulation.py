@@ -0,0 +1,135 @@
+"""psychos.core.simulation: Module to run experiments in virtual time with scripted input."""
+
+import contextlib
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from .input import INPUT_KINDS
+from .keys import MODIFIERS_MAP, _symbol_to_id
+from .timebase import VirtualClockSource, get_clock_source, set_clock_source
+
+if TYPE_CHECKING:
+    from ..visual.window import Window
+
+__all__ = ["ScriptedInput", "virtual_time"]
+
+
+@contextlib.contextmanager
+def virtual_time(start: float = 0.0) -> Iterator[VirtualClockSource]:
+    """
+    Context manager running a block with a `VirtualClockSource`.
+
+    All waits, intervals, clocks and timeouts of `psychos.core` use the simulated time inside
+    the block, and the previous clock source is restored when it exits.
+
+    Parameters
+    ----------
+    start : float, default=0.0
+        The initial simulated time in seconds.
+
+    Yields
+    ------
+    VirtualClockSource
+        The active virtual clock source.
+
+    Examples
+    --------
+    >>> with virtual_time():
+    >>>     ScriptedInput([(1.5, "key_press", "SPACE")], window=window)
+    >>>     run_experiment(window)  # Runs in seconds instead of minutes
+    """
+    previous = get_clock_source()
+    source = set_clock_source(VirtualClockSource(start))
+    try:
+        yield source
+    finally:
+        set_clock_source(previous)
+
+
+def _parse_modifiers(modifiers: Union[str, int]) -> int:
+    """Convert modifier names separated by '|' (e.g. "CTRL|SHIFT") to a bitmask."""
+    if isinstance(modifiers, int):
+        return modifiers
+    mask = 0
+    for name in filter(None, modifiers.split("|")):
+        if (modifier := _symbol_to_id(name, MODIFIERS_MAP)) == -1:
+            raise ValueError(
+                f"Invalid modifier '{name}'. Use `list_modifiers()` to see the available ones."
+            )
+        mask |= modifier
+    return mask
+
+
+def _parse_event(event: Sequence) -> Tuple[float, str, int, int, float, float]:
+    """Validate a scripted event and convert its key and modifier names to Pyglet IDs."""
+    onset, kind, code, *rest = event
+    if kind not in INPUT_KINDS:
+        raise ValueError(f"Invalid event kind '{kind}'. Must be one of {INPUT_KINDS}.")
+    symbol = _symbol_to_id(code) if kind.startswith("key") else code
+    if symbol == -1:
+        raise ValueError(f"Invalid key '{code}'. Use `list_keys()` to see the keys.")
+    x, y = (list(rest[1:3]) + [0, 0])[:2]
+    return onset, kind, symbol, _parse_modifiers(rest[0] if rest else 0), x, y
+
+
+class ScriptedInput:  # pylint: disable=too-few-public-methods
+    """
+    Keyboard and mouse events delivered to a window at simulated times.
+
+    Each event is scheduled with `VirtualClockSource.call_at` and dispatched to the window when
+    the simulated time reaches its onset, so that `wait_key`, `InputQueue` and any other handler
+    receive it exactly as a real event, with the simulated time as timestamp.
+
+    Parameters
+    ----------
+    events : Iterable[Sequence]
+        The events as tuples `(onset, kind, code, modifiers="", x=0, y=0)`, where `onset` is
+        the time in seconds relative to `start`, `kind` is one of "key_press", "key_release",
+        "mouse_press" or "mouse_release", `code` is a key name (e.g. "SPACE"), a key symbol or
+        a mouse button, `modifiers` are names separated by '|' (e.g. "CTRL|SHIFT") or a
+        bitmask, and `x` and `y` are the position of mouse events.
+    window : Optional[Window], default=None
+        The window receiving the events. If None, the current window is used.
+    start : Optional[float], default=None
+        The time to which onsets are relative. If None, the current simulated time is used.
+
+    Raises
+    ------
+    TypeError
+        If the active clock source is not a `VirtualClockSource`.
+
+    Examples
+    --------
+    >>> with virtual_time():
+    >>>     ScriptedInput([(0.8, "key_press", "F"), (0.9, "key_release", "F")], window=window)
+    >>>     key_event = wait_key(keys=["F", "J"], max_wait=2)
+    >>> key_event.timestamp
+    0.8
+    """
+
+    def __init__(
+        self,
+        events: Iterable[Sequence],
+        window: Optional["Window"] = None,
+        start: Optional[float] = None,
+    ):
+        source = get_clock_source()
+        if not isinstance(source, VirtualClockSource):
+            raise TypeError("Scripted input requires a virtual clock source. Use `virtual_time`.")
+
+        if window is None:
+            from ..visual.window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+
+        self.window = window
+        self.start = source.time() if start is None else start
+        self.events = [_parse_event(event) for event in events]
+        for onset, *event in self.events:
+            source.call_at(self.start + onset, self._dispatch, *event)
+
+    def _dispatch(self, kind: str, code: int, modifiers: int, x: float = 0, y: float = 0):
+        """Dispatch an event to the window."""
+        if kind.startswith("key"):
+            self.window.dispatch_event(f"on_{kind}", code, modifiers)
+        else:
+            self.window.dispatch_event(f"on_{kind}", x, y, code, modifiers)
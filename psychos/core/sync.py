@@ -0,0 +1,272 @@
+"""psychos.core.sync: Module to align the local timebase with the clocks of external devices."""
+
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .timebase import get_time
+
+__all__ = ["ClockSync"]
+
+Timestamps = Union[float, Sequence[float], Any]
+
+# Lower bound of the residual scale, so that exact pairs do not make every residual an outlier
+MIN_RESIDUAL_SCALE = 1e-6
+
+
+def _transform(values: Timestamps, slope: float, intercept: float) -> Timestamps:
+    """Apply an affine transformation to a timestamp or to a sequence of timestamps."""
+    if isinstance(values, (int, float)):
+        return values * slope + intercept
+    if hasattr(values, "dtype"):  # NumPy arrays are transformed without a Python loop
+        return values * slope + intercept
+    return array("d", [value * slope + intercept for value in values])
+
+
+class ClockSync:
+    """
+    Online estimation of the offset and drift between the local clock and a device clock.
+
+    EEG amplifiers, eye trackers and scanners timestamp their data with their own clocks, which
+    have an offset and drift with respect to the active clock source of `psychos.core` (see
+    `get_time`). `ClockSync` receives pairs of (local timestamp, device timestamp) and fits
+    `device = intercept + slope * local` by weighted least squares, updating running sums in
+    O(1) per pair. Pairs with large residuals (e.g. a delayed network reply) are down-weighted
+    with Huber weights relative to a running estimate of the residual scale, so that a few
+    outliers do not bias the fit. With `forgetting` < 1, old pairs are progressively forgotten,
+    which tracks drifts that change over time (e.g. with temperature).
+
+    Once fitted, timestamps and whole event logs can be converted between both timebases with
+    `to_device`, `to_local` and `convert_log`.
+
+    Parameters
+    ----------
+    forgetting : float, default=1.0
+        Factor in (0, 1] by which the weight of the previous pairs is multiplied at each update.
+        1 keeps all pairs.
+    outlier_threshold : float, default=3.0
+        Residuals larger than `outlier_threshold` times the residual scale are down-weighted.
+    warmup : int, default=5
+        The number of initial pairs accepted with full weight to estimate the residual scale.
+    max_round_trip : Optional[float], default=None
+        In `measure`, pairs whose query took longer than this time in seconds are discarded.
+
+    Attributes
+    ----------
+    n_samples : int
+        The number of pairs added.
+    n_outliers : int
+        The number of pairs that were down-weighted or discarded as outliers.
+
+    Examples
+    --------
+    >>> sync = ClockSync()
+    >>> for _ in range(20):
+    >>>     sync.measure(amplifier.get_timestamp)  # Pairs the reply with the local time
+    >>>     wait(0.5)
+    >>> sync.to_local(eeg_sample_times)  # Device timestamps in the local timebase
+    >>> sync.convert_log(clock_marks, field="time", direction="to_device")
+    """
+
+    def __init__(
+        self,
+        forgetting: float = 1.0,
+        outlier_threshold: float = 3.0,
+        warmup: int = 5,
+        max_round_trip: Optional[float] = None,
+    ):
+        if not 0 < forgetting <= 1:
+            raise ValueError("Invalid value for 'forgetting'. Must be in the interval (0, 1].")
+        self.forgetting = forgetting
+        self.outlier_threshold = outlier_threshold
+        self.warmup = warmup
+        self.max_round_trip = max_round_trip
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all the pairs."""
+        self.n_samples = 0
+        self.n_outliers = 0
+        self._origin = None
+        self._sums = [0.0] * 5  # Weighted sums of 1, x, y, x * x and x * y
+        self._scale = 0.0
+        self._slope, self._intercept = 1.0, 0.0
+
+    @property
+    def slope(self) -> float:
+        """Device seconds per local second (1 + drift)."""
+        return self._slope
+
+    @property
+    def drift(self) -> float:
+        """Relative drift of the device clock, e.g. 1e-5 for 10 ppm faster than local."""
+        return self._slope - 1.0
+
+    @property
+    def offset(self) -> float:
+        """The device time at local time 0 (the intercept of the fit)."""
+        self._check_fitted()
+        return self._intercept - self._slope * self._origin[0] + self._origin[1]
+
+    @property
+    def residual_scale(self) -> float:
+        """Running estimate of the typical absolute residual of the pairs, in seconds."""
+        return self._scale
+
+    def add(self, local: float, device: float) -> float:
+        """
+        Add a pair of simultaneous timestamps and update the fit.
+
+        Parameters
+        ----------
+        local : float
+            The timestamp in the local timebase (see `get_time`).
+        device : float
+            The timestamp of the device.
+
+        Returns
+        -------
+        float
+            The weight given to the pair, between 0 and 1 (less than 1 for outliers).
+        """
+        if self._origin is None:
+            # Centering the sums on the first pair avoids losing precision with large values
+            self._origin = (local, device)
+        x, y = local - self._origin[0], device - self._origin[1]
+
+        weight = 1.0
+        residual = abs(y - self._intercept - self._slope * x)
+        limit = self.outlier_threshold * max(self._scale, MIN_RESIDUAL_SCALE)
+        if self.n_samples >= self.warmup and residual > limit:
+            weight = limit / residual
+            self.n_outliers += 1
+
+        # Running mean of the weighted absolute residuals, used as the Huber scale
+        count = min(self.n_samples + 1, 50)
+        self._scale += (weight * residual - self._scale) / count
+
+        sums, decay = self._sums, self.forgetting
+        for index, value in enumerate((1.0, x, y, x * x, x * y)):
+            sums[index] = sums[index] * decay + weight * value
+        self.n_samples += 1
+        self._fit()
+        return weight
+
+    def _fit(self) -> None:
+        """Solve the weighted least squares from the running sums."""
+        total, sum_x, sum_y, sum_xx, sum_xy = self._sums
+        determinant = total * sum_xx - sum_x * sum_x
+        if determinant > 1e-12 * total * total:
+            self._slope = (total * sum_xy - sum_x * sum_y) / determinant
+        self._intercept = (sum_y - self._slope * sum_x) / total
+
+    def measure(self, query: Callable[[], float]) -> Optional[float]:
+        """
+        Query the device clock and add the pair, timestamped at the middle of the query.
+
+        Parameters
+        ----------
+        query : Callable[[], float]
+            A function returning the current timestamp of the device (e.g. a request over a
+            socket).
+
+        Returns
+        -------
+        Optional[float]
+            The round-trip time of the query in seconds, or None if the pair was discarded
+            because it exceeded `max_round_trip`.
+        """
+        before = get_time()
+        device = query()
+        after = get_time()
+        round_trip = after - before
+        if self.max_round_trip is not None and round_trip > self.max_round_trip:
+            self.n_outliers += 1
+            return None
+        self.add((before + after) / 2, device)
+        return round_trip
+
+    def _check_fitted(self) -> None:
+        if self._origin is None:
+            raise RuntimeError("No timestamps have been added. Use `add` or `measure` first.")
+
+    def to_device(self, timestamps: Timestamps) -> Timestamps:
+        """
+        Convert local timestamps to the device timebase.
+
+        Parameters
+        ----------
+        timestamps : Union[float, Sequence[float], numpy.ndarray]
+            A local timestamp or a sequence of them.
+
+        Returns
+        -------
+        Union[float, array, numpy.ndarray]
+            The device timestamps: a float for a float, a NumPy array for a NumPy array and
+            an `array.array` of floats for other sequences.
+        """
+        self._check_fitted()
+        return _transform(timestamps, self._slope, self.offset)
+
+    def to_local(self, timestamps: Timestamps) -> Timestamps:
+        """
+        Convert device timestamps to the local timebase.
+
+        Parameters
+        ----------
+        timestamps : Union[float, Sequence[float], numpy.ndarray]
+            A device timestamp or a sequence of them.
+
+        Returns
+        -------
+        Union[float, array, numpy.ndarray]
+            The local timestamps, with the same type conventions as `to_device`.
+        """
+        self._check_fitted()
+        return _transform(timestamps, 1 / self._slope, -self.offset / self._slope)
+
+    def convert_log(
+        self,
+        log: Union[Dict[str, Sequence[float]], List[Any]],
+        field: str = "timestamp",
+        direction: str = "to_local",
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Convert the timestamps of an event log to the other timebase.
+
+        Parameters
+        ----------
+        log : Union[Dict[str, Sequence[float]], List[Any]]
+            Either a dictionary of columns (e.g. from `Clock.get_marks` or
+            `RecordBuffer.columns`) or a list of records that are dictionaries or named tuples
+            (e.g. `KeyEvent` or `InputEvent`).
+        field : str, default="timestamp"
+            The name of the column or field with the timestamps.
+        direction : str, default="to_local"
+            "to_local" to convert device timestamps to local ones, or "to_device".
+
+        Returns
+        -------
+        Union[Dict[str, Any], List[Any]]
+            A copy of the log with the converted timestamps.
+        """
+        if direction not in ("to_local", "to_device"):
+            raise ValueError("Invalid value for 'direction'. Must be 'to_local' or 'to_device'.")
+        convert = getattr(self, direction)
+
+        if isinstance(log, dict):
+            return {**log, field: convert(log[field])}
+
+        converted = convert([_get_field(record, field) for record in log])
+        return [_set_field(record, field, value) for record, value in zip(log, converted)]
+
+
+def _get_field(record: Any, field: str) -> float:
+    """Get a field of a dictionary or named tuple."""
+    return record[field] if isinstance(record, dict) else getattr(record, field)
+
+
+def _set_field(record: Any, field: str, value: float) -> Any:
+    """Get a copy of a dictionary or named tuple with a field replaced."""
+    if isinstance(record, dict):
+        return {**record, field: value}
+    return record._replace(**{field: value})
@@ -1,13 +1,32 @@
 """psychos.core.time: Module with classes and functions for time management."""
 
-import warnings
+import asyncio
+import contextlib
+import csv
 from datetime import datetime
-from time import sleep, time as _time
-from typing import Literal, Optional, Union, Callable
+from typing import TYPE_CHECKING, Callable, Dict, Literal, Optional, Tuple, Union
 
 import pyglet
 
-__all__ = ["wait", "Clock", "Interval"]
+from ..utils.buffers import RecordBuffer
+from .calibration import get_sleep_calibrator, get_timing_defaults
+from .collector import get_gc_controller
+from .overtime import OvertimeStats, check_on_overtime, get_overtime_stats, handle_overtime
+from .scheduling import realtime as _realtime
+from .timebase import get_clock_source, get_time as _time
+
+if TYPE_CHECKING:
+    from ..types import PathStr
+
+__all__ = [
+    "wait",
+    "wait_until",
+    "wait_async",
+    "wait_until_async",
+    "pump_events",
+    "Clock",
+    "Interval",
+]
 
 
 def _dispatch_events():
@@ -17,7 +36,57 @@ def _dispatch_events():
         window.dispatch_pending_events()
 
 
-def wait(duration: float, sleep_interval: float = 0.8, hog_period: float = 0.02):
+def _poll_events():
+    """Poll the operating system events of all windows, calling their handlers."""
+    for window in list(pyglet.app.windows):
+        window.dispatch_events()
+
+
+async def pump_events(dispatch_interval: float = 0.005):
+    """
+    Coroutine that dispatches the events of all windows at a bounded cadence.
+
+    Run it as a background task to keep the windows responsive while other coroutines
+    (e.g. network or device I/O) are awaited.
+
+    Parameters
+    ----------
+    dispatch_interval : float, default=0.005
+        The time in seconds between two consecutive event dispatches.
+
+    Examples
+    --------
+    >>> async def main():
+    >>>     pump = asyncio.create_task(pump_events())
+    >>>     await stream_samples()  # Windows stay responsive meanwhile
+    >>>     pump.cancel()
+    """
+    while True:
+        for window in list(pyglet.app.windows):
+            window.dispatch_events()
+        await asyncio.sleep(dispatch_interval)
+
+
+def _resolve_timing(
+    sleep_interval: Optional[float], hog_period: Union[float, Literal["auto"], None]
+) -> Tuple[float, float]:
+    """Replace unset timing parameters by the defaults of the timing profile."""
+    defaults = get_timing_defaults()
+    if sleep_interval is None:
+        sleep_interval = defaults["sleep_interval"]
+    if hog_period is None:
+        hog_period = defaults["hog_period"]
+    if hog_period == "auto":
+        hog_period = get_sleep_calibrator().hog_period
+    return sleep_interval, hog_period
+
+
+def wait(
+    duration: float,
+    sleep_interval: Optional[float] = None,
+    hog_period: Union[float, Literal["auto"], None] = None,
+    hog_dispatch_interval: Optional[float] = None,
+):
     """
     Wait for a specified duration while keeping the application responsive by processing events.
 
@@ -25,33 +94,165 @@ def wait(duration: float, sleep_interval: float = 0.8, hog_period: float = 0.02)
     ----------
     duration : float
         The total time to wait in seconds.
-    sleep_interval : float, default=0.8
+    sleep_interval : Optional[float], default=None
         The time interval between event dispatching in seconds. This controls how often
         we dispatch events while waiting. Smaller values provide more responsiveness
-        but increase CPU usage.
-    hog_period : float, default=0.02
+        but increase CPU usage. If None, the default of the timing profile is used
+        (0.8 seconds unless changed by `calibrate`).
+    hog_period : Union[float, Literal["auto"], None], default=None
         The duration at the end of the wait period during which the function
         continuously checks the time without sleeping to ensure accurate timing.
+        If "auto", the period is chosen from the measured overshoot of `sleep()` on this
+        machine (see `SleepCalibrator`). If None, the default of the timing profile is used
+        (0.02 seconds unless changed by `calibrate`).
+    hog_dispatch_interval : Optional[float], default=None
+        If provided, the window events are also polled every `hog_dispatch_interval` seconds
+        during the hog period, so that input handlers (e.g. an `InputQueue`) timestamp the
+        events when they arrive instead of after the wait. If None, no events are dispatched
+        during the hog period.
+    """
+    wait_until(
+        _time() + duration,
+        sleep_interval=sleep_interval,
+        hog_period=hog_period,
+        hog_dispatch_interval=hog_dispatch_interval,
+    )
+
+
+def wait_until(
+    deadline: float,
+    sleep_interval: Optional[float] = None,
+    hog_period: Union[float, Literal["auto"], None] = None,
+    hog_dispatch_interval: Optional[float] = None,
+):
     """
-    start_time = _time()
-    end_time = start_time + duration
-    end_time_slow = end_time - hog_period
+    Wait until an absolute time while keeping the application responsive by processing events.
 
-    # Loop until the wait time has passed
-    while _time() < end_time_slow:
-        # Calculate the remaining time
-        remaining_time = min(end_time_slow - _time(), sleep_interval)
+    Waiting on an absolute deadline avoids the accumulation of small delays when several waits
+    are chained. When the clock source supports it (e.g. `clock_nanosleep` on Linux), the
+    sleeps themselves also target the absolute deadline, so that most of the waiting is spent
+    without using the CPU.
+
+    Parameters
+    ----------
+    deadline : float
+        The time to wait for, in the timebase of the active clock source (see `get_time`).
+    sleep_interval : Optional[float], default=None
+        The time interval between event dispatching in seconds. If None, the default of the
+        timing profile is used.
+    hog_period : Union[float, Literal["auto"], None], default=None
+        The duration at the end of the wait period during which the function
+        continuously checks the time without sleeping to ensure accurate timing.
+        If "auto", the period is chosen from the measured overshoot of `sleep()` on this
+        machine (see `SleepCalibrator`). If None, the default of the timing profile is used
+        (0.02 seconds unless changed by `calibrate`).
+    hog_dispatch_interval : Optional[float], default=None
+        If provided, the window events are also polled every `hog_dispatch_interval` seconds
+        during the hog period. If None, no events are dispatched during the hog period.
+
+    Examples
+    --------
+    >>> onset = get_time()
+    >>> wait_until(onset + 0.5)  # Wait until 500 ms after the onset
+    """
+    source = get_clock_source()
+    sleep_interval, hog_period = _resolve_timing(sleep_interval, hog_period)
 
-        # Sleep for the smaller of the remaining time or the sleep_interval
-        sleep(remaining_time)
+    end_time_slow = deadline - hog_period
+
+    # Loop until the wait time has passed
+    while (now := source.time()) < end_time_slow:
+        # Sleep until the slow phase ends or until the next event dispatch
+        target_time = min(end_time_slow, now + sleep_interval)
+        source.sleep_until(target_time)
+        if not source.virtual:  # Virtual sleeps have no overshoot to learn from
+            get_sleep_calibrator().record(target_time - now, source.time() - now)
 
         # After sleeping, dispatch events to ensure responsiveness
         _dispatch_events()
 
+    # Hog the CPU for the remaining time to ensure accurate timing
+    if hog_period > 0 and hog_dispatch_interval is None:
+        while source.time() < deadline:
+            source.idle(deadline)
+    elif hog_period > 0:
+        # Interleave event polling so that input arriving now is handled (and timestamped)
+        next_dispatch = source.time()
+        while (now := source.time()) < deadline:
+            if now >= next_dispatch:
+                _poll_events()
+                next_dispatch = now + hog_dispatch_interval
+            source.idle(min(deadline, next_dispatch))
+
+
+async def wait_async(
+    duration: float,
+    dispatch_interval: float = 0.005,
+    hog_period: Union[float, Literal["auto"], None] = None,
+):
+    """
+    Asynchronous version of `wait`.
+
+    The waiting is done with `asyncio.sleep`, so that other coroutines keep running, and the
+    window events are dispatched at most every `dispatch_interval` seconds.
+
+    Parameters
+    ----------
+    duration : float
+        The total time to wait in seconds.
+    dispatch_interval : float, default=0.005
+        The maximum time in seconds between two event dispatches.
+    hog_period : Union[float, Literal["auto"], None], default=None
+        The duration at the end of the wait period during which the function
+        continuously checks the time without yielding to the event loop, to ensure
+        accurate timing. If "auto", the period is chosen from the measured overshoot of
+        `sleep()` on this machine (see `SleepCalibrator`). If None, the default of the
+        timing profile is used.
+
+    Examples
+    --------
+    >>> await wait_async(0.5)
+    """
+    await wait_until_async(
+        _time() + duration, dispatch_interval=dispatch_interval, hog_period=hog_period
+    )
+
+
+async def wait_until_async(
+    deadline: float,
+    dispatch_interval: float = 0.005,
+    hog_period: Union[float, Literal["auto"], None] = None,
+):
+    """
+    Asynchronous version of `wait_until`.
+
+    Parameters
+    ----------
+    deadline : float
+        The time to wait for, in the timebase of the active clock source (see `get_time`).
+    dispatch_interval : float, default=0.005
+        The maximum time in seconds between two event dispatches.
+    hog_period : Union[float, Literal["auto"], None], default=None
+        The duration at the end of the wait period during which the function
+        continuously checks the time without yielding to the event loop. If None, the
+        default of the timing profile is used.
+    """
+    source = get_clock_source()
+    _, hog_period = _resolve_timing(None, hog_period)
+
+    end_time_slow = deadline - hog_period
+
+    while (now := source.time()) < end_time_slow:
+        target_time = min(end_time_slow, now + dispatch_interval)
+        await source.sleep_until_async(target_time)
+        if not source.virtual:
+            get_sleep_calibrator().record(target_time - now, source.time() - now)
+        _dispatch_events()
+
     # Hog the CPU for the remaining time to ensure accurate timing
     if hog_period > 0:
-        while _time() < end_time:
-            pass
+        while source.time() < deadline:
+            source.idle(deadline)
 
 
 class Clock:
@@ -65,11 +266,15 @@ class Clock:
     ----------
     start_time : Optional[float], default=None
         The initial time from which the clock starts counting. If None, the current time is used.
+        It must be expressed in the timebase of the active clock source (see `get_time`).
     fmt : Optional[Union[Callable, str]], default=None
         Defines how the elapsed time is returned:
         - If None, returns the elapsed time as a float in seconds.
-        - If a string, the elapsed time is returned formatted according to `datetime.strftime`.
+        - If a string, the current wall time is returned formatted according to
+          `datetime.strftime`.
         - If a callable, the callable is applied to the elapsed time, and its result is returned.
+    capacity : int, default=1024
+        The number of marks preallocated for `mark` and `lap`. The buffer grows when full.
 
     Examples
     --------
@@ -89,12 +294,22 @@ class Clock:
     >>> clock_callable = Clock(fmt=lambda x: f"{int(x)} seconds have passed.")
     >>> custom_time = clock_callable.time()  # Returns elapsed time processed by the callable
 
+    Recording many timestamps with minimal overhead and formatting them at the end:
+
+    >>> clock = Clock()
+    >>> for frame in range(600):
+    >>>     window.flip()
+    >>>     clock.mark("flip")  # Stores the raw clock ticks in a preallocated buffer
+    >>> marks = clock.get_marks()  # Labels, elapsed times and laps of all marks
+    >>> clock.export_marks("flips.csv")
+
     """
 
     def __init__(
         self,
         start_time: Optional[float] = None,
         fmt: Optional[Union[Callable, str]] = None,
+        capacity: int = 1024,
     ):
         """
         Initialize the Clock.
@@ -107,6 +322,8 @@ class Clock:
             The format of the output. If None, the result will be the elapsed time in seconds.
             If a string, it will be formatted using `datetime.strftime`.
             If a callable, the callable will process the elapsed time.
+        capacity : int, default=1024
+            The number of marks preallocated for `mark` and `lap`.
 
         Example usage
         -------------
@@ -119,6 +336,10 @@ class Clock:
 
         self.start_time = start_time if start_time is not None else _time()
         self.fmt = fmt
+        self._marks = RecordBuffer({"ticks": "q", "label": "l"}, capacity=capacity)
+        self._labels = [None]
+        self._label_codes = {None: 0}
+        self._last_ticks = None
 
     def time(self) -> Union[float, str]:
         """
@@ -144,16 +365,36 @@ class Clock:
         >>> clock_fmt = Clock(fmt="%H:%M:%S")
         >>> clock_fmt.time()  # Returns elapsed time formatted as a string (HH:MM:SS)
         """
-        elapsed_time = _time() - self.start_time
+        return self.time_at(_time())
+
+    def time_at(self, timestamp: float) -> Union[float, str]:
+        """
+        Get the time of the clock at a timestamp of the active clock source.
+
+        Parameters
+        ----------
+        timestamp : float
+            A timestamp from `get_time` (e.g. the time at which a key event was dispatched).
+
+        Returns
+        -------
+        Union[float, str]
+            The elapsed time from the start of the clock to `timestamp`, formatted with `fmt`
+            as in `time`.
+
+        Raises
+        ------
+        TypeError
+            If `fmt` is not None, a string, or a callable.
+        """
+        elapsed_time = timestamp - self.start_time
         if self.fmt is None:
             return elapsed_time
         if isinstance(self.fmt, str):
-            current_time = datetime.fromtimestamp(self.start_time + elapsed_time)
-            return current_time.strftime(self.fmt)
+            wall_time = get_clock_source().to_wall(timestamp)
+            return datetime.fromtimestamp(wall_time).strftime(self.fmt)
         if callable(self.fmt):
             return self.fmt(elapsed_time)
-        if self.fmt is None:
-            return elapsed_time
 
         raise TypeError(
             "Invalid type for 'fmt'. Must be None, a string, or a callable."
@@ -170,6 +411,110 @@ class Clock:
         """
         self.start_time = _time()
 
+    def mark(self, label: Optional[str] = None) -> None:
+        """
+        Record the current time in the marks buffer.
+
+        Only the raw ticks of the clock source and an integer code of the label are stored, so
+        that marking has a minimal and constant cost. Use `get_marks` or `export_marks` to
+        obtain the elapsed times.
+
+        Parameters
+        ----------
+        label : Optional[str], default=None
+            A label identifying the mark.
+        """
+        self._mark(label)
+
+    def lap(self, label: Optional[str] = None) -> float:
+        """
+        Record a mark and return the time elapsed since the previous mark.
+
+        Parameters
+        ----------
+        label : Optional[str], default=None
+            A label identifying the mark.
+
+        Returns
+        -------
+        float
+            The time in seconds since the previous mark, or since the start of the clock if
+            there are no previous marks.
+        """
+        previous = self._last_ticks
+        ticks = self._mark(label)
+        if previous is None:
+            return ticks / 1e9 - self.start_time
+        return (ticks - previous) / 1e9
+
+    def _mark(self, label: Optional[str]) -> int:
+        """Store the current ticks and the label code, returning the ticks."""
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self._labels)
+            self._labels.append(label)
+        ticks = get_clock_source().time_ns()
+        self._marks.append(ticks, code)
+        self._last_ticks = ticks
+        return ticks
+
+    def get_marks(self, formatted: bool = False) -> Dict[str, list]:
+        """
+        Get the recorded marks.
+
+        Parameters
+        ----------
+        formatted : bool, default=False
+            If True, the `fmt` of the clock is applied to the times.
+
+        Returns
+        -------
+        Dict[str, list]
+            A dictionary with the lists:
+            - "label": The label of each mark.
+            - "time": The time of each mark relative to the start of the clock, in seconds, or
+              formatted with `fmt` if `formatted` is True.
+            - "lap": The time elapsed since the previous mark, in seconds.
+        """
+        labels = [self._labels[code] for code in self._marks.column("label")]
+        times = [ticks / 1e9 - self.start_time for ticks in self._marks.column("ticks")]
+        laps = [current - previous for previous, current in zip([0.0] + times, times)]
+
+        if formatted and self.fmt is not None:
+            if isinstance(self.fmt, str):
+                wall_start = get_clock_source().to_wall(self.start_time)
+                times = [
+                    datetime.fromtimestamp(wall_start + time).strftime(self.fmt) for time in times
+                ]
+            elif callable(self.fmt):
+                times = [self.fmt(time) for time in times]
+            else:
+                raise TypeError("Invalid type for 'fmt'. Must be None, a string, or a callable.")
+
+        return {"label": labels, "time": times, "lap": laps}
+
+    def export_marks(self, path: "PathStr", formatted: bool = False) -> None:
+        """
+        Write the recorded marks to a CSV file with the columns label, time and lap.
+
+        Parameters
+        ----------
+        path : PathStr
+            The path of the CSV file.
+        formatted : bool, default=False
+            If True, the `fmt` of the clock is applied to the times.
+        """
+        marks = self.get_marks(formatted=formatted)
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(marks.keys())
+            writer.writerows(zip(*marks.values()))
+
+    def clear_marks(self) -> None:
+        """Discard the recorded marks, keeping the allocated buffer."""
+        self._marks.clear()
+        self._last_ticks = None
+
 
 class Interval:
     """
@@ -183,17 +528,33 @@ class Interval:
     on_overtime : Literal["ignore", "warning", "exception"], default="warning"
         Specifies what to do if the elapsed time exceeds the duration:
         - "ignore": Do nothing.
-        - "warning": Raise a warning if the interval is exceeded.
+        - "warning": Raise a warning the first time an interval with the same label is
+          exceeded.
         - "exception": Raise an exception if the interval is exceeded.
-    sleep_interval : float, default=0.8
+    sleep_interval : Optional[float], default=None
         The sleep interval for how long the function sleeps in the wait period.
-        This controls the frequency of event dispatching.
-    hog_period : float, default=0.02
+        This controls the frequency of event dispatching. If None, the default of the
+        timing profile is used (0.8 seconds unless changed by `calibrate`).
+    hog_period : Union[float, Literal["auto"], None], default=None
         The hog period is the duration in the final part of the wait
-        where continuous checking is done for more precise timing.
+        where continuous checking is done for more precise timing. If "auto", it is
+        adapted to the measured sleep overshoot of the machine (see `SleepCalibrator`).
+        If None, the default of the timing profile is used (0.02 seconds unless changed
+        by `calibrate`).
     start_time : Optional[float], default=None
         If provided, the interval will use this as the start time, otherwise it will
-        default to the current time using `time()`.
+        default to the current time of the active clock source (see `get_time`).
+    hog_dispatch_interval : Optional[float], default=None
+        If provided, window events are polled every `hog_dispatch_interval` seconds during
+        the hog period (see `wait_until`).
+    realtime : bool, default=False
+        If True, the `with` block (including the final wait) runs with realtime scheduling
+        priority (see `realtime`).
+    label : str, default="interval"
+        The label under which the slack and lateness of every wait are recorded in `stats`.
+    stats : Optional[OvertimeStats], default=None
+        The registry recording the waits. If None, the shared registry is used (see
+        `get_overtime_stats`).
 
     Example usage
     -------------
@@ -210,28 +571,38 @@ class Interval:
     >>> with Interval(5):
     >>>     time.sleep(3)
     >>> # Exiting the 'with' block will automatically wait for the remaining time
+
+    >>> # The interval can also be awaited inside a coroutine
+    >>> async with Interval(5):
+    >>>     await send_trigger()
     """
 
     def __init__(
         self,
         duration: float,
         on_overtime: Literal["ignore", "warning", "exception"] = "warning",
-        sleep_interval: float = 0.8,
-        hog_period: float = 0.02,
+        sleep_interval: Optional[float] = None,
+        hog_period: Union[float, Literal["auto"], None] = None,
         start_time: Optional[float] = None,
+        hog_dispatch_interval: Optional[float] = None,
+        realtime: bool = False,
+        label: str = "interval",
+        stats: Optional[OvertimeStats] = None,
     ):
         self.duration = duration
-        if on_overtime not in ["ignore", "warning", "exception"]:
-            raise ValueError(
-                "Invalid value for 'on_overtime'. Must be 'ignore', 'warning', or 'exception'."
-            )
+        check_on_overtime(on_overtime)
         self.on_overtime = on_overtime
         self.start_time = (
             start_time if start_time is not None else _time()
         )  # Set start time
         self.sleep_interval = sleep_interval
         self.hog_period = hog_period
+        self.hog_dispatch_interval = hog_dispatch_interval
+        self.realtime = realtime
+        self.label = label
+        self.stats = stats if stats is not None else get_overtime_stats()
         self.elapsed_time = None
+        self._exit_stack = contextlib.ExitStack()
 
     def reset(self) -> None:
         """Reset the start time to the current timestamp."""
@@ -255,22 +626,54 @@ class Interval:
         remaining_time = self.duration - self.elapsed_time
 
         if remaining_time > 0:
-            wait(
-                duration=remaining_time,
+            if (controller := get_gc_controller()) is not None:
+                controller.collect_in_gap(remaining_time)
+            wait_until(
+                self.start_time + self.duration,
                 sleep_interval=self.sleep_interval,
                 hog_period=self.hog_period,
-            )  # Wait for the remaining time
+                hog_dispatch_interval=self.hog_dispatch_interval,
+            )  # Wait until the end of the interval
+            lateness = _time() - self.start_time - self.duration
+            self.stats.record(self.label, self.duration, remaining_time, lateness)
         else:
-            message = (
-                f"The interval of {self.duration} seconds was exceeded"
-                f"by {-remaining_time:.2f} seconds."
+            self.stats.record(self.label, self.duration, remaining_time, -remaining_time)
+            handle_overtime(
+                self.on_overtime, self.duration, -remaining_time, self.label, self.stats
             )
 
-            if self.on_overtime == "exception":
-                raise RuntimeError(message)
-            if self.on_overtime == "warning":
-                warnings.warn(message, RuntimeWarning)
-            # If "ignore", do nothing
+    async def wait_async(self, dispatch_interval: float = 0.005) -> None:
+        """
+        Asynchronous version of `wait`.
+
+        Parameters
+        ----------
+        dispatch_interval : float, default=0.005
+            The maximum time in seconds between two event dispatches.
+
+        Raises
+        ------
+        RuntimeError:
+            If `on_overtime` is set to "exception" and the interval has already passed.
+        Warning:
+            If `on_overtime` is set to "warning" and the interval has already passed.
+        """
+        self.elapsed_time = _time() - self.start_time
+        remaining_time = self.duration - self.elapsed_time
+
+        if remaining_time > 0:
+            await wait_until_async(
+                self.start_time + self.duration,
+                dispatch_interval=dispatch_interval,
+                hog_period=self.hog_period,
+            )
+            lateness = _time() - self.start_time - self.duration
+            self.stats.record(self.label, self.duration, remaining_time, lateness)
+        else:
+            self.stats.record(self.label, self.duration, remaining_time, -remaining_time)
+            handle_overtime(
+                self.on_overtime, self.duration, -remaining_time, self.label, self.stats
+            )
 
     def remaining(self) -> float:
         """
@@ -285,12 +688,27 @@ class Interval:
 
     def __enter__(self) -> "Interval":
         """Reset the start time when entering the `with` block."""
+        if self.realtime:
+            self._exit_stack.enter_context(_realtime())
         self.reset()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
         """End the interval and wait for the remaining time when exiting the `with` block."""
-        self.wait()
+        with self._exit_stack:
+            self.wait()
+
+    async def __aenter__(self) -> "Interval":
+        """Reset the start time when entering the `async with` block."""
+        if self.realtime:
+            self._exit_stack.enter_context(_realtime())
+        self.reset()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """Wait asynchronously for the remaining time when exiting the `async with` block."""
+        with self._exit_stack:
+            await self.wait_async()
 
     # --- Arithmetic Methods with Numbers Only ---
 
@@ -307,6 +725,10 @@ class Interval:
                 sleep_interval=self.sleep_interval,
                 hog_period=self.hog_period,
                 start_time=self.start_time,  # Copy start_time
+                hog_dispatch_interval=self.hog_dispatch_interval,
+                realtime=self.realtime,
+                label=self.label,
+                stats=self.stats,
             )
         return NotImplemented
 
@@ -323,6 +745,10 @@ class Interval:
                 sleep_interval=self.sleep_interval,
                 hog_period=self.hog_period,
                 start_time=self.start_time,  # Copy start_time
+                hog_dispatch_interval=self.hog_dispatch_interval,
+                realtime=self.realtime,
+                label=self.label,
+                stats=self.stats,
             )
         return NotImplemented
 
@@ -339,6 +765,10 @@ class Interval:
                 sleep_interval=self.sleep_interval,
                 hog_period=self.hog_period,
                 start_time=self.start_time,  # Copy start_time
+                hog_dispatch_interval=self.hog_dispatch_interval,
+                realtime=self.realtime,
+                label=self.label,
+                stats=self.stats,
             )
         return NotImplemented
 
@@ -355,6 +785,10 @@ class Interval:
                 sleep_interval=self.sleep_interval,
                 hog_period=self.hog_period,
                 start_time=self.start_time,  # Copy start_time
+                hog_dispatch_interval=self.hog_dispatch_interval,
+                realtime=self.realtime,
+                label=self.label,
+                stats=self.stats,
             )
         return NotImplemented
 
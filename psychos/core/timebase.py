@@ -0,0 +1,530 @@
+"""psychos.core.timebase: Module with the clock sources shared by all timing functions."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import heapq
+import itertools
+import math
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from ..utils import register
+
+__all__ = [
+    "ClockSource",
+    "PerfCounterSource",
+    "MonotonicSource",
+    "WallClockSource",
+    "VirtualClockSource",
+    "get_clock_source",
+    "set_clock_source",
+    "get_time",
+]
+
+CLOCK_SOURCES: Dict[str, Type["ClockSource"]] = {}
+
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+
+class _Timespec(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """The `struct timespec` of the C library."""
+
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+def _load_clock_nanosleep() -> Optional[Callable[[int], None]]:
+    """
+    Load `clock_nanosleep` from the C library to sleep until an absolute deadline.
+
+    Returns
+    -------
+    Optional[Callable[[int], None]]
+        A function sleeping until a `CLOCK_MONOTONIC` deadline given in nanoseconds, or None
+        if the platform does not provide `clock_nanosleep`.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        clock_nanosleep = libc.clock_nanosleep
+    except (OSError, AttributeError):
+        return None
+
+    clock_nanosleep.argtypes = [
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.POINTER(_Timespec),
+        ctypes.POINTER(_Timespec),
+    ]
+    clock_nanosleep.restype = ctypes.c_int
+
+    def sleep_until_ns(deadline_ns: int) -> None:
+        # Past deadlines return immediately, but negative ones would be rejected (EINVAL)
+        deadline_ns = max(deadline_ns, 0)
+        request = _Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+        # The error is returned rather than set in errno. With TIMER_ABSTIME an interrupted
+        # sleep can be resumed with the same deadline.
+        while (ret := clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, request, None)) == (
+            errno.EINTR
+        ):
+            pass
+        if ret:
+            raise OSError(ret, os.strerror(ret))
+
+    return sleep_until_ns
+
+
+def _uses_clock_monotonic(clock_name: str) -> bool:
+    """Check if a clock of the `time` module reads `CLOCK_MONOTONIC`."""
+    implementation = time.get_clock_info(clock_name).implementation
+    return "CLOCK_MONOTONIC" in implementation and "RAW" not in implementation
+
+
+_clock_nanosleep = _load_clock_nanosleep()
+
+
+class ClockSource(ABC):
+    """
+    Abstract base class for the time sources used by `psychos.core`.
+
+    A clock source provides a single timebase shared by `wait`, `Clock`, `Interval` and
+    `wait_key`, so that all timestamps of an experiment are directly comparable. Timestamps
+    are returned in seconds relative to an arbitrary reference and can be converted to wall
+    time (seconds since the epoch) with `to_wall` for logging purposes.
+    """
+
+    #: Whether the time of the source only advances when it sleeps (see `VirtualClockSource`)
+    virtual = False
+
+    def __init__(self):
+        self._wall_offset = None
+
+    @abstractmethod
+    def time_ns(self) -> int:
+        """
+        Get the current time of the source.
+
+        Returns
+        -------
+        int
+            The current time in nanoseconds.
+        """
+
+    def time(self) -> float:
+        """
+        Get the current time of the source.
+
+        Returns
+        -------
+        float
+            The current time in seconds.
+        """
+        return self.time_ns() / 1e9
+
+    def sleep(self, duration: float) -> None:
+        """
+        Suspend the execution of the current thread for a given duration.
+
+        Parameters
+        ----------
+        duration : float
+            The time to sleep in seconds.
+        """
+        if duration > 0:
+            time.sleep(duration)
+
+    @property
+    def absolute_sleep(self) -> bool:
+        """Whether `sleep_until` sleeps on an absolute deadline of the operating system."""
+        return False
+
+    def sleep_until(self, deadline: float) -> None:
+        """
+        Suspend the execution of the current thread until a given time of this source.
+
+        The base implementation sleeps for the remaining relative time. Sources able to
+        sleep on an absolute deadline (see `absolute_sleep`) are not affected by the delay
+        between reading the time and starting to sleep, nor by interruptions of the sleep.
+
+        Parameters
+        ----------
+        deadline : float
+            The time of this source, in seconds, at which to wake up.
+        """
+        self.sleep(deadline - self.time())
+
+    async def sleep_until_async(self, deadline: float) -> None:
+        """
+        Asynchronous version of `sleep_until`, returning the control to the event loop.
+
+        Parameters
+        ----------
+        deadline : float
+            The time of this source, in seconds, at which to wake up.
+        """
+        await asyncio.sleep(max(deadline - self.time(), 0))
+
+    def idle(self, deadline: float) -> None:  # pylint: disable=unused-argument
+        """
+        Hook called by busy-wait and polling loops between two iterations.
+
+        Real clock sources return immediately, so that the loop keeps polling the time. Virtual
+        sources advance their time, since it would otherwise never reach `deadline`.
+
+        Parameters
+        ----------
+        deadline : float
+            The time of this source, in seconds, at which the loop ends.
+        """
+
+    @property
+    def wall_offset(self) -> float:
+        """Offset in seconds to add to a timestamp of this source to obtain wall time."""
+        if self._wall_offset is None:
+            self.calibrate_wall()
+        return self._wall_offset
+
+    def calibrate_wall(self, samples: int = 10) -> float:
+        """
+        Estimate the offset between this source and the wall clock (`time.time()`).
+
+        The offset is taken from the sample with the tightest bracketing of the wall clock
+        reading, which reduces the error introduced by preemption between the two reads.
+
+        Parameters
+        ----------
+        samples : int, default=10
+            The number of paired readings used for the estimation.
+
+        Returns
+        -------
+        float
+            The estimated offset in seconds.
+        """
+        best_span, best_offset = float("inf"), 0.0
+        for _ in range(samples):
+            before = self.time()
+            wall = time.time()
+            after = self.time()
+            if after - before < best_span:
+                best_span = after - before
+                best_offset = wall - (before + after) / 2
+        self._wall_offset = best_offset
+        return best_offset
+
+    def to_wall(self, timestamp: float) -> float:
+        """
+        Convert a timestamp of this source to wall time.
+
+        Parameters
+        ----------
+        timestamp : float
+            A timestamp in seconds obtained from this source.
+
+        Returns
+        -------
+        float
+            The corresponding time in seconds since the epoch, as returned by `time.time()`.
+        """
+        return timestamp + self.wall_offset
+
+    def from_wall(self, timestamp: float) -> float:
+        """
+        Convert a wall time to a timestamp of this source.
+
+        Parameters
+        ----------
+        timestamp : float
+            A time in seconds since the epoch, as returned by `time.time()`.
+
+        Returns
+        -------
+        float
+            The corresponding timestamp in seconds of this source.
+        """
+        return timestamp - self.wall_offset
+
+
+@register("perf_counter", CLOCK_SOURCES)
+class PerfCounterSource(ClockSource):
+    """
+    High-resolution monotonic clock source based on `time.perf_counter_ns`.
+
+    This is the default clock source. It is not affected by system clock updates (e.g. NTP
+    adjustments) and has the highest resolution available on the platform. On Linux, where
+    `perf_counter` reads `CLOCK_MONOTONIC`, `sleep_until` uses `clock_nanosleep` with an
+    absolute deadline.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._absolute_sleep = _clock_nanosleep is not None and _uses_clock_monotonic(
+            "perf_counter"
+        )
+
+    def time_ns(self) -> int:
+        return time.perf_counter_ns()
+
+    def time(self) -> float:
+        return time.perf_counter()
+
+    @property
+    def absolute_sleep(self) -> bool:
+        return self._absolute_sleep
+
+    def sleep_until(self, deadline: float) -> None:
+        if self._absolute_sleep:
+            _clock_nanosleep(int(deadline * 1e9))
+        else:
+            super().sleep_until(deadline)
+
+
+@register("monotonic", CLOCK_SOURCES)
+class MonotonicSource(ClockSource):
+    """Monotonic clock source based on `time.monotonic_ns`."""
+
+    def __init__(self):
+        super().__init__()
+        self._absolute_sleep = _clock_nanosleep is not None and _uses_clock_monotonic(
+            "monotonic"
+        )
+
+    def time_ns(self) -> int:
+        return time.monotonic_ns()
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    @property
+    def absolute_sleep(self) -> bool:
+        return self._absolute_sleep
+
+    def sleep_until(self, deadline: float) -> None:
+        if self._absolute_sleep:
+            _clock_nanosleep(int(deadline * 1e9))
+        else:
+            super().sleep_until(deadline)
+
+
+@register("wall", CLOCK_SOURCES)
+class WallClockSource(ClockSource):
+    """
+    Wall clock source based on `time.time_ns`.
+
+    This source is affected by system clock updates and is only provided for compatibility.
+    """
+
+    def time_ns(self) -> int:
+        return time.time_ns()
+
+    def time(self) -> float:
+        return time.time()
+
+    def calibrate_wall(self, samples: int = 10) -> float:
+        self._wall_offset = 0.0
+        return self._wall_offset
+
+
+@register("virtual", CLOCK_SOURCES)
+class VirtualClockSource(ClockSource):
+    """
+    Simulated clock source whose time only advances when it sleeps.
+
+    Sleeping advances the simulated time instantly to the deadline, so that waits, intervals
+    and timeouts of a whole experiment run faster than real time (e.g. to test a paradigm on a
+    headless CI runner). Callbacks can be scheduled at simulated times with `call_at`, which is
+    how `ScriptedInput` delivers key and mouse events; they are run in order when the time
+    reaches them, with the time set to their scheduled time.
+
+    Busy-wait loops (the hog phase of `wait` and the polling loop of `wait_key`) call `idle`,
+    which advances the time to the next scheduled callback or to the end of the loop.
+
+    Parameters
+    ----------
+    start : float, default=0.0
+        The initial time in seconds.
+
+    Examples
+    --------
+    >>> source = set_clock_source("virtual")
+    >>> wait(60)  # Returns immediately
+    >>> get_time()
+    60.0
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        super().__init__()
+        self._now_ns = _to_ns(start)
+        self._timers: List[Tuple[int, int, Callable[..., Any], Tuple[Any, ...]]] = []
+        self._counter = itertools.count()
+        self._wall_offset = time.time() - start
+
+    def time_ns(self) -> int:
+        return self._now_ns
+
+    @property
+    def absolute_sleep(self) -> bool:
+        return True
+
+    def sleep(self, duration: float) -> None:
+        if duration > 0:
+            self.advance_to(self._now_ns / 1e9 + duration)
+
+    def sleep_until(self, deadline: float) -> None:
+        self.advance_to(deadline)
+
+    async def sleep_until_async(self, deadline: float) -> None:
+        await asyncio.sleep(0)
+        self.advance_to(deadline)
+
+    def idle(self, deadline: float) -> None:
+        next_timer = self._timers[0][0] if self._timers else None
+        if deadline == float("inf") and next_timer is None:
+            raise RuntimeError(
+                "Waiting without a deadline in virtual time, but no event is scheduled."
+            )
+        target_ns = _to_ns(deadline) if deadline != float("inf") else next_timer
+        if next_timer is not None:
+            target_ns = min(target_ns, next_timer)
+        # Always make progress, so that loops checking `time() <= deadline` terminate
+        if target_ns <= self._now_ns and (next_timer is None or next_timer > self._now_ns):
+            target_ns = self._now_ns + 1
+        self._advance_ns(target_ns)
+
+    def calibrate_wall(self, samples: int = 10) -> float:
+        return self._wall_offset
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedule a callback at a simulated time.
+
+        Parameters
+        ----------
+        when : float
+            The time in seconds at which to call the callback. Past times are run at the next
+            advance of the time.
+        callback : Callable[..., Any]
+            The function to call.
+        *args : Any
+            Positional arguments for the callback.
+        """
+        heapq.heappush(self._timers, (_to_ns(when), next(self._counter), callback, args))
+
+    @property
+    def next_timer(self) -> Optional[float]:
+        """The time in seconds of the next scheduled callback, or None if there is none."""
+        return self._timers[0][0] / 1e9 if self._timers else None
+
+    def advance(self, duration: float) -> None:
+        """
+        Advance the simulated time, running the callbacks scheduled in between.
+
+        Parameters
+        ----------
+        duration : float
+            The time in seconds to advance.
+        """
+        self.advance_to(self._now_ns / 1e9 + duration)
+
+    def advance_to(self, deadline: float) -> None:
+        """
+        Advance the simulated time to a deadline, running the callbacks scheduled before it.
+
+        The time never goes backwards: a deadline in the past only runs the due callbacks.
+
+        Parameters
+        ----------
+        deadline : float
+            The time in seconds to advance to.
+        """
+        self._advance_ns(_to_ns(deadline))
+
+    def _advance_ns(self, deadline_ns: int) -> None:
+        """Advance the time to `deadline_ns` nanoseconds, running the due callbacks in order."""
+        while self._timers and self._timers[0][0] <= deadline_ns:
+            when, _, callback, args = heapq.heappop(self._timers)
+            self._now_ns = max(self._now_ns, when)
+            callback(*args)
+        self._now_ns = max(self._now_ns, deadline_ns)
+
+
+def _to_ns(seconds: float) -> int:
+    """Convert a time to the first nanosecond at which `time()` is not earlier than it."""
+    # Truncating would leave the time just below deadlines such as 0.1 + 0.2, forever
+    nanoseconds = math.ceil(seconds * 1e9)
+    return nanoseconds + 1 if nanoseconds / 1e9 < seconds else nanoseconds
+
+
+_clock_source: ClockSource = PerfCounterSource()
+
+
+def get_clock_source() -> ClockSource:
+    """
+    Get the clock source currently used by `psychos.core`.
+
+    Returns
+    -------
+    ClockSource
+        The active clock source.
+    """
+    return _clock_source
+
+
+def set_clock_source(source: Union[str, ClockSource]) -> ClockSource:
+    """
+    Set the clock source used by `wait`, `Clock`, `Interval` and `wait_key`.
+
+    Timestamps taken with different clock sources are not comparable, so the clock source
+    should be set at the beginning of the experiment, before creating any `Clock` or `Interval`.
+
+    Parameters
+    ----------
+    source : Union[str, ClockSource]
+        The name of a registered clock source ("perf_counter", "monotonic", "wall" or
+        "virtual") or an instance of `ClockSource`.
+
+    Returns
+    -------
+    ClockSource
+        The new active clock source.
+
+    Examples
+    --------
+    >>> set_clock_source("monotonic")
+    >>> get_time()  # Seconds from `time.monotonic()`
+    """
+    global _clock_source  # pylint: disable=global-statement
+
+    if isinstance(source, str):
+        source_cls = CLOCK_SOURCES.get(source)
+        if source_cls is None:
+            raise ValueError(
+                f"Unknown clock source: {source}. "
+                f"Available sources: {list(CLOCK_SOURCES.keys())}"
+            )
+        source = source_cls()
+    elif not isinstance(source, ClockSource):
+        raise TypeError("Invalid type for 'source'. Must be a string or a ClockSource.")
+
+    _clock_source = source
+    return source
+
+
+def get_time() -> float:
+    """
+    Get the current time in seconds from the active clock source.
+
+    Returns
+    -------
+    float
+        The current time in seconds.
+    """
+    return _clock_source.time()
@@ -15,6 +15,9 @@ __all__ = [
     "UnitTransformation",
     "KeyEvent",
     "KeyEventType",
+    "ScheduledCall",
+    "InputEvent",
+    "InputEventType",
 ]
 
 PathStr = Union["str", "Path"]
@@ -54,12 +57,43 @@ UnitTransformation = Literal[
 
 
 KeyEventType = Literal["press", "release"]
+InputEventType = Literal["key_press", "key_release", "mouse_press", "mouse_release"]
 
 
 class KeyEvent(NamedTuple):
-    """A named tuple representing a key event."""
+    """
+    A named tuple representing a key event.
+
+    `timestamp` is the time at which the event handler ran. `native_timestamp` is the time
+    at which the platform generated the event (the X server time on X11), mapped to the same
+    timebase, and `latency` is the delay between both, or None if the platform time is not
+    available. `code` is the Pyglet key ID of `key`.
+    """
 
     key: Optional[str]
     timestamp: float
     modifiers: Optional[str]
     event: KeyEventType
+    native_timestamp: Optional[float] = None
+    latency: Optional[float] = None
+    code: Optional[int] = None
+
+
+class ScheduledCall(NamedTuple):
+    """A named tuple representing a callback executed by a `Scheduler`."""
+
+    label: Optional[str]
+    deadline: float
+    timestamp: float
+    lateness: float
+
+
+class InputEvent(NamedTuple):
+    """A named tuple representing a timestamped keyboard or mouse event."""
+
+    kind: InputEventType
+    code: int
+    modifiers: int
+    x: float
+    y: float
+    timestamp: float
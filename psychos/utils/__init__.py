@@ -4,21 +4,27 @@ from typing import TYPE_CHECKING
 from .lazy import attach
 
 submod_attrs = {
+    "buffers": ["RecordBuffer"],
     "colors": ["Color"],
     "decorators": ["docstring", "register"],
     "screens": ["get_screens"],
+    "stats": ["percentile"],
 }
 
 __getattr__, __dir__, __all__ = attach(__name__, submod_attrs=submod_attrs)
 
 if TYPE_CHECKING:
     __all__ = [
+        "RecordBuffer",
         "Color",
         "docstring",
         "register",
         "get_screens",
+        "percentile",
     ]
 
+    from .buffers import RecordBuffer
     from .colors import Color
     from .decorators import docstring, register
     from .screens import get_screens
+    from .stats import percentile
@@ -0,0 +1,209 @@
+"""psychos.utils.buffers: Module with preallocated buffers for high-rate recording."""
+
+import csv
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..types import PathStr
+
+__all__ = ["RecordBuffer"]
+
+
+class RecordBuffer:
+    """
+    Preallocated column-oriented buffer of numeric records.
+
+    Each column is stored in a typed `array.array`, so that appending a record only writes
+    numbers in memory that has already been allocated and no Python object is kept per record.
+    When the buffer is full it either doubles its capacity (the default) or, if `ring` is True,
+    overwrites the oldest records.
+
+    Every appended record receives a sequence number (starting at 0), which keeps increasing
+    when old records are overwritten. Sequence numbers can be used to read only the records
+    appended since a previous read.
+
+    Parameters
+    ----------
+    columns : Dict[str, str]
+        Mapping of column names to `array` type codes (e.g. "d" for float, "q" for 64-bit int).
+    capacity : int, default=1024
+        The number of records preallocated.
+    ring : bool, default=False
+        If True, the buffer has a fixed size and the oldest records are overwritten when full.
+
+    Examples
+    --------
+    >>> buffer = RecordBuffer({"t": "d", "x": "l", "y": "l"}, capacity=4096, ring=True)
+    >>> buffer.append(0.016, 10, 20)
+    >>> buffer.column("x")
+    array('l', [10])
+    >>> buffer.to_csv("samples.csv")
+    """
+
+    def __init__(self, columns: Dict[str, str], capacity: int = 1024, ring: bool = False):
+        if capacity <= 0:
+            raise ValueError("Invalid value for 'capacity'. Must be a positive integer.")
+        self.names = list(columns)
+        self.typecodes = list(columns.values())
+        self.ring = ring
+        self._capacity = capacity
+        self._arrays = [
+            array(code, bytes(array(code).itemsize * capacity)) for code in self.typecodes
+        ]
+        self._total = 0
+
+    @property
+    def capacity(self) -> int:
+        """The number of records that fit in the buffer without growing or overwriting."""
+        return self._capacity
+
+    @property
+    def total(self) -> int:
+        """The number of records appended since creation or the last `clear`."""
+        return self._total
+
+    @property
+    def first(self) -> int:
+        """The sequence number of the oldest record still stored."""
+        return max(self._total - self._capacity, 0)
+
+    def __len__(self) -> int:
+        return min(self._total, self._capacity)
+
+    def append(self, *values: Any) -> None:
+        """
+        Append a record, with one value per column in the order of `names`.
+
+        Parameters
+        ----------
+        *values : Any
+            The values of the record.
+        """
+        index = self._total
+        if index >= self._capacity:
+            if self.ring:
+                index %= self._capacity
+            else:
+                self._grow()
+        for column, value in zip(self._arrays, values):
+            column[index] = value
+        self._total += 1
+
+    def clear(self) -> None:
+        """Discard all the records, keeping the allocated memory."""
+        self._total = 0
+
+    def _grow(self) -> None:
+        """Double the capacity of the buffer."""
+        for column in self._arrays:
+            column.frombytes(bytes(column.itemsize * self._capacity))
+        self._capacity *= 2
+
+    def _slices(self, start: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Get the storage ranges of the records from sequence number `start`, in order."""
+        start = self.first if start is None else max(start, self.first)
+        if start >= self._total:
+            return []
+        begin, end = start % self._capacity, self._total % self._capacity
+        if self._total <= self._capacity or begin < end:
+            return [(begin, end if end > begin else self._capacity)]
+        return [(begin, self._capacity), (0, end)]
+
+    def column(self, name: str, start: Optional[int] = None) -> array:
+        """
+        Get a copy of a column in chronological order.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column.
+        start : Optional[int], default=None
+            The sequence number of the first record to return. If None, all stored records
+            are returned.
+
+        Returns
+        -------
+        array
+            The values of the column.
+        """
+        column = self._arrays[self.names.index(name)]
+        result = array(column.typecode)
+        for begin, end in self._slices(start):
+            result.extend(column[begin:end])
+        return result
+
+    def columns(self, start: Optional[int] = None) -> Dict[str, array]:
+        """
+        Get a copy of all columns in chronological order.
+
+        Parameters
+        ----------
+        start : Optional[int], default=None
+            The sequence number of the first record to return. If None, all stored records
+            are returned.
+
+        Returns
+        -------
+        Dict[str, array]
+            Mapping of column names to their values.
+        """
+        return {name: self.column(name, start=start) for name in self.names}
+
+    def rows(self, start: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over the records in chronological order.
+
+        Parameters
+        ----------
+        start : Optional[int], default=None
+            The sequence number of the first record to return. If None, all stored records
+            are returned.
+
+        Yields
+        ------
+        Tuple[Any, ...]
+            The values of each record.
+        """
+        for begin, end in self._slices(start):
+            for index in range(begin, end):
+                yield tuple(column[index] for column in self._arrays)
+
+    def to_numpy(self, start: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get all columns as NumPy arrays. Requires `numpy` to be installed.
+
+        Parameters
+        ----------
+        start : Optional[int], default=None
+            The sequence number of the first record to return.
+
+        Returns
+        -------
+        Dict[str, numpy.ndarray]
+            Mapping of column names to their values.
+        """
+        try:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "NumPy is required to export the buffer. Install it with `pip install numpy`."
+            ) from error
+
+        return {name: np.array(values) for name, values in self.columns(start=start).items()}
+
+    def to_csv(self, path: "PathStr", start: Optional[int] = None) -> None:
+        """
+        Write the records to a CSV file with a header row.
+
+        Parameters
+        ----------
+        path : PathStr
+            The path of the CSV file.
+        start : Optional[int], default=None
+            The sequence number of the first record to write.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.names)
+            writer.writerows(self.rows(start=start))
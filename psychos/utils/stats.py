@@ -0,0 +1,29 @@
+"""psychos.utils.stats: Module with small statistics helpers for timing measurements."""
+
+from typing import Iterable
+
+__all__ = ["percentile"]
+
+
+def percentile(samples: Iterable[float], fraction: float) -> float:
+    """
+    Get a percentile of a set of values, as the nearest value at or above the rank.
+
+    No interpolation is made, so that the result is always one of the measured values.
+
+    Parameters
+    ----------
+    samples : Iterable[float]
+        The values. Must not be empty.
+    fraction : float
+        The percentile, between 0 and 1 (e.g. 0.99 for the 99th percentile).
+
+    Returns
+    -------
+    float
+        The value of the percentile.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError("Cannot compute a percentile of an empty set of values.")
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
@@ -9,14 +9,16 @@ submod_attrs = {
     "text": ["Text"],
     "image": ["Image"],
     "units": ["Unit"],
+    "hittest": ["SpatialIndex"],
 }
 
 __getattr__, __dir__, __all__ = attach(__name__, submod_attrs=submod_attrs)
 
 if TYPE_CHECKING:
-    __all__ = ["Window", "Image", "Text", "get_window", "Unit"]
+    __all__ = ["Window", "Image", "Text", "get_window", "Unit", "SpatialIndex"]
 
     from .window import Window, get_window
     from .text import Text
     from .image import Image
     from .units import Unit
+    from .hittest import SpatialIndex
@@ -0,0 +1,273 @@
+"""psychos.visual.hittest: Module with a spatial index to find the stimuli under a point."""
+
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .units import Unit
+
+if TYPE_CHECKING:
+    from ..types import UnitType
+    from .window import Window
+
+__all__ = ["SpatialIndex"]
+
+Bounds = Tuple[float, float, float, float]
+
+
+def _stimulus_geometry(stimulus: Any) -> Tuple[float, float, Bounds, float]:
+    """
+    Get the origin, the rectangle around the origin and the clockwise rotation of a stimulus.
+
+    Text layouts (e.g. `Text`) provide their sides, sprites (e.g. `Image`) their image anchor
+    and scales, and other objects are read as boxes of `width` and `height` whose bottom-left
+    corner is at (`x`, `y`). Stimuli rotate around (`x`, `y`).
+    """
+    x, y = stimulus.x, stimulus.y
+    rotation = getattr(stimulus, "rotation", 0) or 0
+    if all(hasattr(stimulus, side) for side in ("left", "bottom", "right", "top")):
+        rect = (stimulus.left - x, stimulus.bottom - y, stimulus.right - x, stimulus.top - y)
+    elif hasattr(stimulus, "image") and hasattr(stimulus, "scale_x"):
+        image = stimulus.image
+        scale_x = stimulus.scale * stimulus.scale_x
+        scale_y = stimulus.scale * stimulus.scale_y
+        x1, x2 = -image.anchor_x * scale_x, (image.width - image.anchor_x) * scale_x
+        y1, y2 = -image.anchor_y * scale_y, (image.height - image.anchor_y) * scale_y
+        rect = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+    elif hasattr(stimulus, "width") and hasattr(stimulus, "height"):
+        rect = (0.0, 0.0, stimulus.width, stimulus.height)
+    else:
+        raise TypeError(
+            f"Cannot compute the bounds of {type(stimulus).__name__!r}. Pass `bounds` instead."
+        )
+    return x, y, rect, rotation
+
+
+def _rotate(x: float, y: float, rotation: float) -> Tuple[float, float]:
+    """Rotate a point clockwise around the origin by `rotation` degrees."""
+    angle = math.radians(rotation)
+    cos, sin = math.cos(angle), math.sin(angle)
+    return x * cos + y * sin, y * cos - x * sin
+
+
+class SpatialIndex:
+    """
+    Uniform grid of stimuli to find which of them contain a point (e.g. a mouse click).
+
+    Every stimulus is registered in the square cells of `cell_size` pixels covered by its
+    bounding box, so that a query only tests the few stimuli of the cell of the point instead
+    of all of them. With hundreds of stimuli (visual search, memory arrays), a click is
+    resolved in a few microseconds. The bounds are computed from the position, size, anchor
+    and scale of the stimuli in window pixels, and rotated stimuli are tested exactly in their
+    own frame.
+
+    Stimuli that move or change size must be updated with `update`, which only moves them
+    between the cells whose coverage changed.
+
+    Parameters
+    ----------
+    stimuli : Iterable[Any], default=()
+        The stimuli to add (e.g. `Text` or `Image`), in drawing order.
+    cell_size : float, default=64
+        The side of the grid cells in pixels. Cells about the size of the stimuli work best.
+    window : Optional[Window], default=None
+        The window used to convert points given in units. If None, the current window is used.
+
+    Examples
+    --------
+    >>> index = SpatialIndex(items)
+    >>> @window.event
+    >>> def on_mouse_press(x, y, button, modifiers):
+    >>>     clicked = index.hit(x, y)  # The topmost stimulus under the click, or None
+    >>> items[3].position = (0.5, 0.5)
+    >>> index.update(items[3])
+    """
+
+    def __init__(
+        self,
+        stimuli: Iterable[Any] = (),
+        cell_size: float = 64,
+        window: Optional["Window"] = None,
+    ):
+        if cell_size <= 0:
+            raise ValueError("Invalid value for 'cell_size'. Must be positive.")
+        self.cell_size = cell_size
+        self.window = window
+        # Stimuli are identified by `id`, so that they do not need to be hashable
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._entries: Dict[int, list] = {}  # [stimulus, order, geometry, cells]
+        self._counter = 0
+        for stimulus in stimuli:
+            self.add(stimulus)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, stimulus: Any) -> bool:
+        return id(stimulus) in self._entries
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the stimuli in drawing order."""
+        return iter(entry[0] for entry in sorted(self._entries.values(), key=lambda e: e[1]))
+
+    def _entry(self, stimulus: Any) -> list:
+        try:
+            return self._entries[id(stimulus)]
+        except KeyError as error:
+            raise KeyError("The stimulus is not in the index.") from error
+
+    def _geometry(self, stimulus: Any, bounds: Optional[Bounds]) -> tuple:
+        """Get the geometry of a stimulus and the range of cells covered by it."""
+        if bounds is not None:
+            origin_x, origin_y, rect, rotation = 0.0, 0.0, tuple(bounds), 0
+        else:
+            origin_x, origin_y, rect, rotation = _stimulus_geometry(stimulus)
+
+        corners = [(rect[0], rect[1]), (rect[2], rect[1]), (rect[0], rect[3]), (rect[2], rect[3])]
+        if rotation:
+            corners = [_rotate(x, y, rotation) for x, y in corners]
+        xs = [origin_x + x for x, _ in corners]
+        ys = [origin_y + y for _, y in corners]
+        size = self.cell_size
+        cells = (
+            math.floor(min(xs) / size),
+            math.floor(min(ys) / size),
+            math.floor(max(xs) / size),
+            math.floor(max(ys) / size),
+        )
+        return (origin_x, origin_y, rect, rotation), cells
+
+    def _insert(self, key: int, cells: Tuple[int, int, int, int]) -> None:
+        for column in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                self._cells.setdefault((column, row), []).append(key)
+
+    def _discard(self, key: int, cells: Tuple[int, int, int, int]) -> None:
+        for column in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                cell = self._cells[column, row]
+                cell.remove(key)
+                if not cell:
+                    del self._cells[column, row]
+
+    def add(self, stimulus: Any, bounds: Optional[Bounds] = None) -> None:
+        """
+        Add a stimulus on top of the stimuli already in the index.
+
+        Parameters
+        ----------
+        stimulus : Any
+            The stimulus (e.g. `Text` or `Image`), or any object identifying the region.
+        bounds : Optional[Tuple[float, float, float, float]], default=None
+            The (left, bottom, right, top) sides of the region in window pixels. If None, they
+            are computed from the stimulus.
+        """
+        if stimulus in self:
+            raise ValueError("The stimulus is already in the index. Use `update` instead.")
+        geometry, cells = self._geometry(stimulus, bounds)
+        self._entries[id(stimulus)] = [stimulus, self._counter, geometry, cells]
+        self._counter += 1
+        self._insert(id(stimulus), cells)
+
+    def update(self, stimulus: Any, bounds: Optional[Bounds] = None) -> None:
+        """
+        Update the region of a stimulus that moved or changed size.
+
+        Parameters
+        ----------
+        stimulus : Any
+            A stimulus of the index.
+        bounds : Optional[Tuple[float, float, float, float]], default=None
+            The new (left, bottom, right, top) sides in window pixels. If None, they are
+            computed from the stimulus.
+        """
+        entry = self._entry(stimulus)
+        geometry, cells = self._geometry(stimulus, bounds)
+        if cells != entry[3]:
+            self._discard(id(stimulus), entry[3])
+            self._insert(id(stimulus), cells)
+        entry[2:] = [geometry, cells]
+
+    def remove(self, stimulus: Any) -> None:
+        """
+        Remove a stimulus from the index.
+
+        Parameters
+        ----------
+        stimulus : Any
+            A stimulus of the index.
+        """
+        entry = self._entry(stimulus)
+        del self._entries[id(stimulus)]
+        self._discard(id(stimulus), entry[3])
+
+    def clear(self) -> None:
+        """Remove all the stimuli."""
+        self._cells.clear()
+        self._entries.clear()
+
+    def _to_pixels(
+        self, x: float, y: float, units: Optional[Union["UnitType", "Unit"]]
+    ) -> Tuple[float, float]:
+        if units is None:
+            return x, y
+        window = self.window
+        if window is None and not isinstance(units, Unit):
+            from .window import get_window  # pylint: disable=import-outside-toplevel
+
+            window = get_window()
+        return Unit.from_name(units, window=window).transform(x, y)
+
+    def hits(
+        self, x: float, y: float, units: Optional[Union["UnitType", "Unit"]] = None
+    ) -> List[Any]:
+        """
+        Get all the stimuli containing a point.
+
+        Parameters
+        ----------
+        x : float
+            The x-coordinate of the point.
+        y : float
+            The y-coordinate of the point.
+        units : Optional[Union[UnitType, Unit]], default=None
+            The unit system of the point (e.g. "norm"). If None, the point is in window pixels,
+            as in the mouse events.
+
+        Returns
+        -------
+        List[Any]
+            The stimuli containing the point, topmost (last added) first.
+        """
+        x, y = self._to_pixels(x, y, units)
+        cell = self._cells.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)))
+        if not cell:
+            return []
+        found = []
+        for key in cell:
+            entry = self._entries[key]
+            origin_x, origin_y, rect, rotation = entry[2]
+            local_x, local_y = x - origin_x, y - origin_y
+            if rotation:
+                local_x, local_y = _rotate(local_x, local_y, -rotation)
+            if rect[0] <= local_x <= rect[2] and rect[1] <= local_y <= rect[3]:
+                found.append(entry)
+        return [entry[0] for entry in sorted(found, key=lambda entry: entry[1], reverse=True)]
+
+    def hit(
+        self, x: float, y: float, units: Optional[Union["UnitType", "Unit"]] = None
+    ) -> Optional[Any]:
+        """
+        Get the topmost stimulus containing a point.
+
+        Parameters
+        ----------
+        x, y, units
+            See `hits`.
+
+        Returns
+        -------
+        Optional[Any]
+            The last added stimulus containing the point, or None.
+        """
+        found = self.hits(x, y, units=units)
+        return found[0] if found else None
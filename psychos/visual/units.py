@@ -1,7 +1,8 @@
 """psychos.visual.units: Module with unit systems for converting between coordinate systems."""
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Type, TYPE_CHECKING, Union, Optional
+from array import array
+from typing import Any, Sequence, Tuple, Dict, Type, TYPE_CHECKING, Union, Optional
 import re
 
 from ..types import UnitTransformation, UnitType
@@ -29,6 +30,9 @@ __all__ = [
 
 UNIT_SYSTEMS: Dict["UnitTransformation", Type["Unit"]] = {}
 
+# Pixel coordinate used to measure the scale of the unit systems
+LINEAR_PROBE = 4096
+
 
 class Unit(ABC):
     """
@@ -106,6 +110,40 @@ class Unit(ABC):
 
         raise ValueError(f"Unknown transformation type: {transformation}")
 
+    def inverse_transform_array(
+        self, x: Union[Sequence[float], Any], y: Union[Sequence[float], Any]
+    ) -> Tuple[Any, Any]:
+        """
+        Convert many coordinates from pixel values to units at once (e.g. recorded samples).
+
+        The unit systems are affine along each axis, so the scale and offset of each axis are
+        computed once from `inverse_transform` and applied to all the values, without a Python
+        call per value when NumPy arrays are given.
+
+        Parameters
+        ----------
+        x : Union[Sequence[float], numpy.ndarray]
+            The x-coordinates in pixels.
+        y : Union[Sequence[float], numpy.ndarray]
+            The y-coordinates in pixels.
+
+        Returns
+        -------
+        Tuple[Union[array, numpy.ndarray], Union[array, numpy.ndarray]]
+            The coordinates in the unit system: NumPy arrays for NumPy arrays and
+            `array.array` of floats for other sequences.
+        """
+        # A distant probe point keeps the rounding error of the scales small
+        x_offset, y_offset = self.inverse_transform(0, 0)
+        x_probe, y_probe = self.inverse_transform(LINEAR_PROBE, LINEAR_PROBE)
+        x_scale = (x_probe - x_offset) / LINEAR_PROBE
+        y_scale = (y_probe - y_offset) / LINEAR_PROBE
+        if hasattr(x, "dtype") and hasattr(y, "dtype"):  # Vectorized NumPy operations
+            return x * x_scale + x_offset, y * y_scale + y_offset
+        x_units = array("d", [value * x_scale + x_offset for value in x])
+        y_units = array("d", [value * y_scale + y_offset for value in y])
+        return x_units, y_units
+
     @abstractmethod
     def transform(self, x: float, y: float) -> Tuple[int, int]:
         """
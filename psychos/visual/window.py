@@ -1,21 +1,27 @@
 """psychos.visual.window: Extension of the Pyglet window class with additional functionality."""
 
-from typing import Iterable, Optional, TYPE_CHECKING, Union, Tuple
+from typing import Iterable, List, Optional, TYPE_CHECKING, Union, Tuple
 
 import pyglet
 from pyglet.window import Window as PygletWindow
 
 from .units import Unit, parse_height, parse_width
-from ..core.keys import wait_key
-from ..core.time import wait
+from ..core.collector import get_gc_controller
+from ..core.input import x_event_time
+from ..core.keys import wait_key, wait_key_async, wait_keys
+from ..core.time import wait, wait_async
 from ..utils import Color
 
 if TYPE_CHECKING:
     from ..types import ColorType, UnitType, Literal, KeyEvent
+    from ..core.keys import KeyFilter
     from ..core.time import Clock
 
 __all__ = ["Window", "get_window"]
 
+# KeyPress, KeyRelease, ButtonPress and ButtonRelease types of the X protocol
+X_TIMED_EVENTS = (2, 3, 4, 5)
+
 
 def get_window() -> "Window":
     """
@@ -89,6 +95,16 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
         The current unit system used to convert between different coordinate and size units.
     background_color : Optional[ColorType]
         The background color of the window, stored as an RGBA tuple.
+    input_queue : Optional[InputQueue]
+        The `InputQueue` timestamping the input events of the window, if one is attached.
+    keyboard : Optional[Keyboard]
+        The `Keyboard` recording the key events of the window, if one is attached.
+    input_devices : List[EvdevKeyboard]
+        Input devices read outside of the display server, whose events are dispatched with
+        the events of the window.
+    native_event_time : Optional[float]
+        While the handlers of a key or mouse button event run, the time at which the platform
+        generated the event in the timebase of `get_time` (X11 only), or None.
 
     Examples
     --------
@@ -161,6 +177,10 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
             **kwargs,
         )
 
+        self.input_queue = None
+        self.keyboard = None
+        self.native_event_time = None
+        self.input_devices = []
         self.distance = distance
         self.inches = inches
         self.clear_after_flip = clear_after_flip
@@ -245,10 +265,39 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
         # Convert DPI to pixels per centimeter
         return dpi
 
+    def dispatch_events(self) -> None:
+        """Dispatch the pending events of the window and of its `input_devices`."""
+        super().dispatch_events()
+        for device in self.input_devices:
+            device.dispatch()
+
+    def dispatch_platform_event(self, e) -> None:
+        """Dispatch an X11 event of the window, exposing its time in `native_event_time`."""
+        self._dispatch_timed(super().dispatch_platform_event, e)
+
+    def dispatch_platform_event_view(self, e) -> None:
+        """Dispatch an X11 event of the view, exposing its time in `native_event_time`."""
+        self._dispatch_timed(super().dispatch_platform_event_view, e)
+
+    def _dispatch_timed(self, dispatch, e) -> None:
+        """Run the handlers of an X11 event with the server time of input events available."""
+        if e.type not in X_TIMED_EVENTS:
+            dispatch(e)
+            return
+        # The time field is at the same offset in the key and button event structures
+        self.native_event_time = x_event_time(e.xkey.time)
+        try:
+            dispatch(e)
+        finally:
+            self.native_event_time = None
+
     def flip(self, clear: Optional[bool] = None) -> "Window":
         """
         Flip the window's frame buffer and optionally clear the window after.
 
+        If garbage collection is deferred by a `GCController`, the pending collections that
+        fit in its `flip_budget` are run after the flip.
+
         Parameters
         ----------
         clear : Optional[bool], default=None
@@ -257,13 +306,22 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
         """
         super().flip()
 
+        if (controller := get_gc_controller()) is not None:
+            controller.collect_in_gap(controller.flip_budget)
+
         clear = clear if clear is not None else self.clear_after_flip
         if clear:
             self.clear()
 
         return self
 
-    def wait(self, duration: float = 1, sleep_interval: float = 0.8, hog_period: float = 0.02):
+    def wait(
+        self,
+        duration: float = 1,
+        sleep_interval: Optional[float] = None,
+        hog_period: Union[float, "Literal['auto']", None] = None,
+        hog_dispatch_interval: Optional[float] = None,
+    ):
         """
         Wait for a specified duration while dispatching window events.
 
@@ -271,22 +329,34 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
         ----------
         duration : float, default=1
             The duration to wait in seconds.
-        sleep_interval : float, default=0.8
-            The interval to sleep between event dispatches.
-        hog_period : float, default=0.02
+        sleep_interval : Optional[float], default=None
+            The interval to sleep between event dispatches. If None, the default of the
+            timing profile is used (0.8 seconds unless changed by `calibrate`).
+        hog_period : Union[float, Literal["auto"], None], default=None
             The period to hog the CPU at the end of the wait. This is do to
-            increase the accuracy of the wait time.
+            increase the accuracy of the wait time. If "auto", the period is adapted
+            to the measured sleep overshoot of the machine. If None, the default of the
+            timing profile is used (0.02 seconds unless changed by `calibrate`).
+        hog_dispatch_interval : Optional[float], default=None
+            If provided, events are also polled every `hog_dispatch_interval` seconds during
+            the hog period, so that input is timestamped as it arrives.
         """
-        wait(duration=duration, sleep_interval=sleep_interval, hog_period=hog_period)
+        wait(
+            duration=duration,
+            sleep_interval=sleep_interval,
+            hog_period=hog_period,
+            hog_dispatch_interval=hog_dispatch_interval,
+        )
 
     def wait_key(
         self,
-        keys: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
+        keys: Optional[Union[Iterable[Union[str, int]], str, int, "KeyFilter"]] = None,
         modifiers: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
         clock: Optional["Clock"] = None,
         max_wait: Optional[float] = None,
         event: "Literal['press', 'release']" = "press",
         clear_events: bool = True,
+        blocking: bool = False,
     ) -> "KeyEvent":
         """
         Wait for a specific key event (press or release) within the given time frame.
@@ -303,11 +373,12 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
 
         Parameters
         ----------
-        keys : Optional[Union[Iterable[Union[str, int]], str, int]]
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]]
             The keys to wait for. It can be one of the following:
             - A string representing the key's name (e.g., "SPACE", "A", etc.)
             - An integer representing the Pyglet key ID (e.g., `pyglet.window.key.SPACE`)
             - An iterable of strings or integers representing multiple keys.
+            - A `KeyFilter` compiled beforehand, in which case `modifiers` must be None.
             If no keys are provided (`keys=None`), the function will return on any key press
             or release event.
 
@@ -323,8 +394,8 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
 
         clock : Optional["Clock"]
             An optional clock object for measuring time. If not provided, the function
-            will use `time.time()` from the standard library. The clock object should have
-            a `.time()` method that returns the current time.
+            will use `get_time()`, the current time of the active clock source. The clock object
+            should have a `.time()` method that returns the current time.
 
         max_wait : Optional[float]
             The maximum amount of time to wait for the key event (in seconds). If this value
@@ -340,6 +411,10 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
             Whether to clear any pending events before waiting for the key event. This can be useful
             to avoid processing old events that occurred before calling this function.
 
+        blocking : bool, default False
+            If True, the process sleeps until the window has events instead of polling them in
+            a busy loop, which frees the CPU during long waits (see `psychos.core.wait_key`).
+
         Returns
         -------
         KeyEvent
@@ -350,7 +425,7 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
             the time of the event. If no modifiers were pressed, this will be an empty string.
             If modifiers are ignored (`modifiers=None`), this will also be empty.
             - `timestamp`: The timestamp when the key event occurred, using either the provided
-            clock or `time.time()`.
+            clock or `get_time()`.
             - `event`: A string representing whether the key event was a "press" or "release".
 
         Raises
@@ -381,4 +456,121 @@ class Window(PygletWindow):  # pylint: disable=abstract-method
             event=event,
             clear_events=clear_events,
             window=self,
+            blocking=blocking,
+        )
+
+    def wait_keys(
+        self,
+        keys: Optional[Union[Iterable[Union[str, int]], str, int, "KeyFilter"]] = None,
+        modifiers: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
+        until: Optional[float] = None,
+        max_wait: Optional[float] = None,
+        max_events: Optional[int] = None,
+        event: "Optional[Literal['press', 'release']]" = "press",
+        clear_events: bool = True,
+        blocking: bool = False,
+    ) -> List["KeyEvent"]:
+        """
+        Collect all the key events of a response window (e.g. sequence typing or tapping).
+
+        The events are recorded by the `keyboard` of the window, created on the first call and
+        kept installed afterwards, so no handler is installed per call and no event is missed
+        between calls. See `psychos.core.wait_keys` for the details.
+
+        Parameters
+        ----------
+        keys : Optional[Union[Iterable[Union[str, int]], str, int, KeyFilter]]
+            The keys to collect (see `wait_key`). If None, all keys are collected.
+        modifiers : Optional[Union[Iterable[Union[str, int]], str, int]]
+            The modifiers that must be held (see `wait_key`).
+        until : Optional[float], default=None
+            The end of the response window, as a time of the active clock source (see
+            `get_time`).
+        max_wait : Optional[float], default=None
+            The duration of the response window in seconds. If both `until` and `max_wait` are
+            given, the earliest end is used.
+        max_events : Optional[int], default=None
+            The number of matching events after which to return.
+        event : Optional[Literal["press", "release"]], default="press"
+            The type of events to collect. If None, both presses and releases are collected.
+        clear_events : bool, default=True
+            Whether to discard the events recorded before the call.
+        blocking : bool, default=False
+            If True, the process sleeps until the window has events instead of polling them
+            in a busy loop.
+
+        Returns
+        -------
+        List[KeyEvent]
+            The matching events in order of arrival.
+
+        Example
+        -------
+        >>> taps = window.wait_keys(keys="SPACE", until=block_start + 30)
+        >>> typed = window.wait_keys(max_events=4, max_wait=5)
+        """
+        return wait_keys(
+            keys=keys,
+            modifiers=modifiers,
+            until=until,
+            max_wait=max_wait,
+            max_events=max_events,
+            event=event,
+            clear_events=clear_events,
+            window=self,
+            blocking=blocking,
+        )
+
+    async def wait_async(
+        self,
+        duration: float = 1,
+        dispatch_interval: float = 0.005,
+        hog_period: Union[float, "Literal['auto']", None] = None,
+    ):
+        """
+        Asynchronous version of `wait`, letting other coroutines run while waiting.
+
+        Parameters
+        ----------
+        duration : float, default=1
+            The duration to wait in seconds.
+        dispatch_interval : float, default=0.005
+            The maximum time in seconds between two event dispatches.
+        hog_period : Union[float, Literal["auto"], None], default=None
+            The period to hog the CPU at the end of the wait. If None, the default of the
+            timing profile is used.
+        """
+        await wait_async(
+            duration=duration, dispatch_interval=dispatch_interval, hog_period=hog_period
+        )
+
+    async def wait_key_async(
+        self,
+        keys: Optional[Union[Iterable[Union[str, int]], str, int, "KeyFilter"]] = None,
+        modifiers: Optional[Union[Iterable[Union[str, int]], str, int]] = None,
+        clock: Optional["Clock"] = None,
+        max_wait: Optional[float] = None,
+        event: "Literal['press', 'release']" = "press",
+        clear_events: bool = True,
+        dispatch_interval: float = 0.001,
+    ) -> "KeyEvent":
+        """
+        Asynchronous version of `wait_key`, letting other coroutines run while waiting.
+
+        The window events are dispatched every `dispatch_interval` seconds, which bounds the
+        resolution of the returned timestamp. See `wait_key` for the other parameters.
+
+        Example
+        -------
+        >>> key_event = await window.wait_key_async(keys="SPACE", max_wait=5)
+        """
+        return await wait_key_async(
+            keys=keys,
+            modifiers=modifiers,
+            clock=clock,
+            max_wait=max_wait,
+            event=event,
+            clear_events=clear_events,
+            window=self,
+            dispatch_interval=dispatch_interval,
         )
@@ -0,0 +1,68 @@
+"""Unit tests for the 'psychos.core.calibration' module related to timing profiles."""
+
+import json
+
+import pytest
+
+from psychos.core import calibrate, load_profile, apply_profile, get_profile_path
+from psychos.core import get_sleep_calibrator, virtual_time
+from psychos.core import calibration
+
+
+@pytest.fixture(autouse=True)
+def isolated_profile(monkeypatch, tmp_path):
+    """Store profiles in a temporary directory and restore the timing defaults."""
+    monkeypatch.setenv("PSYCHOS_CACHE_DIR", str(tmp_path))
+    defaults = dict(calibration.TIMING_DEFAULTS)
+    yield tmp_path
+    calibration.TIMING_DEFAULTS.update(defaults)
+    get_sleep_calibrator().reset()
+
+
+def test_profile_path_uses_cache_dir(isolated_profile):
+    path = get_profile_path()
+    assert path.parent == isolated_profile
+    assert path.name.startswith("timing-") and path.suffix == ".json"
+
+
+def test_calibrate_measures_and_saves():
+    profile = calibrate(samples=20, apply=False)
+    assert profile["clock_resolution"] > 0
+    assert profile["sleep_overshoot"]["p99"] >= profile["sleep_overshoot"]["p50"] >= 0
+    assert profile["hog_period"] > 0
+    assert profile["dispatch_cost"] is None and profile["flip_interval"] is None
+    assert load_profile() == json.loads(json.dumps(profile))
+
+
+def test_calibrate_rejects_virtual_time():
+    with virtual_time():
+        with pytest.raises(RuntimeError):
+            calibrate(samples=5, save=False, apply=False)
+
+
+def test_apply_profile_sets_defaults():
+    profile = calibrate(samples=20, save=False, apply=False)
+    profile["hog_period"] = 0.0042
+    apply_profile(profile)
+    assert calibration.TIMING_DEFAULTS["hog_period"] == 0.0042
+    assert calibration.TIMING_DEFAULTS["sleep_interval"] == 0.8
+    assert len(get_sleep_calibrator()) == 20
+
+
+def test_load_profile_missing_or_invalid(isolated_profile):
+    assert load_profile() is None
+    path = isolated_profile / "invalid.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert load_profile(path) is None
+    path.write_text(json.dumps({"version": -1}), encoding="utf-8")
+    assert load_profile(path) is None
+
+
+def test_get_timing_defaults_loads_profile(monkeypatch):
+    profile = calibrate(samples=20, apply=False)
+    monkeypatch.setattr(calibration, "_profile_loaded", False)
+    assert calibration.get_timing_defaults()["hog_period"] == pytest.approx(profile["hog_period"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
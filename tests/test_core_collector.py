@@ -0,0 +1,82 @@
+import gc
+
+import pytest
+
+from psychos.core import GCController, Interval, get_gc_controller
+
+
+@pytest.fixture
+def controller():
+    controller = GCController()
+    yield controller
+    controller.close()
+
+
+def test_suspended_disables_and_restores(controller):
+    assert gc.isenabled()
+    with controller.suspended():
+        assert not gc.isenabled()
+        assert controller.is_suspended
+        assert get_gc_controller() is controller
+        assert gc.get_freeze_count() > 0
+    assert gc.isenabled()
+    assert not controller.is_suspended
+    assert get_gc_controller() is None
+    assert gc.get_freeze_count() == 0
+
+
+def test_resume_keeps_objects_frozen_by_the_application(controller):
+    gc.freeze()
+    try:
+        frozen = gc.get_freeze_count()
+        with controller.suspended():
+            assert gc.get_freeze_count() >= frozen
+        assert gc.get_freeze_count() >= frozen
+    finally:
+        gc.unfreeze()
+
+
+def test_pauses_are_recorded(controller):
+    controller.collect(0)
+    controller.collect(2)
+    pauses = controller.get_pauses()
+    assert [pause["generation"] for pause in pauses[-2:]] == [0, 2]
+    assert all(pause["duration"] >= 0 for pause in pauses)
+    assert controller.estimate(2) >= pauses[-1]["duration"]
+
+
+def test_collect_in_gap_runs_deferred_collection(controller):
+    threshold = gc.get_threshold()
+    gc.set_threshold(10, threshold[1], threshold[2])
+    try:
+        with controller.suspended():
+            garbage = [[] for _ in range(100)]
+            del garbage
+            assert controller.pending_generation() is not None
+            assert controller.collect_in_gap(budget=0.0) is None
+            assert controller.collect_in_gap() is not None
+            assert gc.get_count()[0] <= 10
+    finally:
+        gc.set_threshold(*threshold)
+
+
+def test_interval_collects_in_gap(controller):
+    threshold = gc.get_threshold()
+    gc.set_threshold(10, threshold[1], threshold[2])
+    try:
+        with controller.suspended():
+            with Interval(0.05):
+                garbage = [[] for _ in range(100)]
+                del garbage
+                recorded = controller.pauses.total
+            assert controller.pauses.total > recorded
+    finally:
+        gc.set_threshold(*threshold)
+
+
+def test_close_removes_callback():
+    controller = GCController()
+    controller.suspend()
+    controller.close()
+    assert gc.isenabled()
+    assert controller._on_collection not in gc.callbacks
@@ -0,0 +1,73 @@
+"""Unit tests for the epoch shared between processes in 'psychos.core.epoch'."""
+
+import multiprocessing
+import pickle
+from multiprocessing import resource_tracker
+
+import pytest
+
+from psychos.core import SharedEpoch, get_clock_source, get_time, set_clock_source, wait
+from psychos.core import epoch as epoch_module
+
+
+def child_times(epoch, queue):
+    """Report the clock time of a child process together with its raw timestamp."""
+    clock = epoch.clock()
+    queue.put((get_time(), clock.time(), type(get_clock_source()).__name__))
+    epoch.close()
+
+
+def test_shared_epoch_in_child_process():
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    with SharedEpoch() as epoch:
+        wait(0.01)
+        process = context.Process(target=child_times, args=(epoch, queue))
+        process.start()
+        raw, elapsed, source_name = queue.get(timeout=60)
+        process.join(timeout=60)
+        assert process.exitcode == 0
+        assert elapsed == pytest.approx(epoch.relative(raw), abs=1e-3)
+        assert 0.01 <= elapsed < get_time() - epoch.epoch
+        assert source_name == "PerfCounterSource"
+
+
+def test_attach_and_set():
+    with SharedEpoch(epoch=5.0) as epoch:
+        attached = pickle.loads(pickle.dumps(epoch))
+        assert attached.name == epoch.name
+        assert attached.epoch == 5.0
+        epoch.set(7.5)
+        assert attached.epoch == 7.5
+        assert attached.clock().time() == pytest.approx(get_time() - 7.5, abs=0.01)
+        attached.close()
+
+
+def test_attach_adopts_clock_source():
+    previous = get_clock_source()
+    set_clock_source("monotonic")
+    try:
+        epoch = SharedEpoch()
+        set_clock_source("perf_counter")
+        with pytest.warns(RuntimeWarning):
+            SharedEpoch.attach(epoch.name, adopt_source=False).close()
+        SharedEpoch.attach(epoch.name).close()
+        assert type(get_clock_source()).__name__ == "MonotonicSource"
+        epoch.close()
+    finally:
+        set_clock_source(previous)
+
+
+def test_virtual_source_warns():
+    previous = get_clock_source()
+    set_clock_source("virtual")
+    try:
+        with pytest.warns(RuntimeWarning):
+            SharedEpoch().close()
+    finally:
+        set_clock_source(previous)
+
+
+def test_resource_tracker_check_without_private_attribute(monkeypatch):
+    monkeypatch.delattr(resource_tracker, "_resource_tracker")
+    assert not epoch_module._has_resource_tracker()
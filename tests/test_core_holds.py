@@ -0,0 +1,85 @@
+"""Tests for the psychos.core.holds module."""
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from psychos.core import HoldRecorder, KeyFilter, virtual_time, wait
+
+
+class FakeWindow(EventDispatcher):
+    """Window replacement whose events are dispatched directly by the tests."""
+
+    def dispatch_events(self):
+        pass
+
+
+FakeWindow.register_event_type("on_key_press")
+FakeWindow.register_event_type("on_key_release")
+
+
+def tap(window, symbol, duration, modifiers=0):
+    window.dispatch_event("on_key_press", symbol, modifiers)
+    wait(duration)
+    window.dispatch_event("on_key_release", symbol, modifiers)
+
+
+def test_hold_recorder_pairs_presses_and_releases():
+    with virtual_time():
+        window = FakeWindow()
+        recorder = HoldRecorder(window)
+        tap(window, key.A, 0.1)
+        window.dispatch_event("on_key_press", key.SPACE, key.MOD_SHIFT)
+        window.dispatch_event("on_key_press", key.SPACE, key.MOD_SHIFT)  # Auto-repeat
+        wait(0.5)
+        assert list(recorder.held) == ["SPACE"]
+        window.dispatch_event("on_key_release", key.SPACE, 0)
+        window.dispatch_event("on_key_release", key.B, 0)  # Never pressed
+
+        assert len(recorder) == 2
+        columns = recorder.columns()
+        assert recorder.key_names(columns["key"]) == ["A", "SPACE"]
+        assert list(columns["t_down"]) == pytest.approx([0.0, 0.1])
+        assert list(columns["t_up"]) == pytest.approx([0.1, 0.6])
+        assert list(columns["modifiers"]) == [0, key.MOD_SHIFT]
+        assert list(columns["duration"]) == pytest.approx([0.1, 0.5])
+        assert recorder.held == {}
+
+
+def test_hold_recorder_select():
+    with virtual_time():
+        window = FakeWindow()
+        recorder = HoldRecorder(window, keys=["A", "B"], capacity=2)
+        for index in range(6):
+            tap(window, key.A if index % 2 else key.B, 0.1 * (index + 1))
+        tap(window, key.C, 1.0)  # Not recorded
+
+        assert len(recorder) == 6
+        long_holds = recorder.select(min_duration=0.25)
+        assert list(long_holds["duration"]) == pytest.approx([0.3, 0.4, 0.5, 0.6])
+        assert recorder.key_names(long_holds["key"]) == ["B", "A", "B", "A"]
+        assert list(recorder.durations(keys="a")) == pytest.approx([0.2, 0.4, 0.6])
+        selected = recorder.select(max_duration=0.35, since=0.05)
+        assert list(selected["duration"]) == pytest.approx([0.2, 0.3])
+        assert len(recorder.select(min_duration=2)["t_down"]) == 0
+
+        recorder.clear()
+        assert len(recorder) == 0
+        recorder.close()
+        tap(window, key.A, 0.1)
+        assert len(recorder) == 0
+
+
+def test_hold_recorder_filter_modifiers(tmp_path):
+    with virtual_time():
+        window = FakeWindow()
+        recorder = HoldRecorder(window, keys=KeyFilter(modifiers="CTRL"))
+        tap(window, key.A, 0.1)
+        tap(window, key.B, 0.2, key.MOD_CTRL)
+        assert recorder.key_names(recorder.columns()["key"]) == ["B"]
+
+        path = tmp_path / "holds.csv"
+        recorder.to_csv(path)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "key,t_down,t_up,modifiers"
+        assert len(lines) == 2
@@ -0,0 +1,115 @@
+"""Tests for the psychos.core.injection module."""
+
+from collections import deque
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from psychos.core import (
+    InputInjector,
+    InputQueue,
+    Keyboard,
+    get_time,
+    measure_input_latency,
+    virtual_time,
+    wait_key,
+)
+
+
+class QueueWindow(EventDispatcher):
+    """Window replacement with the pending event queue of Pyglet windows."""
+
+    def __init__(self):
+        self._event_queue = deque()
+
+    def dispatch_events(self):
+        while self._event_queue:
+            self.dispatch_event(*self._event_queue.popleft())
+
+
+QueueWindow.register_event_type("on_key_press")
+QueueWindow.register_event_type("on_key_release")
+QueueWindow.register_event_type("on_mouse_press")
+QueueWindow.register_event_type("on_mouse_release")
+
+
+def test_inject_queues_events():
+    window = QueueWindow()
+    queue = InputQueue(window)
+    injector = InputInjector(window)
+    injected = injector.inject("key_press", "F", "CTRL")
+    injector.inject("mouse_press", 1, x=10, y=20)
+    assert len(window._event_queue) == 2  # pylint: disable=protected-access
+
+    window.dispatch_events()
+    events = queue.get_events()
+    assert [(event.kind, event.code) for event in events] == [
+        ("key_press", key.F),
+        ("mouse_press", 1),
+    ]
+    assert events[0].modifiers == key.MOD_CTRL
+    assert (events[1].x, events[1].y) == (10, 20)
+    assert injector.log.column("injected")[0] == injected
+    assert list(injector.log.column("code")) == [key.F, 1]
+
+
+def test_play_injects_at_scheduled_times():
+    window = QueueWindow()
+    injector = InputInjector(window)
+    start = get_time()
+    injector.play([(0.05, "key_press", "J"), (0.02, "key_press", "F")], start=start)
+    assert injector.is_playing
+    first = wait_key(window=window, max_wait=1)
+    second = wait_key(window=window, max_wait=1)
+    injector.join()
+    assert (first.key, second.key) == ("F", "J")
+
+    intended, injected = injector.log.column("intended"), injector.log.column("injected")
+    assert list(intended) == pytest.approx([start + 0.02, start + 0.05])
+    # The injection thread competes for the GIL with the polling loop
+    assert all(0 <= sent - planned < 0.02 for planned, sent in zip(intended, injected))
+    assert 0 <= first.timestamp - injected[0] < 0.01
+
+
+def test_stop_cancels_pending_events():
+    window = QueueWindow()
+    injector = InputInjector(window)
+    injector.play([(0.0, "key_press", "A"), (10.0, "key_press", "B")])
+    wait_key(window=window, max_wait=1)
+    injector.stop()
+    assert not injector.is_playing
+    assert len(injector.log) == 1
+
+
+def test_measure_input_latency():
+    window = QueueWindow()
+    result = measure_input_latency(window, trials=5, interval=0.03)
+    assert result["trials"] == 5 and result["missed"] == 0
+    assert 0 <= result["latency"]["p50"] < 0.01
+    assert 0 <= result["handler_latency"]["max"] <= result["latency"]["max"]
+    assert result["cpu_fraction"] > 0.5  # Busy polling
+    assert len(result["records"]["returned"]) == 5
+
+    keyboard = Keyboard(window)
+    result = measure_input_latency(
+        window, lambda: keyboard.wait_keys(max_wait=0.06), trials=3, interval=0.03
+    )
+    assert result["missed"] == 0
+    assert result["handler_latency"]["max"] < 0.01
+
+
+def test_measure_input_latency_missed_trials():
+    window = QueueWindow()
+    result = measure_input_latency(
+        window, lambda: wait_key(window=window, max_wait=0.001), trials=2, interval=0.02
+    )
+    assert result["missed"] == 2
+    assert result["latency"] is None
+
+
+def test_injector_invalid_arguments():
+    with pytest.raises(ValueError, match="backend"):
+        InputInjector(QueueWindow(), backend="uinput")
+    with virtual_time(), pytest.raises(TypeError, match="ScriptedInput"):
+        InputInjector(QueueWindow())
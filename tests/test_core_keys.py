@@ -0,0 +1,530 @@
+"""Unit tests for the 'psychos.core.keys' module related to keyboard input."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from psychos.core import (
+    Clock,
+    InputQueue,
+    KeyFilter,
+    Keyboard,
+    ScriptedInput,
+    get_time,
+    virtual_time,
+    wait,
+    wait_key,
+    wait_key_async,
+    wait_keys,
+)
+from psychos.core.input import x_event_time
+
+
+class FakeWindow(EventDispatcher):
+    """Window replacement dispatching scripted key events at given delays."""
+
+    def __init__(self, events=(), native=False):
+        self.start_time = get_time()
+        self.events = sorted(events)
+        self.native = native
+        self.native_event_time = None
+
+    def schedule(self, delay, event_type, *args):
+        self.events.append((delay, event_type, *args))
+        self.events.sort()
+
+    def dispatch_events(self):
+        elapsed = get_time() - self.start_time
+        while self.events and self.events[0][0] <= elapsed:
+            delay, event_type, *args = self.events.pop(0)
+            # With `native`, events are "generated" by the platform at their scheduled delay
+            self.native_event_time = self.start_time + delay if self.native else None
+            self.dispatch_event(event_type, *args)
+            self.native_event_time = None
+
+
+FakeWindow.register_event_type("on_key_press")
+FakeWindow.register_event_type("on_key_release")
+FakeWindow.register_event_type("on_mouse_press")
+FakeWindow.register_event_type("on_mouse_release")
+
+
+def test_wait_key_any_key():
+    window = FakeWindow([(0.05, "on_key_press", key.A, 0)])
+    event = wait_key(window=window, max_wait=1)
+    assert event.key == "A"
+    assert event.event == "press"
+
+
+def test_wait_key_filters_keys():
+    window = FakeWindow(
+        [(0.01, "on_key_press", key.A, 0), (0.05, "on_key_press", key.SPACE, 0)]
+    )
+    event = wait_key(keys=["space"], window=window, max_wait=1)
+    assert event.key == "SPACE"
+
+
+def test_wait_key_release_event():
+    window = FakeWindow(
+        [(0.01, "on_key_press", key.A, 0), (0.02, "on_key_release", key.A, 0)]
+    )
+    event = wait_key(event="release", window=window, max_wait=1)
+    assert event.key == "A"
+    assert event.event == "release"
+
+
+def test_wait_key_modifiers():
+    window = FakeWindow(
+        [
+            (0.01, "on_key_press", key.A, 0),
+            (0.02, "on_key_press", key.A, key.MOD_CTRL | key.MOD_SHIFT),
+        ]
+    )
+    event = wait_key(keys="A", modifiers="CTRL", window=window, max_wait=1)
+    assert event.modifiers == "SHIFT|CTRL"
+
+
+def test_wait_key_multiple_modifiers():
+    window = FakeWindow(
+        [
+            (0.01, "on_key_press", key.A, key.MOD_CTRL),
+            (0.02, "on_key_press", key.B, key.MOD_CTRL | key.MOD_SHIFT),
+        ]
+    )
+    event = wait_key(modifiers=["ctrl", "shift"], window=window, max_wait=1)
+    assert event.key == "B"
+    assert event.code == key.B
+
+
+def test_wait_key_no_modifiers():
+    window = FakeWindow(
+        [
+            (0.01, "on_key_press", key.A, key.MOD_SHIFT),
+            (0.02, "on_key_press", key.B, key.MOD_NUMLOCK),
+        ]
+    )
+    event = wait_key(modifiers=[], window=window, max_wait=1)
+    assert event.key == "B"
+    assert event.modifiers == "NUMLOCK"
+
+
+def test_key_filter():
+    key_filter = KeyFilter(keys=["f", key.J], modifiers="CTRL")
+    assert key_filter.keys == {key.F, key.J}
+    assert key_filter.matches(key.F, key.MOD_CTRL | key.MOD_SHIFT)
+    assert not key_filter.matches(key.F, key.MOD_SHIFT)
+    assert not key_filter.matches(key.A, key.MOD_CTRL)
+    assert KeyFilter().matches(key.A, key.MOD_ALT)
+    assert not KeyFilter(modifiers=[]).matches(key.A, key.MOD_ALT)
+    assert KeyFilter(modifiers=[]).matches(key.A, key.MOD_CAPSLOCK)
+    assert KeyFilter.create(key_filter) is key_filter
+    with pytest.raises(ValueError, match="Modifiers cannot"):
+        KeyFilter.create(key_filter, modifiers="SHIFT")
+    with pytest.raises(ValueError, match="Invalid key 'NOPE'"):
+        KeyFilter(keys=["A", "NOPE"])
+    with pytest.raises(ValueError, match="Invalid modifier"):
+        KeyFilter(modifiers="HYPER")
+
+
+def test_empty_keys_match_any_key():
+    assert "keys=None" in repr(KeyFilter(keys=[]))
+    assert KeyFilter(keys=()).matches(key.A, 0)
+    window = FakeWindow([(0.01, "on_key_press", key.A, 0)])
+    assert wait_key(keys=[], window=window, max_wait=1).key == "A"
+
+
+def test_wait_key_with_key_filter():
+    key_filter = KeyFilter(keys="J", modifiers=[])
+    window = FakeWindow(
+        [
+            (0.01, "on_key_press", key.F, 0),
+            (0.02, "on_key_press", key.J, key.MOD_ALT),
+            (0.03, "on_key_press", key.J, 0),
+        ]
+    )
+    start_time = window.start_time
+    event = wait_key(keys=key_filter, window=window, max_wait=1)
+    assert event.key == "J" and event.modifiers is None
+    assert event.timestamp - start_time >= 0.03
+
+    keyboard = Keyboard(FakeWindow())
+    keyboard.window.dispatch_event("on_key_press", key.J, key.MOD_ALT)
+    keyboard.window.dispatch_event("on_key_press", key.J, 0)
+    assert [event.modifiers for event in keyboard.get_keys(keys=key_filter)] == [None]
+
+
+def test_wait_key_timeout():
+    window = FakeWindow()
+    start_time = get_time()
+    event = wait_key(window=window, max_wait=0.1)
+    assert event.key is None
+    assert 0.1 <= event.timestamp - start_time < 0.2
+
+
+def test_wait_key_removes_handlers():
+    window = FakeWindow([(0.01, "on_key_press", key.A, 0)])
+    wait_key(window=window, max_wait=1)
+    assert not window._event_stack  # pylint: disable=protected-access
+
+
+def test_wait_key_timestamps_at_handler_time():
+    window = FakeWindow([(0.01, "on_key_press", key.A, 0)])
+    # A slow handler running after the listener in the same dispatch
+    window.push_handlers(on_key_press=lambda symbol, modifiers: time.sleep(0.05))
+    event = wait_key(window=window, max_wait=1)
+    assert 0.01 <= event.timestamp - window.start_time < 0.04
+    assert event.native_timestamp is None and event.latency is None
+
+
+def test_wait_key_native_timestamp():
+    window = FakeWindow([(0.02, "on_key_press", key.A, 0)], native=True)
+    event = wait_key(window=window, max_wait=1)
+    assert event.native_timestamp == pytest.approx(window.start_time + 0.02)
+    assert event.latency == pytest.approx(event.timestamp - event.native_timestamp)
+    assert 0 <= event.latency < 0.02
+
+    clock = Clock()
+    window = FakeWindow([(0.02, "on_key_press", key.A, 0)], native=True)
+    event = wait_key(window=window, max_wait=1, clock=clock)
+    expected = window.start_time + 0.02 - clock.start_time
+    assert event.native_timestamp == pytest.approx(expected, abs=1e-4)
+    assert event.timestamp - event.native_timestamp == pytest.approx(event.latency)
+
+
+def test_wait_key_formatted_clock():
+    clock = Clock(fmt="%H:%M:%S")
+    window = FakeWindow([(0.02, "on_key_press", key.A, 0)], native=True)
+    event = wait_key(window=window, max_wait=1, clock=clock)
+    assert isinstance(event.timestamp, str) and len(event.timestamp.split(":")) == 3
+    assert isinstance(event.native_timestamp, str)
+
+    clock = Clock(fmt=lambda elapsed: round(elapsed * 1000))
+    window = FakeWindow([(0.02, "on_key_press", key.A, 0)])
+    event = wait_key(window=window, max_wait=1, clock=clock)
+    assert event.timestamp == pytest.approx(
+        (window.start_time + 0.02 - clock.start_time) * 1000, abs=10
+    )
+    assert wait_key(window=window, max_wait=0.01, clock=clock).key is None
+
+
+def test_x_event_time():
+    now = get_time()
+    server_time = int(time.monotonic() * 1000) - 20
+    assert x_event_time(server_time) == pytest.approx(now - 0.02, abs=0.002)
+    # The server time wraps around at 32 bits
+    wrapped = x_event_time(server_time % 2**32 + 2**32 * 3)
+    assert wrapped == pytest.approx(now - 0.02, abs=0.002)
+    # Times in the future or too old do not come from the monotonic clock
+    assert x_event_time(server_time + 10_000) is None
+    assert x_event_time(server_time - 10_000) is None
+
+
+def test_wait_key_async():
+    async def main():
+        window = FakeWindow([(0.05, "on_key_press", key.B, 0)])
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        event, _ = await asyncio.gather(wait_key_async(window=window, max_wait=1), ticker())
+        return event, ticks
+
+    event, ticks = asyncio.run(main())
+    assert event.key == "B"
+    assert ticks == 5
+
+
+def test_input_queue_records_events():
+    window = FakeWindow()
+    queue = InputQueue(window)
+    window.dispatch_event("on_key_press", key.A, key.MOD_SHIFT)
+    window.dispatch_event("on_mouse_press", 10, 20, 1, 0)
+    assert len(queue) == 2
+    events = queue.get_events()
+    assert [event.kind for event in events] == ["key_press", "mouse_press"]
+    assert events[0].code == key.A and events[0].modifiers == key.MOD_SHIFT
+    assert (events[1].x, events[1].y) == (10, 20)
+    assert len(queue) == 0
+    queue.close()
+    assert window.input_queue is None
+
+
+def test_wait_key_reads_input_queue():
+    window = FakeWindow()
+    queue = InputQueue(window)
+    window.dispatch_event("on_key_press", key.B, 0)
+    window.dispatch_event("on_key_press", key.SPACE, 0)
+    dispatch_time = queue.get_events(consume=False)[1].timestamp
+    window.dispatch_event("on_key_press", key.C, 0)
+
+    event = wait_key(keys="SPACE", clear_events=False, window=window, max_wait=0.1)
+    assert event.key == "SPACE"
+    assert event.timestamp == dispatch_time
+    assert [event.code for event in queue.get_events()] == [key.C]
+
+
+def test_wait_key_clears_input_queue():
+    window = FakeWindow([(0.01, "on_key_press", key.A, 0)])
+    queue = InputQueue(window)
+    window.dispatch_event("on_key_press", key.SPACE, 0)
+    event = wait_key(window=window, max_wait=1)
+    assert event.key == "A"
+    assert len(queue) == 0
+
+
+def test_input_queue_pop_and_clear_kinds():
+    window = FakeWindow()
+    queue = InputQueue(window)
+    window.dispatch_event("on_mouse_press", 1, 2, 1, 0)
+    window.dispatch_event("on_key_press", key.A, 0)
+    window.dispatch_event("on_mouse_press", 3, 4, 1, 0)
+    window.dispatch_event("on_key_press", key.B, 0)
+    queue.pop(2, kinds=["key_press", "key_release"])
+    assert [event.code for event in queue.get_events(consume=False)] == [1, 1, key.B]
+    queue.clear(kinds=["mouse_press"])
+    assert [event.code for event in queue.get_events(consume=False)] == [key.B]
+    assert len(queue) == 1
+    queue.clear()
+    assert len(queue) == 0
+
+
+def test_wait_key_leaves_other_events_queued():
+    window = FakeWindow(
+        [
+            (0.01, "on_key_press", key.A, 0),
+            (0.01, "on_key_press", key.B, 0),
+            (0.01, "on_mouse_press", 5, 6, 1, 0),
+        ]
+    )
+    queue = InputQueue(window)
+    window.dispatch_event("on_mouse_press", 1, 2, 1, 0)
+    window.dispatch_event("on_key_press", key.C, 0)
+    event = wait_key(keys="A", window=window, max_wait=1)
+    assert event.key == "A"
+    # Key events up to the match are consumed, later key events and mouse events stay
+    pending = [(event.kind, event.code, event.x) for event in queue.get_events()]
+    assert pending == [("mouse_press", 1, 1), ("key_press", key.B, 0), ("mouse_press", 1, 5)]
+
+
+def test_wait_keys_keeps_mouse_events_queued():
+    window = FakeWindow([(0.01, "on_key_press", key.F, 0), (0.01, "on_mouse_press", 3, 4, 1, 0)])
+    queue = InputQueue(window)
+    window.dispatch_event("on_mouse_press", 1, 2, 1, 0)
+    window.dispatch_event("on_key_press", key.J, 0)
+    events = wait_keys(keys="F", max_events=1, max_wait=1, window=window)
+    assert [event.key for event in events] == ["F"]
+    pending = [(event.kind, event.x) for event in queue.get_events()]
+    assert pending == [("mouse_press", 1), ("key_press", 0), ("mouse_press", 3)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+
+def test_keyboard_get_keys():
+    window = FakeWindow(
+        [
+            (0.0, "on_key_press", key.A, 0),
+            (0.001, "on_key_release", key.A, 0),
+            (0.002, "on_key_press", key.SPACE, key.MOD_SHIFT),
+        ]
+    )
+    keyboard = Keyboard(window)
+    assert window.keyboard is keyboard
+    while get_time() - window.start_time < 0.002:
+        pass
+
+    events = keyboard.get_keys(clear=False)
+    assert [event.key for event in events] == ["A", "SPACE"]
+    assert events[1].modifiers == "SHIFT"
+    assert [event.event for event in keyboard.get_keys(event=None, clear=False)] == [
+        "press",
+        "release",
+        "press",
+    ]
+    assert [event.key for event in keyboard.get_keys(modifiers="shift", clear=False)] == [
+        "SPACE"
+    ]
+    assert [event.key for event in keyboard.get_keys(keys="a")] == ["A"]
+    assert keyboard.get_keys() == []
+    keyboard.close()
+    assert window.keyboard is None
+
+
+def test_keyboard_records_between_calls():
+    window = FakeWindow()
+    keyboard = Keyboard(window, capacity=4)
+    for index in range(6):
+        window.dispatch_event("on_key_press", key.A + index, 0)
+    assert len(keyboard) == 4
+    assert [event.key for event in keyboard.get_keys()] == ["C", "D", "E", "F"]
+
+
+def test_keyboard_wait_keys():
+    window = FakeWindow([(0.0, "on_key_press", key.A, 0), (0.05, "on_key_press", key.J, 0)])
+    keyboard = Keyboard(window)
+    events = keyboard.wait_keys(keys=["f", "j"], max_wait=1)
+    assert [event.key for event in events] == ["J"]
+    assert 0.05 <= events[0].timestamp - window.start_time < 0.1
+    assert keyboard.wait_keys(max_wait=0.02) == []
+
+
+def test_keyboard_native_timestamps():
+    window = FakeWindow(
+        [(0.0, "on_key_press", key.A, 0), (0.01, "on_key_press", key.B, 0)], native=True
+    )
+    keyboard = Keyboard(window)
+    window.dispatch_event("on_key_press", key.C, 0)  # Not generated by the platform
+    events = keyboard.wait_keys(keys=["a", "b", "c"], max_wait=1)
+    events += keyboard.wait_keys(keys="b", max_wait=1)
+    assert [event.key for event in events] == ["C", "A", "B"]
+    assert events[1].native_timestamp == pytest.approx(window.start_time)
+    assert events[1].latency == pytest.approx(events[1].timestamp - window.start_time)
+    assert events[0].native_timestamp is None and events[0].latency is None
+    assert events[2].native_timestamp == pytest.approx(window.start_time + 0.01)
+
+
+def test_keyboard_clear_discards_pending():
+    window = FakeWindow([(0.0, "on_key_press", key.A, 0)])
+    keyboard = Keyboard(window)
+    keyboard.clear()
+    assert len(keyboard) == 0
+    assert keyboard.get_keys() == []
+
+
+class PipeDisplay:
+    """Display replacement whose connection is a pipe that becomes readable on new events."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+
+    def fileno(self):
+        return self.read_fd
+
+    def poll(self):
+        return 0
+
+    def drain(self):
+        try:
+            os.read(self.read_fd, 1024)
+        except BlockingIOError:
+            pass
+
+
+class PipeWindow(EventDispatcher):
+    """Window receiving key events from another thread through a `PipeDisplay`."""
+
+    def __init__(self):
+        self.display = PipeDisplay()
+        self.pending = []
+        self.sent_times = []
+
+    def send(self, delay, *event):
+        def target():
+            time.sleep(delay)
+            self.pending.append(event)
+            self.sent_times.append(get_time())
+            os.write(self.display.write_fd, b"x")
+
+        threading.Thread(target=target, daemon=True).start()
+
+    def dispatch_events(self):
+        self.display.drain()
+        while self.pending:
+            self.dispatch_event(*self.pending.pop(0))
+
+
+PipeWindow.register_event_type("on_key_press")
+PipeWindow.register_event_type("on_key_release")
+
+
+def test_wait_key_blocking_sleeps_until_event():
+    window = PipeWindow()
+    window.send(0.2, "on_key_press", key.SPACE, 0)
+    cpu_start = time.process_time()
+    event = wait_key(window=window, max_wait=2, blocking=True)
+    cpu_time = time.process_time() - cpu_start
+    assert event.key == "SPACE"
+    assert cpu_time < 0.1  # A busy loop would use the full 0.2 seconds
+
+
+def test_wait_key_blocking_latency_and_timeout():
+    window = PipeWindow()
+    window.send(0.05, "on_key_press", key.A, 0)
+    event = wait_key(window=window, max_wait=1, blocking=True)
+    assert event.key == "A"
+    assert 0 <= event.timestamp - window.sent_times[0] < 0.01  # Wake-up latency
+
+    start = get_time()
+    event = wait_key(window=window, max_wait=0.1, blocking=True)
+    assert event.key is None
+    assert 0.1 <= get_time() - start < 0.15
+
+
+def test_keyboard_wait_keys_blocking():
+    window = PipeWindow()
+    keyboard = Keyboard(window)
+    window.send(0.05, "on_key_press", key.J, 0)
+    events = keyboard.wait_keys(max_wait=1, blocking=True)
+    assert [event.key for event in events] == ["J"]
+
+
+def test_wait_keys_collects_response_window():
+    window = FakeWindow()
+    with virtual_time():
+        ScriptedInput(
+            [
+                (0.1, "key_press", "F"),
+                (0.15, "key_release", "F"),
+                (0.2, "key_press", "J"),
+                (0.3, "key_press", "X"),
+                (0.4, "key_press", "F"),
+                (1.5, "key_press", "J"),  # After the response window
+            ],
+            window=window,
+        )
+        events = wait_keys(keys=["f", "j"], until=1.0, window=window)
+        assert get_time() == pytest.approx(1.0, abs=1e-6)
+        assert [event.key for event in events] == ["F", "J", "F"]
+        assert [event.timestamp for event in events] == pytest.approx([0.1, 0.2, 0.4])
+
+        keyboard = window.keyboard
+        assert wait_keys(max_events=1, window=window, clear_events=False)[0].timestamp == 1.5
+        assert window.keyboard is keyboard  # The handlers are installed once
+
+
+def test_wait_keys_max_events_keeps_later_events():
+    window = FakeWindow()
+    with virtual_time():
+        ScriptedInput(
+            [(0.1, "key_press", "1"), (0.1, "key_press", "2"), (0.1, "key_press", "3")],
+            window=window,
+        )
+        Keyboard(window)
+        wait(0.2)
+        events = wait_keys(max_events=2, max_wait=1, window=window, clear_events=False)
+        assert [event.key for event in events] == ["1", "2"]
+        assert get_time() == pytest.approx(0.2)
+        events = wait_keys(event=None, max_wait=1, window=window, clear_events=False)
+        assert [event.key for event in events] == ["3"]
+
+        with pytest.raises(ValueError, match="must be provided"):
+            wait_keys(window=window)
+
+
+def test_window_wait_keys_delegates():
+    from psychos.visual.window import Window  # pylint: disable=import-outside-toplevel
+
+    window = FakeWindow([(0.01, "on_key_press", key.A, 0), (0.02, "on_key_press", key.B, 0)])
+    events = Window.wait_keys(window, max_events=2, max_wait=1)
+    assert [event.key for event in events] == ["A", "B"]
@@ -0,0 +1,93 @@
+"""Tests for the psychos.core.mouse module."""
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import mouse
+
+from psychos.core import Mouse, virtual_time, wait
+from psychos.visual.units import NormalizedUnits
+
+
+class FakeWindow(EventDispatcher):
+    """Window replacement whose events are dispatched directly by the tests."""
+
+    width, height = 800, 600
+
+    def __init__(self):
+        self.coordinates = NormalizedUnits(self)
+
+    def dispatch_events(self):
+        pass
+
+
+for event_type in ("on_mouse_motion", "on_mouse_drag", "on_mouse_press", "on_mouse_release"):
+    FakeWindow.register_event_type(event_type)
+
+
+def test_mouse_records_trajectory():
+    with virtual_time():
+        window = FakeWindow()
+        recorder = Mouse(window)
+        window.dispatch_event("on_mouse_motion", 400, 300, 0, 0)
+        wait(0.002)
+        window.dispatch_event("on_mouse_press", 400, 300, mouse.LEFT, 0)
+        assert recorder.is_pressed("left")
+        wait(0.002)
+        window.dispatch_event("on_mouse_drag", 600, 150, 200, -150, mouse.LEFT, 0)
+        window.dispatch_event("on_mouse_release", 800, 0, mouse.LEFT, 0)
+
+        samples = recorder.get_samples(units=False)
+        assert list(samples["t"]) == pytest.approx([0.0, 0.002, 0.004, 0.004])
+        assert list(samples["x"]) == [400, 400, 600, 800]
+        assert list(samples["y"]) == [300, 300, 150, 0]
+        assert list(samples["buttons"]) == [0, mouse.LEFT, mouse.LEFT, 0]
+        assert not recorder.is_pressed(mouse.LEFT)
+
+        samples = recorder.get_samples(start=2)
+        assert list(samples["x"]) == pytest.approx([0.5, 1.0])
+        assert list(samples["y"]) == pytest.approx([0.5, 1.0])
+        assert recorder.position == pytest.approx((1.0, 1.0))
+
+
+def test_mouse_native_event_time():
+    window = FakeWindow()
+    recorder = Mouse(window)
+    window.native_event_time = 1.25  # Set by the window while it dispatches timed events
+    window.dispatch_event("on_mouse_press", 10, 20, mouse.LEFT, 0)
+    window.native_event_time = None
+    with virtual_time(start=3.0):
+        window.dispatch_event("on_mouse_motion", 15, 25, 5, 5)
+    assert list(recorder.get_samples()["t"]) == [1.25, 3.0]
+
+
+def test_mouse_ring_buffer_and_units():
+    window = FakeWindow()
+    recorder = Mouse(window, capacity=4, units="px")
+    for index in range(10):
+        window.dispatch_event("on_mouse_motion", index, 2 * index, 1, 2)
+    assert len(recorder) == 4
+    assert recorder.total == 10
+    samples = recorder.get_samples()
+    assert list(samples["x"]) == [6, 7, 8, 9]
+    assert list(samples["y"]) == [12, 14, 16, 18]
+
+    recorder.units = "%"
+    assert list(recorder.get_samples(start=9)["x"]) == pytest.approx([9 / 8])
+    with pytest.raises(ValueError, match="Invalid button"):
+        recorder.is_pressed("thumb")
+
+    recorder.close()
+    window.dispatch_event("on_mouse_motion", 100, 100, 0, 0)
+    assert recorder.total == 10
+
+
+def test_mouse_to_csv(tmp_path):
+    window = FakeWindow()
+    recorder = Mouse(window)
+    window.dispatch_event("on_mouse_press", 0, 600, mouse.RIGHT, 0)
+    path = tmp_path / "mouse.csv"
+    recorder.to_csv(path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "t,x,y,buttons"
+    _, x, y, buttons = lines[1].split(",")
+    assert (float(x), float(y), int(buttons)) == pytest.approx((-1.0, -1.0, mouse.RIGHT))
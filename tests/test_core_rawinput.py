@@ -0,0 +1,107 @@
+"""Tests for the psychos.core.rawinput module."""
+
+import os
+import sys
+import time
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from psychos.core import EvdevKeyboard, Keyboard, find_keyboards, get_time, wait_key
+from psychos.core.rawinput import EV_KEY, INPUT_EVENT
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="evdev keyboards are only available on Linux"
+)
+
+KEY_A, KEY_F, KEY_LEFTSHIFT, KEY_SPACE = 30, 33, 42, 57
+
+
+class DeviceWindow(EventDispatcher):
+    """Window replacement dispatching the events of its raw input devices."""
+
+    def __init__(self):
+        self.input_devices = []
+        self.native_event_time = None
+
+    def dispatch_events(self):
+        for device in self.input_devices:
+            device.dispatch()
+
+
+DeviceWindow.register_event_type("on_key_press")
+DeviceWindow.register_event_type("on_key_release")
+
+
+def record(code, value, age=0.0, kind=EV_KEY):
+    """Pack an input_event stamped `age` seconds ago on the monotonic clock."""
+    timestamp = time.monotonic() - age
+    seconds = int(timestamp)
+    return INPUT_EVENT.pack(seconds, int((timestamp - seconds) * 1e6), kind, code, value)
+
+
+@pytest.fixture(name="device")
+def fixture_device():
+    read_fd, write_fd = os.pipe()
+    window = DeviceWindow()
+    keyboard = EvdevKeyboard(read_fd, window=window)
+    yield window, keyboard, write_fd
+    keyboard.close()
+    os.close(write_fd)
+    os.close(read_fd)
+
+
+def test_evdev_keyboard_kernel_timestamps(device):
+    window, keyboard, write_fd = device
+    assert window.input_devices == [keyboard]
+    sent = get_time()
+    os.write(write_fd, record(KEY_F, 1, age=0.01) + record(KEY_F, 0))
+    event = wait_key(window=window, max_wait=1)
+    assert event.key == "F"
+    assert event.native_timestamp == pytest.approx(sent - 0.01, abs=0.005)
+    assert 0.01 <= event.latency < 0.1
+    assert event.timestamp - event.native_timestamp == pytest.approx(event.latency)
+
+
+def test_evdev_keyboard_modifiers_and_repeats(device):
+    window, _, write_fd = device
+    keyboard = Keyboard(window)
+    records = [
+        record(KEY_LEFTSHIFT, 1),
+        record(KEY_A, 1),
+        record(KEY_A, 2),  # Auto-repeat
+        record(0, 0, kind=0),  # EV_SYN
+        record(KEY_A, 0),
+        record(KEY_LEFTSHIFT, 0),
+        record(KEY_SPACE, 1),
+    ]
+    data = b"".join(records)
+    os.write(write_fd, data[:10])  # Records may be split between reads
+    time.sleep(0.01)
+    os.write(write_fd, data[10:])
+
+    events = keyboard.wait_keys(keys="SPACE", max_wait=1, clear=False, blocking=True)
+    assert events[0].native_timestamp is not None
+    events = keyboard.get_keys(event=None)
+    assert [(event.key, event.event, event.modifiers) for event in events] == [
+        ("LSHIFT", "press", "SHIFT"),
+        ("A", "press", "SHIFT"),
+        ("A", "release", "SHIFT"),
+        ("LSHIFT", "release", None),
+        ("SPACE", "press", None),
+    ]
+    assert events[1].code == key.A
+
+
+def test_evdev_keyboard_close(device):
+    window, keyboard, write_fd = device
+    keyboard.close()
+    keyboard.close()
+    assert not window.input_devices
+    os.write(write_fd, record(KEY_F, 1))
+    assert wait_key(window=window, max_wait=0.02).key is None
+
+
+def test_find_keyboards():
+    assert all(path.endswith("-event-kbd") for path in find_keyboards())
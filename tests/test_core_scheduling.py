@@ -0,0 +1,85 @@
+import os
+import warnings
+
+import pytest
+
+from psychos.core import Interval, get_time, realtime
+
+# The scheduling functions of `os` are only available on Linux (and some other Unix systems)
+requires_sched = pytest.mark.skipif(
+    not hasattr(os, "sched_setscheduler"), reason="os.sched_setscheduler is not available"
+)
+
+SCHED_FUNCTIONS = (
+    "sched_getscheduler",
+    "sched_getparam",
+    "sched_setscheduler",
+    "sched_getaffinity",
+    "sched_setaffinity",
+    "getpriority",
+    "setpriority",
+)
+
+
+def _state():
+    return (
+        os.sched_getscheduler(0),
+        os.getpriority(os.PRIO_PROCESS, 0),
+        os.sched_getaffinity(0),
+    )
+
+
+@requires_sched
+def test_realtime_restores_state():
+    before = _state()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with realtime(cpus=sorted(before[2])[:1]) as applied:
+            assert set(applied) == {"scheduler", "nice", "affinity"}
+            if applied["scheduler"]:
+                assert os.sched_getscheduler(0) == os.SCHED_FIFO
+            if applied["affinity"]:
+                assert os.sched_getaffinity(0) == set(sorted(before[2])[:1])
+    assert _state() == before
+
+
+@requires_sched
+def test_realtime_warns_without_privileges(monkeypatch):
+    def deny(*args):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, "sched_setscheduler", deny)
+    monkeypatch.setattr(os, "setpriority", deny)
+    with pytest.warns(RuntimeWarning, match="could not be set"):
+        with realtime() as applied:
+            assert applied == {"scheduler": False, "nice": False, "affinity": False}
+
+
+def test_realtime_without_scheduling_functions(monkeypatch):
+    for name in SCHED_FUNCTIONS:
+        monkeypatch.delattr(os, name, raising=False)
+    with pytest.warns(RuntimeWarning) as records:
+        with realtime(cpus=[0]) as applied:
+            assert applied == {"scheduler": False, "nice": False, "affinity": False}
+    messages = [str(record.message) for record in records]
+    assert any("could not be set" in message for message in messages)
+    assert any("could not be pinned" in message for message in messages)
+
+
+def test_realtime_invalid_policy():
+    with pytest.raises(ValueError):
+        with realtime(policy="batch"):
+            pass
+
+
+@requires_sched
+def test_interval_realtime():
+    before = _state()
+    start = get_time()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with Interval(0.01, realtime=True) as interval:
+            pass
+    assert get_time() - start >= 0.01
+    assert (interval + 0.01).realtime
+    assert _state() == before
@@ -0,0 +1,147 @@
+"""Unit tests for the virtual clock source and scripted input of 'psychos.core'."""
+
+import asyncio
+import time
+
+import pytest
+from pyglet.event import EventDispatcher
+from pyglet.window import key
+
+from psychos.core import (
+    Clock,
+    InputQueue,
+    Interval,
+    ScriptedInput,
+    VirtualClockSource,
+    get_clock_source,
+    get_sleep_calibrator,
+    get_time,
+    virtual_time,
+    wait,
+    wait_async,
+    wait_key,
+    wait_key_async,
+)
+
+
+class FakeWindow(EventDispatcher):
+    """Window replacement whose events are only dispatched by the scripted input."""
+
+    def dispatch_events(self):
+        pass
+
+
+FakeWindow.register_event_type("on_key_press")
+FakeWindow.register_event_type("on_key_release")
+FakeWindow.register_event_type("on_mouse_press")
+FakeWindow.register_event_type("on_mouse_release")
+
+
+def test_virtual_time_restores_source():
+    previous = get_clock_source()
+    with virtual_time(start=10.0) as source:
+        assert isinstance(source, VirtualClockSource)
+        assert get_time() == 10.0
+    assert get_clock_source() is previous
+
+
+def test_wait_advances_instantly():
+    start = time.perf_counter()
+    with virtual_time():
+        wait(3600)
+        assert get_time() == pytest.approx(3600)
+        with Interval(60):
+            pass
+        assert get_time() == pytest.approx(3660)
+        clock = Clock()
+        wait(1.5)
+        assert clock.time() == pytest.approx(1.5)
+    assert time.perf_counter() - start < 1
+
+
+def test_virtual_wait_does_not_calibrate():
+    calibrator = get_sleep_calibrator()
+    calibrator.reset()
+    with virtual_time():
+        wait(60, hog_period=0.001)
+        asyncio.run(wait_async(60, hog_period=0.001))
+    assert len(calibrator) == 0
+
+
+def test_call_at_runs_in_order():
+    source = VirtualClockSource()
+    calls = []
+    source.call_at(2.0, lambda: calls.append(("b", source.time())))
+    source.call_at(1.0, lambda: calls.append(("a", source.time())))
+    source.advance(1.5)
+    assert calls == [("a", 1.0)]
+    assert source.next_timer == 2.0
+    source.advance_to(5.0)
+    assert calls == [("a", 1.0), ("b", 2.0)]
+    assert source.time() == 5.0
+
+
+def test_scripted_key_press():
+    window = FakeWindow()
+    with virtual_time():
+        ScriptedInput([(0.8, "key_press", "F"), (0.9, "key_release", "F")], window=window)
+        event = wait_key(keys=["f", "j"], window=window, max_wait=2)
+    assert event.key == "F"
+    assert event.timestamp == pytest.approx(0.8)
+
+
+def test_scripted_key_timeout():
+    window = FakeWindow()
+    with virtual_time():
+        ScriptedInput([(3.0, "key_press", "SPACE")], window=window)
+        event = wait_key(window=window, max_wait=2)
+        assert event.key is None
+        assert get_time() == pytest.approx(2, abs=1e-6)
+        event = wait_key(window=window)
+    assert event.key == "SPACE"
+    assert event.timestamp == pytest.approx(3.0)
+
+
+def test_wait_key_without_input_raises():
+    with virtual_time():
+        with pytest.raises(RuntimeError):
+            wait_key(window=FakeWindow())
+
+
+def test_scripted_modifiers_and_mouse():
+    window = FakeWindow()
+    with virtual_time():
+        queue = InputQueue(window)
+        ScriptedInput(
+            [(0.1, "key_press", "A", "CTRL|SHIFT"), (0.2, "mouse_press", 1, "", 10, 20)],
+            window=window,
+        )
+        wait(1)
+    events = queue.get_events()
+    assert events[0].code == key.A
+    assert events[0].modifiers == key.MOD_CTRL | key.MOD_SHIFT
+    assert events[1].kind == "mouse_press"
+    assert (events[1].x, events[1].y, events[1].timestamp) == (10, 20, pytest.approx(0.2))
+
+
+def test_scripted_input_validation():
+    with pytest.raises(TypeError):
+        ScriptedInput([], window=FakeWindow())
+    with virtual_time():
+        with pytest.raises(ValueError):
+            ScriptedInput([(0.1, "key_press", "NOT_A_KEY")], window=FakeWindow())
+        with pytest.raises(ValueError):
+            ScriptedInput([(0.1, "scroll", 1)], window=FakeWindow())
+
+
+def test_wait_key_async_virtual():
+    window = FakeWindow()
+
+    async def main():
+        ScriptedInput([(0.5, "key_press", "J")], window=window)
+        return await wait_key_async(window=window, max_wait=1)
+
+    with virtual_time():
+        event = asyncio.run(main())
+    assert event.key == "J"
+    assert event.timestamp == pytest.approx(0.5, abs=0.002)
@@ -0,0 +1,122 @@
+"""Unit tests for the alignment of the local clock with device clocks in 'psychos.core.sync'."""
+
+import socket
+import struct
+import threading
+from array import array
+
+import pytest
+
+from psychos.core import ClockSync, get_time, wait
+from psychos.types import KeyEvent
+
+
+class SimulatedDevice:
+    """Device answering each UDP datagram with its own timestamp, which drifts from ours."""
+
+    def __init__(self, offset, drift):
+        self.offset = offset
+        self.drift = drift
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.address = self.socket.getsockname()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def now(self, local):
+        return self.offset + (1 + self.drift) * local
+
+    def serve(self):
+        while True:
+            message, address = self.socket.recvfrom(16)
+            if message == b"stop":
+                break
+            self.socket.sendto(struct.pack("!d", self.now(get_time())), address)
+
+    def close(self):
+        self.socket.sendto(b"stop", self.address)
+        self.thread.join()
+        self.socket.close()
+
+
+@pytest.fixture
+def device():
+    device = SimulatedDevice(offset=1000.0, drift=0.01)
+    yield device
+    device.close()
+
+
+def test_sync_with_simulated_device(device):
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.settimeout(1)
+
+    def query():
+        client.sendto(b"time", device.address)
+        return struct.unpack("!d", client.recv(16))[0]
+
+    sync = ClockSync(max_round_trip=0.01)
+    for _ in range(100):
+        sync.measure(query)
+        wait(0.002, hog_period=0.002)
+    client.close()
+
+    assert sync.n_samples > 50
+    assert sync.drift == pytest.approx(device.drift, abs=2e-3)
+    now = get_time()
+    assert sync.to_device(now) == pytest.approx(device.now(now), abs=2e-3)
+    assert sync.to_local(device.now(now)) == pytest.approx(now, abs=2e-3)
+
+
+def test_exact_fit_and_outliers():
+    sync = ClockSync()
+    for index in range(100):
+        local = 10.0 + index * 0.1
+        device = 5.0 + 1.001 * local + (0.5 if index % 10 == 9 else 0.0)
+        sync.add(local, device)
+    assert sync.n_outliers >= 5
+    assert sync.slope == pytest.approx(1.001, abs=1e-4)
+    assert sync.offset == pytest.approx(5.0, abs=1e-3)
+
+
+def test_forgetting_tracks_drift_changes():
+    sync = ClockSync(forgetting=0.9)
+    for index in range(200):
+        local = index * 0.1
+        # The device runs at our rate for 10 seconds and then 0.2% faster
+        device = local if local < 10 else 10 + 1.002 * (local - 10)
+        sync.add(local, device)
+    assert sync.slope == pytest.approx(1.002, abs=1e-4)
+
+
+def test_convert_log():
+    sync = ClockSync()
+    sync.add(0.0, 100.0)
+    sync.add(10.0, 120.0)
+    assert sync.slope == pytest.approx(2.0)
+
+    converted = sync.to_device([1.0, 2.0])
+    assert isinstance(converted, array)
+    assert list(converted) == pytest.approx([102.0, 104.0])
+
+    events = [KeyEvent("A", 1.0, "", "press"), KeyEvent("B", 3.0, "", "press")]
+    converted = sync.convert_log(events, direction="to_device")
+    assert [event.timestamp for event in converted] == pytest.approx([102.0, 106.0])
+    assert converted[0].key == "A"
+
+    marks = {"label": ["a", "b"], "time": [102.0, 104.0]}
+    converted = sync.convert_log(marks, field="time")
+    assert list(converted["time"]) == pytest.approx([1.0, 2.0])
+    assert converted["label"] == ["a", "b"]
+
+    records = [{"timestamp": 104.0, "code": 1}]
+    assert sync.convert_log(records)[0]["timestamp"] == pytest.approx(2.0)
+
+    with pytest.raises(ValueError):
+        sync.convert_log(records, direction="backwards")
+
+
+def test_unfitted_sync_raises():
+    with pytest.raises(RuntimeError):
+        ClockSync().to_local(1.0)
+    with pytest.raises(ValueError):
+        ClockSync(forgetting=0)
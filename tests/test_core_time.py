@@ -1,15 +1,37 @@
 """Unit tests for the 'psychos.core.time' module related to time management."""
 
+import asyncio
 import pytest
 import time
-
-from psychos.core import Clock, Interval, wait
+import warnings
+
+from psychos.core import (
+    Clock,
+    Interval,
+    Scheduler,
+    Timeline,
+    wait,
+    wait_until,
+    wait_async,
+    get_time,
+    SleepCalibrator,
+    OvertimeStats,
+    get_overtime_stats,
+)
 
 
 TIME_TOLERANCE = 0.1  # 10% -> Wide tolerance for github actions. See timing calibration docs for more info.
 HOG_PERIOD = 0.3  # seconds
 
 
+@pytest.fixture(autouse=True)
+def clear_overtime_stats():
+    """Let every test see the first overtime warning of each label."""
+    get_overtime_stats().clear()
+    yield
+    get_overtime_stats().clear()
+
+
 def is_close(actual, expected, tolerance):
     return abs(actual - expected) <= tolerance * expected
 
@@ -31,6 +53,24 @@ def test_wait_function():
     ), f"'wait' function did not wait for {duration} seconds within 1% tolerance."
 
 
+def test_wait_until_function():
+    deadline = get_time() + 1
+    wait_until(deadline, sleep_interval=0.1, hog_period=0.005)
+    assert 0 <= get_time() - deadline < 0.01
+
+
+def test_wait_until_hog_dispatch_interval():
+    deadline = get_time() + 0.2
+    wait_until(deadline, hog_period=0.1, hog_dispatch_interval=0.001)
+    assert 0 <= get_time() - deadline < 0.01
+
+
+def test_wait_until_past_deadline():
+    start_time = get_time()
+    wait_until(start_time - 1)
+    assert get_time() - start_time < 0.01
+
+
 # Test suite for the 'Clock' class
 def test_clock_time_method():
     clock = Clock()
@@ -69,12 +109,60 @@ def test_clock_with_fmt_callable():
     ), "'Clock.time()' with fmt as callable did not process the elapsed time correctly."
 
 
+def test_clock_time_at():
+    clock = Clock(start_time=10.0)
+    assert clock.time_at(12.5) == 2.5
+    clock.fmt = lambda x: f"{x:.1f}s"
+    assert clock.time_at(12.5) == "2.5s"
+
+
 def test_clock_with_invalid_fmt():
     clock = Clock(fmt=123)  # Invalid fmt
     with pytest.raises(TypeError):
         clock.time()
 
 
+def test_clock_mark_and_get_marks():
+    clock = Clock()
+    for _ in range(3):
+        dummy_sleep(0.01)
+        clock.mark("frame")
+    clock.mark()
+    marks = clock.get_marks()
+    assert marks["label"] == ["frame", "frame", "frame", None]
+    assert all(time >= 0.01 for time in marks["lap"][:3])
+    assert marks["time"] == sorted(marks["time"])
+    assert sum(marks["lap"]) == pytest.approx(marks["time"][-1])
+
+
+def test_clock_lap():
+    clock = Clock()
+    dummy_sleep(0.05)
+    first_lap = clock.lap()
+    dummy_sleep(0.1)
+    second_lap = clock.lap()
+    assert is_close(first_lap, 0.05, TIME_TOLERANCE)
+    assert is_close(second_lap, 0.1, TIME_TOLERANCE)
+
+
+def test_clock_marks_grow_and_clear():
+    clock = Clock(capacity=2)
+    for _ in range(5):
+        clock.mark()
+    assert len(clock.get_marks()["time"]) == 5
+    clock.clear_marks()
+    assert clock.get_marks()["time"] == []
+
+
+def test_clock_marks_formatted_and_export(tmp_path):
+    clock = Clock(fmt=lambda x: f"{x:.3f}s")
+    clock.mark("start")
+    assert clock.get_marks(formatted=True)["time"][0].endswith("s")
+    path = tmp_path / "marks.csv"
+    clock.export_marks(path)
+    assert path.read_text(encoding="utf-8").splitlines()[0] == "label,time,lap"
+
+
 # Test suite for the 'Interval' class
 def test_interval_wait_within_duration():
     duration = 2  # seconds
@@ -168,7 +256,7 @@ def test_interval_context_manager():
     duration = 2  # seconds
     with Interval(duration, hog_period=HOG_PERIOD) as interval:
         dummy_sleep(1)
-    total_time = time.time() - interval.start_time
+    total_time = get_time() - interval.start_time
     assert is_close(
         total_time, duration, TIME_TOLERANCE
     ), "'Interval' context manager did not wait for the correct remaining time within 1% tolerance."
@@ -226,5 +314,254 @@ def test_interval_divide_by_zero():
         interval /= 0
 
 
+# Test suite for the adaptive hog period
+def test_sleep_calibrator_default_before_min_samples():
+    calibrator = SleepCalibrator(default_hog_period=0.02, min_samples=4)
+    calibrator.record(0.01, 0.011)
+    assert calibrator.hog_period == 0.02
+
+
+def test_sleep_calibrator_percentile():
+    calibrator = SleepCalibrator(percentile=0.9, margin=0, min_samples=1, min_hog_period=0)
+    for overshoot in range(100):
+        calibrator.record(0.01, 0.01 + overshoot / 1e5)
+    assert calibrator.hog_period == pytest.approx(90 / 1e5)
+
+
+def test_sleep_calibrator_bounds():
+    calibrator = SleepCalibrator(min_samples=1, min_hog_period=0.001, max_hog_period=0.01)
+    calibrator.record(0.01, 0.01)
+    assert calibrator.hog_period == 0.001
+    calibrator = SleepCalibrator(percentile=1, min_samples=1, max_hog_period=0.01)
+    calibrator.record(0.01, 1.0)
+    assert calibrator.hog_period == 0.01
+
+
+def test_sleep_calibrator_ring_buffer():
+    calibrator = SleepCalibrator(capacity=8, min_samples=1)
+    for _ in range(20):
+        calibrator.record(0.01, 0.02)
+    assert len(calibrator) == 8
+    calibrator.reset()
+    assert len(calibrator) == 0
+
+
+def test_wait_function_auto_hog_period():
+    duration = 1  # seconds
+    start_time = time.time()
+    wait(duration, sleep_interval=0.1, hog_period="auto")
+    elapsed_time = time.time() - start_time
+    assert is_close(elapsed_time, duration, TIME_TOLERANCE)
+
+
+# Test suite for the asynchronous API
+def test_wait_async_function():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        start_time = get_time()
+        await wait_async(0.5, hog_period=0.005)
+        elapsed_time = get_time() - start_time
+        task.cancel()
+        return elapsed_time, ticks
+
+    elapsed_time, ticks = asyncio.run(main())
+    assert is_close(elapsed_time, 0.5, TIME_TOLERANCE)
+    assert ticks > 10, "'wait_async' did not let other coroutines run."
+
+
+def test_interval_async_context_manager():
+    async def main():
+        async with Interval(0.5, hog_period=0.005) as interval:
+            await asyncio.sleep(0.1)
+        return get_time() - interval.start_time
+
+    assert is_close(asyncio.run(main()), 0.5, TIME_TOLERANCE)
+
+
+def test_interval_wait_async_overtime_exception():
+    interval = Interval(0.01, on_overtime="exception")
+    dummy_sleep(0.05)
+    with pytest.raises(RuntimeError, match="The interval of"):
+        asyncio.run(interval.wait_async())
+
+
+# Test suite for the 'Scheduler' class
+def test_scheduler_runs_callbacks_in_order():
+    scheduler = Scheduler(hog_period=0.005)
+    fired = []
+    scheduler.schedule(0.2, fired.append, "cue off", label="cue off")
+    scheduler.schedule(0.35, fired.append, "target on", label="target on")
+    scheduler.schedule(0.01, fired.append, "trigger reset", label="trigger reset")
+    calls = scheduler.run()
+
+    assert fired == ["trigger reset", "cue off", "target on"]
+    assert [call.label for call in calls] == fired
+    assert len(scheduler) == 0
+    for call, onset in zip(calls, [0.01, 0.2, 0.35]):
+        assert call.deadline == pytest.approx(scheduler.start_time + onset)
+        assert 0 <= call.lateness < 0.01
+
+
+def test_scheduler_cancel():
+    scheduler = Scheduler(hog_period=0.005)
+    fired = []
+    identifier = scheduler.schedule(0.05, fired.append, 1)
+    scheduler.schedule(0.1, fired.append, 2)
+    scheduler.cancel(identifier)
+    assert len(scheduler) == 1
+    scheduler.run()
+    assert fired == [2]
+
+
+def test_scheduler_callbacks_can_schedule():
+    scheduler = Scheduler(hog_period=0.005)
+    fired = []
+
+    def first():
+        fired.append("first")
+        scheduler.schedule(0.1, fired.append, "second")
+
+    scheduler.schedule(0.05, first)
+    scheduler.run()
+    assert fired == ["first", "second"]
+
+
+def test_scheduler_run_until():
+    scheduler = Scheduler(hog_period=0.005)
+    fired = []
+    scheduler.schedule(0.05, fired.append, 1)
+    scheduler.schedule(1.0, fired.append, 2)
+    scheduler.run(until=0.2)
+    assert fired == [1]
+    assert len(scheduler) == 1
+    assert get_time() - scheduler.start_time >= 0.2
+
+
+# Test suite for the 'Timeline' class
+def test_timeline_offsets_are_anchored():
+    timeline = Timeline([0.1] * 10, epoch=100.0)
+    assert len(timeline) == 10
+    assert timeline.onset(0) == 100.0
+    assert timeline.offset(-1) == pytest.approx(101.0)
+    assert timeline.end == pytest.approx(101.0)
+
+
+def test_timeline_absorbs_overtime():
+    timeline = Timeline([0.1, 0.1, 0.1], on_overtime="ignore", hog_period=0.005)
+    dummy_sleep(0.15)  # Overrun the first segment
+    timeline.wait()
+    timeline.wait()
+    timeline.wait()
+    assert timeline.lateness[0] > 0.04
+    assert abs(get_time() - timeline.offset(2)) < 0.01
+    assert is_close(get_time() - timeline.epoch, 0.3, TIME_TOLERANCE)
+
+
+def test_timeline_overtime_policies():
+    timeline = Timeline([0.01], on_overtime="warning")
+    dummy_sleep(0.02)
+    with pytest.warns(RuntimeWarning, match="The interval of"):
+        timeline.wait()
+
+    timeline = Timeline([0.01], on_overtime="exception")
+    dummy_sleep(0.02)
+    with pytest.raises(RuntimeError, match="The interval of"):
+        timeline.wait()
+
+    with pytest.raises(ValueError):
+        Timeline(on_overtime="invalid_option")
+
+
+def test_timeline_segment_context_manager():
+    timeline = Timeline(hog_period=0.005)
+    for _ in range(3):
+        with timeline.segment(0.1):
+            dummy_sleep(0.05)
+    assert timeline.position == 3
+    assert abs(get_time() - (timeline.epoch + 0.3)) < 0.01
+
+
+def test_timeline_wait_without_segments():
+    with pytest.raises(IndexError):
+        Timeline().wait()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
+
+
+def test_overtime_warns_once_per_label():
+    with pytest.warns(RuntimeWarning, match="Further overruns of 'trial'"):
+        Interval(0, label="trial").wait()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for _ in range(5):
+            Interval(0, label="trial").wait()
+    with pytest.warns(RuntimeWarning):
+        Interval(0, label="other").wait()
+    assert get_overtime_stats().counts() == {
+        "trial": {"count": 6, "overruns": 6},
+        "other": {"count": 1, "overruns": 1},
+    }
+
+
+def test_overtime_stats_records_waits():
+    stats = OvertimeStats()
+    for _ in range(3):
+        with Interval(0.01, label="fast", stats=stats, hog_period=0.01):
+            pass
+    interval = Interval(0.01, label="slow", stats=stats, on_overtime="ignore")
+    dummy_sleep(0.02)
+    interval.wait()
+
+    summary = stats.summary("fast")
+    assert summary["count"] == 3 and summary["overruns"] == 0
+    assert summary["overtime"] is None
+    assert 0 <= summary["lateness"]["p50"] < 0.005
+    assert 0 < summary["slack"]["max"] <= 0.01
+
+    summary = stats.summary("slow")
+    assert summary["overruns"] == 1
+    assert summary["overtime"]["max"] >= 0.01
+    assert stats.summary()["count"] == 4
+
+    edges, counts = stats.histogram("lateness", bins=4)
+    assert len(edges) == 5 and sum(counts) == 4
+    assert stats.labels == ["fast", "slow"]
+
+
+def test_overtime_stats_export(tmp_path):
+    stats = OvertimeStats(capacity=2)
+    for slack in (0.1, -0.2, 0.3):
+        stats.record("trial", 1.0, slack, max(-slack, 0.0))
+    records = stats.get_records()
+    assert [record["slack"] for record in records] == [-0.2, 0.3]
+    assert records[0]["label"] == "trial"
+
+    path = tmp_path / "overtime.csv"
+    stats.to_csv(path)
+    lines = path.read_text().splitlines()
+    assert lines[0] == "timestamp,label,duration,slack,lateness"
+    assert len(lines) == 3
+
+    with pytest.raises(ValueError):
+        stats.histogram("unknown")
+    stats.clear()
+    assert len(stats) == 0 and stats.counts() == {}
+
+
+def test_timeline_records_overtime_stats():
+    stats = OvertimeStats()
+    timeline = Timeline([0.01, 0.01], on_overtime="ignore", label="scan", stats=stats)
+    dummy_sleep(0.015)
+    timeline.wait()
+    timeline.wait()
+    assert stats.counts() == {"scan": {"count": 2, "overruns": 1}}
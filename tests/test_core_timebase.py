@@ -0,0 +1,114 @@
+"""Unit tests for the 'psychos.core.timebase' module related to clock sources."""
+
+import threading
+import time
+
+import pytest
+
+from psychos.core import Clock, ClockSource, get_clock_source, set_clock_source, get_time
+from psychos.core.timebase import (
+    PerfCounterSource,
+    MonotonicSource,
+    WallClockSource,
+    _clock_nanosleep,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_clock_source():
+    """Restore the default clock source after each test."""
+    source = get_clock_source()
+    yield
+    set_clock_source(source)
+
+
+def test_default_clock_source_is_perf_counter():
+    assert isinstance(get_clock_source(), PerfCounterSource)
+
+
+@pytest.mark.parametrize(
+    "name, source_cls",
+    [("perf_counter", PerfCounterSource), ("monotonic", MonotonicSource), ("wall", WallClockSource)],
+)
+def test_set_clock_source_by_name(name, source_cls):
+    source = set_clock_source(name)
+    assert isinstance(source, source_cls)
+    assert get_clock_source() is source
+
+
+def test_set_clock_source_invalid():
+    with pytest.raises(ValueError):
+        set_clock_source("invalid")
+    with pytest.raises(TypeError):
+        set_clock_source(123)
+
+
+def test_get_time_is_monotonic():
+    previous = get_time()
+    for _ in range(1000):
+        current = get_time()
+        assert current >= previous
+        previous = current
+
+
+def test_time_ns_matches_time():
+    source = PerfCounterSource()
+    assert abs(source.time_ns() / 1e9 - source.time()) < 0.01
+
+
+def test_to_wall_conversion():
+    source = get_clock_source()
+    wall = source.to_wall(source.time())
+    assert abs(wall - time.time()) < 0.01
+    assert source.from_wall(wall) == pytest.approx(source.time(), abs=0.01)
+
+
+@pytest.mark.parametrize("source_cls", [PerfCounterSource, MonotonicSource, WallClockSource])
+def test_sleep_until_deadline(source_cls):
+    source = source_cls()
+    deadline = source.time() + 0.05
+    source.sleep_until(deadline)
+    assert source.time() >= deadline
+    assert source.time() - deadline < 0.02
+
+
+def test_sleep_until_past_deadline_returns():
+    source = get_clock_source()
+    start_time = source.time()
+    source.sleep_until(start_time - 1)
+    assert source.time() - start_time < 0.01
+
+
+@pytest.mark.skipif(_clock_nanosleep is None, reason="clock_nanosleep is not available")
+def test_clock_nanosleep_negative_deadline_returns():
+    # Negative deadlines used to be retried forever instead of returning
+    worker = threading.Thread(target=_clock_nanosleep, args=(-5,), daemon=True)
+    worker.start()
+    worker.join(timeout=1)
+    assert not worker.is_alive()
+
+
+def test_wall_clock_source_has_no_offset():
+    source = WallClockSource()
+    assert source.to_wall(10.0) == 10.0
+
+
+def test_custom_clock_source_is_used_by_clock():
+    class FixedSource(ClockSource):
+        """Clock source returning a fixed time."""
+
+        def __init__(self):
+            super().__init__()
+            self.now_ns = 0
+
+        def time_ns(self):
+            return self.now_ns
+
+    source = set_clock_source(FixedSource())
+    clock = Clock()
+    source.now_ns = 1_500_000_000
+    assert clock.time() == pytest.approx(1.5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
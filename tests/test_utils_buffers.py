@@ -0,0 +1,75 @@
+"""Unit tests for the 'psychos.utils.buffers' module."""
+
+import csv
+
+import pytest
+
+from psychos.utils import RecordBuffer
+
+
+@pytest.fixture
+def buffer():
+    """Fixture with an empty growable buffer."""
+    return RecordBuffer({"t": "d", "code": "l"}, capacity=4)
+
+
+def test_append_and_columns(buffer):
+    for index in range(3):
+        buffer.append(index / 10, index)
+    assert len(buffer) == 3
+    assert buffer.total == 3
+    assert list(buffer.column("code")) == [0, 1, 2]
+    assert list(buffer.columns()["t"]) == pytest.approx([0.0, 0.1, 0.2])
+
+
+def test_growable_buffer_doubles_capacity(buffer):
+    for index in range(10):
+        buffer.append(0.0, index)
+    assert buffer.capacity == 16
+    assert list(buffer.column("code")) == list(range(10))
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = RecordBuffer({"code": "l"}, capacity=4, ring=True)
+    for index in range(10):
+        buffer.append(index)
+    assert len(buffer) == 4
+    assert buffer.total == 10
+    assert buffer.first == 6
+    assert list(buffer.column("code")) == [6, 7, 8, 9]
+
+
+def test_read_from_sequence_number():
+    buffer = RecordBuffer({"code": "l"}, capacity=4, ring=True)
+    for index in range(6):
+        buffer.append(index)
+    assert list(buffer.column("code", start=5)) == [5]
+    assert list(buffer.column("code", start=0)) == [2, 3, 4, 5]
+    assert list(buffer.column("code", start=6)) == []
+    assert list(buffer.rows(start=4)) == [(4,), (5,)]
+
+
+def test_clear(buffer):
+    buffer.append(0.0, 1)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert list(buffer.rows()) == []
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        RecordBuffer({"code": "l"}, capacity=0)
+
+
+def test_to_csv(buffer, tmp_path):
+    buffer.append(0.5, 1)
+    buffer.append(1.5, 2)
+    path = tmp_path / "buffer.csv"
+    buffer.to_csv(path)
+    with open(path, encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows == [["t", "code"], ["0.5", "1"], ["1.5", "2"]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
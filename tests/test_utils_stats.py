@@ -0,0 +1,19 @@
+"""Unit tests for the 'psychos.utils.stats' module."""
+
+import pytest
+
+from psychos.utils import percentile
+
+
+def test_percentile():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 0.0) == 1.0
+    assert percentile(samples, 0.5) == 3.0
+    assert percentile(samples, 0.99) == 5.0
+    assert percentile(samples, 1.0) == 5.0
+    assert percentile(iter([2.0]), 0.5) == 2.0
+
+
+def test_percentile_empty():
+    with pytest.raises(ValueError):
+        percentile([], 0.5)
@@ -0,0 +1,93 @@
+"""Tests for the psychos.visual.hittest module."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from psychos.visual import SpatialIndex
+from psychos.visual.units import NormalizedUnits
+
+
+def box(x, y, width, height, rotation=0):
+    return SimpleNamespace(x=x, y=y, width=width, height=height, rotation=rotation)
+
+
+def sprite(x, y, width, height, scale=1.0):
+    """Sprite-like stimulus anchored at the center of its image."""
+    image = SimpleNamespace(width=width, height=height, anchor_x=width // 2, anchor_y=height // 2)
+    return SimpleNamespace(x=x, y=y, image=image, scale=scale, scale_x=1.0, scale_y=1.0)
+
+
+def test_spatial_index_hits_topmost_first():
+    bottom, top = box(10, 10, 100, 50), box(90, 40, 100, 100)
+    index = SpatialIndex([bottom, top], cell_size=32)
+    assert len(index) == 2
+    assert index.hit(50, 30) is bottom
+    assert index.hits(100, 50) == [top, bottom]
+    assert index.hit(150, 130) is top
+    assert index.hit(5, 5) is None
+    assert index.hit(1000, 1000) is None
+    assert list(index) == [bottom, top]
+
+
+def test_spatial_index_update_and_remove():
+    stimulus = box(0, 0, 20, 20)
+    index = SpatialIndex([stimulus], cell_size=16)
+    stimulus.x, stimulus.y = 200, 100
+    assert index.hit(10, 10) is stimulus  # Not updated yet
+    index.update(stimulus)
+    assert index.hit(10, 10) is None
+    assert index.hit(210, 110) is stimulus
+
+    index.update(stimulus, bounds=(0, 0, 5, 5))
+    assert index.hit(3, 3) is stimulus
+    index.remove(stimulus)
+    assert stimulus not in index
+    assert index.hit(3, 3) is None
+    assert not index._cells  # pylint: disable=protected-access
+
+    with pytest.raises(ValueError, match="already in the index"):
+        index.add(stimulus)
+        index.add(stimulus)
+
+
+def test_spatial_index_geometry():
+    image = sprite(100, 100, 40, 20, scale=2.0)  # Covers [60, 140] x [80, 120]
+    rotated = box(300, 300, 100, 10, rotation=90)  # Covers [300, 310] x [200, 300]
+    layout = SimpleNamespace(x=500, y=500, left=450, right=550, bottom=490, top=510)
+    index = SpatialIndex([image, rotated, layout])
+    assert index.hit(62, 82) is image
+    assert index.hit(58, 100) is None
+    assert index.hit(305, 250) is rotated
+    assert index.hit(350, 305) is None
+    assert index.hit(455, 505) is layout
+
+    with pytest.raises(TypeError, match="Cannot compute the bounds"):
+        index.add(SimpleNamespace(x=0, y=0))
+
+
+def test_spatial_index_units():
+    window = SimpleNamespace(width=800, height=600)
+    stimulus = box(400, 300, 10, 10)
+    index = SpatialIndex([stimulus], window=window)
+    units = NormalizedUnits(window)
+    x, y = units.inverse_transform(405, 305)
+    assert index.hit(x, y, units="norm") is stimulus
+    assert index.hit(x, y, units=units) is stimulus
+
+
+def test_spatial_index_matches_linear_scan():
+    generator = random.Random(0)
+    stimuli = [
+        box(generator.uniform(0, 1000), generator.uniform(0, 1000), 40, 30) for _ in range(400)
+    ]
+    index = SpatialIndex(stimuli, cell_size=50)
+    for _ in range(200):
+        x, y = generator.uniform(0, 1000), generator.uniform(0, 1000)
+        expected = [
+            stimulus
+            for stimulus in reversed(stimuli)
+            if stimulus.x <= x <= stimulus.x + 40 and stimulus.y <= y <= stimulus.y + 30
+        ]
+        assert index.hits(x, y) == expected